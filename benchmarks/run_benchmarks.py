@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Patta Pipeline Benchmark Suite
+Runs every patta extractor and the verifier over real and synthetic documents and reports
+throughput, latency percentiles, peak memory and field accuracy as JSON
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --extractors production verifier --synthetic 10 --repeat 3
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import hashlib
+import logging
+import argparse
+import platform
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Add project root to path for imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+if BENCHMARK_DIR not in sys.path:
+    sys.path.append(BENCHMARK_DIR)
+
+from synthetic_pattas import generate_synthetic_pattas, SCORED_FIELDS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Real document locations scanned by default
+DEFAULT_DOCUMENT_DIRS = [
+    os.path.join(PROJECT_ROOT, 'uploads', 'patta_documents'),
+    os.path.join(PROJECT_ROOT, 'data')
+]
+DEFAULT_GROUND_TRUTH = os.path.join(BENCHMARK_DIR, 'ground_truth.json')
+DEFAULT_RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+DEFAULT_SYNTHETIC_DIR = os.path.join(BENCHMARK_DIR, '.synthetic')
+
+
+# --- Extractor adapters: each returns a callable mapping a PDF path to canonical fields ---
+
+def _clean(value) -> Optional[str]:
+    if value in (None, '', 'Not found'):
+        return None
+    return str(value)
+
+
+def _patta_extractor() -> Callable[[str], Dict[str, Optional[str]]]:
+    from digitization.patta_extractor import PattaExtractor
+    extractor = PattaExtractor()
+
+    def run(path):
+        result = extractor.extract_from_pdf(path)
+        if not result or 'error' in result:
+            raise RuntimeError((result or {}).get('error', 'extraction failed'))
+        return {
+            'owner_name': _clean(result.get('name')),
+            'patta_no': _clean(result.get('patta_no')),
+            'survey_no': _clean(result.get('survey_no')),
+            'village': _clean(result.get('village')),
+            'taluk': _clean(result.get('taluk')),
+            'district': _clean(result.get('district'))
+        }
+    return run
+
+
+def _enhanced_extractor() -> Callable[[str], Dict[str, Optional[str]]]:
+    from digitization.enhanced_patta_extractor import EnhancedPattaExtractor
+    extractor = EnhancedPattaExtractor()
+
+    def run(path):
+        fields = extractor.extract_patta(path).get('fields', {})
+        return {field: _clean(fields.get(field)) for field in SCORED_FIELDS}
+    return run
+
+
+def _labelled_fields(fields: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Map the 'Owner Name' style labels of the production/final extractors to canonical fields"""
+    return {
+        'owner_name': _clean(fields.get('Owner Name')),
+        'patta_no': _clean(fields.get('Patta Number')),
+        'survey_no': _clean(fields.get('Survey Number')),
+        'village': _clean(fields.get('Village')),
+        'taluk': _clean(fields.get('Taluk')),
+        'district': _clean(fields.get('District'))
+    }
+
+
+def _production_extractor() -> Callable[[str], Dict[str, Optional[str]]]:
+    from production_patta_extractor import ProductionPattaExtractor
+    extractor = ProductionPattaExtractor()
+    return lambda path: _labelled_fields(extractor.extract_patta_document(path).get('fields', {}))
+
+
+def _final_extractor() -> Callable[[str], Dict[str, Optional[str]]]:
+    from final_comprehensive_extractor import FinalComprehensiveExtractor
+    extractor = FinalComprehensiveExtractor()
+    return lambda path: _labelled_fields(extractor.extract_patta_document(path).get('fields', {}))
+
+
+def _engine() -> Callable[[str], Dict[str, Optional[str]]]:
+    from digitization.extraction_engine import ExtractionEngine
+    engine = ExtractionEngine()
+
+    def run(path):
+        result = engine.extract(path)
+        if not result.get('success'):
+            raise RuntimeError(result.get('error', 'extraction failed'))
+        fields = result['fields']
+        return {field: _clean(fields.get(field)) for field in SCORED_FIELDS}
+    return run
+
+
+def _verifier() -> Callable[[str], Dict[str, Optional[str]]]:
+    sys.path.append(os.path.join(PROJECT_ROOT, 'patta_verification'))
+    from patta_verifier import PattaVerifier
+    verifier = PattaVerifier()
+
+    def run(path):
+        result = verifier.verify_patta_document(path)
+        if not result.get('success'):
+            raise RuntimeError(result.get('error', 'verification failed'))
+        fields = result.get('ocr_extraction', {}).get('fields', {})
+        return {
+            'owner_name': _clean(fields.get('owner_name')),
+            'patta_no': _clean(fields.get('patta_number')),
+            'survey_no': _clean(fields.get('survey_number')),
+            'village': _clean(fields.get('village')),
+            'taluk': _clean(fields.get('taluk')),
+            'district': _clean(fields.get('district'))
+        }
+    return run
+
+
+EXTRACTORS = {
+    'patta': _patta_extractor,
+    'enhanced': _enhanced_extractor,
+    'production': _production_extractor,
+    'final': _final_extractor,
+    'engine': _engine,
+    'verifier': _verifier
+}
+
+
+# --- Measurement helpers ---
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def peak_rss_mb(who: str = 'self') -> Optional[float]:
+    """Peak RSS in MB of this process ('self') or of its largest finished child ('children')"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == 'self' else resource.RUSAGE_CHILDREN)
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(usage.ru_maxrss / divisor, 2)
+
+
+def _normalize(value: Optional[str]) -> str:
+    return ' '.join(str(value or '').lower().replace('.', ' ').split()).strip(' :,-')
+
+
+def score_fields(extracted: Dict[str, Optional[str]], expected: Dict[str, str]) -> Dict[str, Dict[str, bool]]:
+    """Per-field exact match and partial match (expected value contained in the extraction)"""
+    scores = {}
+    for field in SCORED_FIELDS:
+        if not expected.get(field):
+            continue
+        want = _normalize(expected[field])
+        got = _normalize(extracted.get(field))
+        scores[field] = {'exact': got == want, 'partial': bool(got) and want in got}
+    return scores
+
+
+# --- Runner ---
+
+def run_extractor(name: str, documents: List[Tuple[str, Optional[Dict[str, str]], str]],
+                  repeat: int, warmup: int) -> Dict[str, Any]:
+    """Benchmark one extractor over the documents (runs inside its own process by default)"""
+    logging.getLogger().setLevel(logging.WARNING)
+    load_start = time.perf_counter()
+    try:
+        extract = EXTRACTORS[name]()
+    except Exception as e:
+        return {'extractor': name, 'available': False, 'error': f"{type(e).__name__}: {e}"}
+    load_seconds = time.perf_counter() - load_start
+
+    # Warm-up runs load models and fill caches; they are not measured
+    for path, _, _ in documents[:warmup]:
+        try:
+            extract(path)
+        except Exception:
+            pass
+
+    records = []
+    wall_start = time.perf_counter()
+    for _ in range(repeat):
+        for path, expected, source in documents:
+            start = time.perf_counter()
+            try:
+                fields = extract(path)
+                error = None
+            except Exception as e:
+                fields, error = {}, f"{type(e).__name__}: {e}"
+            records.append({
+                'document': os.path.basename(path),
+                'source': source,
+                'seconds': time.perf_counter() - start,
+                'error': error,
+                'scores': score_fields(fields, expected) if expected and error is None else None
+            })
+    wall_seconds = time.perf_counter() - wall_start
+
+    return {
+        'extractor': name,
+        'available': True,
+        'load_seconds': load_seconds,
+        'wall_seconds': wall_seconds,
+        'peak_rss_mb': peak_rss_mb('self'),
+        'peak_child_rss_mb': peak_rss_mb('children'),
+        'records': records
+    }
+
+
+def summarize(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn per-document records into throughput, latency and accuracy figures"""
+    if not raw.get('available'):
+        return {'available': False, 'error': raw.get('error')}
+
+    records = raw['records']
+    ok = [r for r in records if r['error'] is None]
+    latencies = sorted(r['seconds'] for r in ok)
+
+    per_field: Dict[str, Dict[str, int]] = {}
+    for record in ok:
+        for field, score in (record['scores'] or {}).items():
+            counts = per_field.setdefault(field, {'exact': 0, 'partial': 0, 'total': 0})
+            counts['exact'] += score['exact']
+            counts['partial'] += score['partial']
+            counts['total'] += 1
+    exact = sum(c['exact'] for c in per_field.values())
+    partial = sum(c['partial'] for c in per_field.values())
+    total = sum(c['total'] for c in per_field.values())
+
+    return {
+        'available': True,
+        'documents': len(records),
+        'errors': len(records) - len(ok),
+        'docs_per_sec': round(len(records) / raw['wall_seconds'], 4) if raw['wall_seconds'] else None,
+        'wall_seconds': round(raw['wall_seconds'], 3),
+        'load_seconds': round(raw['load_seconds'], 3),
+        'latency_seconds': {
+            'mean': round(sum(latencies) / len(latencies), 4) if latencies else None,
+            'p50': round(percentile(latencies, 50), 4),
+            'p95': round(percentile(latencies, 95), 4),
+            'max': round(latencies[-1], 4) if latencies else None
+        },
+        'peak_rss_mb': raw['peak_rss_mb'],
+        'peak_child_rss_mb': raw['peak_child_rss_mb'],
+        'field_accuracy': {
+            'scored_fields': total,
+            'exact': round(exact / total, 4) if total else None,
+            'partial': round(partial / total, 4) if total else None,
+            'per_field': {field: round(c['exact'] / c['total'], 4) for field, c in sorted(per_field.items())}
+        },
+        'failures': [{'document': r['document'], 'error': r['error']} for r in records if r['error']][:10]
+    }
+
+
+def collect_documents(dirs: List[str], ground_truth_path: str, synthetic: int, synthetic_pages: int,
+                      seed: int, synthetic_dir: str) -> List[Tuple[str, Optional[Dict[str, str]], str]]:
+    """Gather (path, expected_fields, source) for real PDFs (deduplicated by content) and synthetic pattas"""
+    ground_truth = {}
+    if ground_truth_path and os.path.exists(ground_truth_path):
+        with open(ground_truth_path, 'r') as f:
+            ground_truth = json.load(f)
+
+    documents, seen = [], set()
+    for directory in dirs:
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if not filename.lower().endswith('.pdf'):
+                continue
+            path = os.path.join(directory, filename)
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+            documents.append((path, ground_truth.get(filename), 'real'))
+
+    if synthetic:
+        for path, fields in generate_synthetic_pattas(synthetic_dir, synthetic, seed, synthetic_pages):
+            documents.append((path, fields, 'synthetic'))
+    return documents
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(report: Dict[str, Any], baseline_path: str, threshold: float) -> List[str]:
+    """Return regression messages for throughput, p95 latency and accuracy against a baseline report"""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not current.get('available') or not previous or not previous.get('available'):
+            continue
+        if previous['docs_per_sec'] and current['docs_per_sec'] is not None:
+            change = current['docs_per_sec'] / previous['docs_per_sec'] - 1
+            if change < -threshold:
+                regressions.append(f"{name}: docs/sec {previous['docs_per_sec']} -> {current['docs_per_sec']} ({change:+.1%})")
+        before, after = previous['latency_seconds']['p95'], current['latency_seconds']['p95']
+        if before and after / before - 1 > threshold:
+            regressions.append(f"{name}: p95 {before}s -> {after}s ({after / before - 1:+.1%})")
+        before, after = previous['field_accuracy']['exact'], current['field_accuracy']['exact']
+        if before is not None and after is not None and after < before - 0.01:
+            regressions.append(f"{name}: exact field accuracy {before:.1%} -> {after:.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the patta extraction and verification pipelines')
+    parser.add_argument('--extractors', nargs='+', choices=sorted(EXTRACTORS), default=sorted(EXTRACTORS),
+                        help='Extractors to benchmark (default: all)')
+    parser.add_argument('--dirs', nargs='*', default=DEFAULT_DOCUMENT_DIRS, help='Directories with real patta PDFs')
+    parser.add_argument('--ground-truth', default=DEFAULT_GROUND_TRUTH,
+                        help='JSON mapping real PDF filenames to expected fields')
+    parser.add_argument('--synthetic', type=int, default=5, help='Number of synthetic pattas to generate')
+    parser.add_argument('--synthetic-pages', type=int, default=1, help='Pages per synthetic patta')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for synthetic pattas')
+    parser.add_argument('--repeat', type=int, default=1, help='Passes over the document set')
+    parser.add_argument('--warmup', type=int, default=1, help='Unmeasured warm-up documents per extractor')
+    parser.add_argument('--in-process', action='store_true',
+                        help='Run extractors in this process (peak memory is then cumulative)')
+    parser.add_argument('--output', help='JSON report path (default: benchmarks/results/benchmark_<time>.json)')
+    parser.add_argument('--compare', help='Baseline JSON report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Relative regression tolerance (default 0.1)')
+    args = parser.parse_args()
+
+    documents = collect_documents(args.dirs, args.ground_truth, args.synthetic, args.synthetic_pages,
+                                  args.seed, DEFAULT_SYNTHETIC_DIR)
+    if not documents:
+        print("❌ No documents to benchmark")
+        sys.exit(1)
+    print(f"📄 Benchmarking {len(documents)} document(s) x {args.repeat} pass(es)")
+
+    results = {}
+    for name in args.extractors:
+        print(f"⏱️  {name}...")
+        if args.in_process:
+            raw = run_extractor(name, documents, args.repeat, args.warmup)
+        else:
+            # A fresh process per extractor keeps peak memory figures separate
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                raw = pool.submit(run_extractor, name, documents, args.repeat, args.warmup).result()
+        results[name] = summarize(raw)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'documents': len(documents),
+            'real_documents': sum(1 for d in documents if d[2] == 'real'),
+            'synthetic_documents': sum(1 for d in documents if d[2] == 'synthetic'),
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'isolated_processes': not args.in_process
+        },
+        'results': results
+    }
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'Extractor':<12} {'docs/s':>8} {'p50 s':>8} {'p95 s':>8} {'RSS MB':>8} {'exact':>7} {'errors':>7}")
+    for name, summary in results.items():
+        if not summary['available']:
+            print(f"{name:<12} unavailable: {summary['error']}")
+            continue
+        accuracy = summary['field_accuracy']['exact']
+        print(f"{name:<12} {summary['docs_per_sec'] or 0:>8.3f} {summary['latency_seconds']['p50']:>8.3f} "
+              f"{summary['latency_seconds']['p95']:>8.3f} {summary['peak_rss_mb'] or 0:>8.1f} "
+              f"{'-' if accuracy is None else f'{accuracy:.1%}':>7} {summary['errors']:>7}")
+    print(f"\n💾 Report saved to {output}")
+
+    if args.compare:
+        regressions = compare(report, args.compare, args.threshold)
+        if regressions:
+            print("\n⚠️ Regressions against baseline:")
+            for message in regressions:
+                print(f"  - {message}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
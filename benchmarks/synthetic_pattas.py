@@ -0,0 +1,121 @@
+"""
+Synthetic Patta Generator
+Renders deterministic English patta documents with known field values for benchmarking extraction accuracy
+"""
+
+import os
+import json
+import random
+from typing import Dict, List, Tuple
+from PIL import Image, ImageDraw, ImageFont
+
+# Page size at 200 dpi (A4)
+PAGE_SIZE = (1654, 2339)
+MARGIN = 140
+LINE_HEIGHT = 64
+
+FIRST_NAMES = ['Ravi', 'Lakshmi', 'Murugan', 'Anitha', 'Suresh', 'Kavitha', 'Ramesh', 'Selvi', 'Arjun', 'Meena']
+LAST_NAMES = ['Kumar', 'Devi', 'Raman', 'Pillai', 'Reddy', 'Naidu', 'Gowda', 'Rao', 'Swamy', 'Nair']
+PLACES = [
+    # (village, taluk, district)
+    ('Dodda Alahalli', 'Yelahanka', 'Bangalore Rural'),
+    ('Kovilpatti', 'Ettayapuram', 'Thoothukudi'),
+    ('Pallavaram', 'Tambaram', 'Chengalpattu'),
+    ('Vadakkupatti', 'Madurai North', 'Madurai'),
+    ('Kondapur', 'Serilingampally', 'Rangareddy'),
+    ('Peddapuram', 'Kakinada Rural', 'East Godavari'),
+]
+LAND_TYPES = ['Wet', 'Dry', 'Irrigated']
+
+# Canonical fields scored by the benchmark
+SCORED_FIELDS = ['owner_name', 'patta_no', 'survey_no', 'village', 'taluk', 'district']
+
+
+def _load_font(size: int):
+    """Return a TrueType font if one is installed, otherwise Pillow's scalable default"""
+    for name in ('DejaVuSans.ttf', 'Arial.ttf', 'LiberationSans-Regular.ttf'):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def make_fields(rng: random.Random) -> Dict[str, str]:
+    """Draw one set of patta field values"""
+    village, taluk, district = rng.choice(PLACES)
+    owner = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    father = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return {
+        'owner_name': owner,
+        'father_or_husband': father,
+        'patta_no': str(rng.randint(100, 9999)),
+        'survey_no': f"{rng.randint(1, 999)}/{rng.randint(1, 9)}",
+        'village': village,
+        'taluk': taluk,
+        'district': district,
+        'land_type': rng.choice(LAND_TYPES),
+        'extent': f"{rng.randint(1, 9)}.{rng.randint(10, 99)}",
+        'date': f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.randint(2015, 2024)}"
+    }
+
+
+def render_patta(fields: Dict[str, str], path: str, pages: int = 1) -> None:
+    """Render a patta with the given fields to a PDF (extra pages carry boilerplate text)"""
+    title_font = _load_font(48)
+    body_font = _load_font(36)
+
+    lines = [
+        ('GOVERNMENT OF TAMIL NADU', title_font),
+        ('REVENUE DEPARTMENT - PATTA', title_font),
+        ('', body_font),
+        (f"Patta No: {fields['patta_no']}", body_font),
+        (f"Survey No: {fields['survey_no']}", body_font),
+        (f"Owner Name: {fields['owner_name']}", body_font),
+        (f"Father Name: {fields['father_or_husband']}", body_font),
+        (f"Village: {fields['village']}", body_font),
+        (f"Taluk: {fields['taluk']}", body_font),
+        (f"District: {fields['district']}", body_font),
+        (f"Land Type: {fields['land_type']}", body_font),
+        (f"Extent: {fields['extent']} hectares", body_font),
+        (f"Date: {fields['date']}", body_font),
+    ]
+
+    images = []
+    for page in range(pages):
+        image = Image.new('RGB', PAGE_SIZE, 'white')
+        draw = ImageDraw.Draw(image)
+        y = MARGIN
+        page_lines = lines if page == 0 else [(f"Annexure {page}: revenue records and boundary notes", body_font)]
+        for text, font in page_lines:
+            draw.text((MARGIN, y), text, fill='black', font=font)
+            y += LINE_HEIGHT
+        images.append(image)
+
+    images[0].save(path, 'PDF', resolution=200.0, save_all=True, append_images=images[1:])
+
+
+def generate_synthetic_pattas(output_dir: str, count: int = 5, seed: int = 42,
+                              pages: int = 1) -> List[Tuple[str, Dict[str, str]]]:
+    """
+    Generate `count` synthetic pattas (re-using files from an earlier run with the same settings)
+
+    Returns:
+        List of (pdf_path, expected_fields) pairs
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    documents = []
+    for i in range(count):
+        fields = make_fields(rng)
+        path = os.path.join(output_dir, f"synthetic_{seed}_{i:03d}_p{pages}.pdf")
+        if not os.path.exists(path):
+            render_patta(fields, path, pages=pages)
+        documents.append((path, fields))
+
+    with open(os.path.join(output_dir, f"ground_truth_{seed}.json"), 'w') as f:
+        json.dump({os.path.basename(p): fields for p, fields in documents}, f, indent=2)
+    return documents
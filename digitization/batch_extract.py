@@ -0,0 +1,100 @@
+"""
+Parallel Batch Extraction
+Fans documents out over a shared worker pool and yields each result as soon as it finishes
+"""
+
+import os
+import time
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Batch configuration (overridable through the environment)
+DEFAULT_WORKERS = int(os.environ.get('FRA_BATCH_WORKERS', min(4, os.cpu_count() or 1)))
+MAX_BATCH_FILES = int(os.environ.get('FRA_BATCH_MAX_FILES', 500))
+
+# Extraction function: file path -> result dict (with an 'error' key on failure)
+ExtractFn = Callable[[str], Dict[str, Any]]
+
+
+def _timed_extract(extract: ExtractFn, path: str) -> Tuple[Dict[str, Any], float]:
+    """Run one extraction and time it, turning exceptions into error results"""
+    start = time.perf_counter()
+    try:
+        result = extract(path)
+    except Exception as e:
+        logger.error(f"Extraction failed for {path}: {e}")
+        result = {'error': str(e)}
+    return result, time.perf_counter() - start
+
+
+class BatchExtractor:
+    """
+    Shared thread pool for document-level batch extraction
+
+    Documents run on threads because the heavy lifting (page OCR) is already
+    farmed out to the shared OCR process pool; threads here just keep that
+    pool busy across documents. Each batch keeps at most twice the worker
+    count in flight, so a request with hundreds of files does not queue them
+    all at once and concurrent batches share the workers fairly.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max(1, max_workers or DEFAULT_WORKERS)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='patta-batch')
+
+    def run(self, items: Iterable[Tuple[Any, str]], extract: ExtractFn) -> Iterator[Tuple[Any, str, Dict[str, Any], float]]:
+        """
+        Extract every (key, path) item and yield (key, path, result, seconds) in completion order
+
+        Items are pulled lazily. Closing the generator early (e.g. the client
+        went away) cancels everything not yet started.
+        """
+        pending = {}
+        items = iter(items)
+        limit = self.max_workers * 2
+
+        def fill():
+            while len(pending) < limit:
+                try:
+                    key, path = next(items)
+                except StopIteration:
+                    return
+                pending[self._executor.submit(_timed_extract, extract, path)] = (key, path)
+
+        try:
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, path = pending.pop(future)
+                    result, seconds = future.result()
+                    yield key, path, result, seconds
+                fill()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_shared_extractor: Optional[BatchExtractor] = None
+_shared_lock = threading.Lock()
+
+
+def get_batch_extractor() -> BatchExtractor:
+    """Return the process-wide batch extractor"""
+    global _shared_extractor
+    with _shared_lock:
+        if _shared_extractor is None:
+            _shared_extractor = BatchExtractor()
+            atexit.register(_shared_extractor.shutdown)
+        return _shared_extractor
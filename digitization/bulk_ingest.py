@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Bulk Patta Ingestion
+Backfills a directory tree of scanned claim documents into fra_atlas.db's patta_files table and a GeoJSON/Parquet export
+
+Documents are extracted in parallel with the unified extraction engine (or fully
+verified with PattaVerifier), committed in batches together with a checkpoint
+row per content hash, so an interrupted run resumes where it stopped and files
+already ingested are never processed twice.
+
+Usage:
+    python digitization/bulk_ingest.py /archive/claims
+    python digitization/bulk_ingest.py /archive/claims --state "Tamil Nadu" --workers 8 --verify
+    python digitization/bulk_ingest.py /archive/claims --retry-failed --parquet data/patta_files.parquet
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+# Add project root to path for imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from digitization.batch_extract import BatchExtractor
+from digitization.extraction_engine import acquire_text, get_extraction_engine
+from digitization.upload_ingest import sha256_file
+from webgis.atlas_store import default_db_path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Defaults
+DEFAULT_GEOJSON = os.path.join(PROJECT_ROOT, 'data', 'patta_files.geojson')
+DOCUMENT_EXTENSIONS = {'.pdf', '.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp'}
+UPLOADED_BY = 'bulk_ingest'
+COMMIT_EVERY = 50
+REPORT_SECONDS = 10.0
+
+# Decimal-degree coordinates as printed on claim forms, e.g. "21.8225°N, 75.6102°E"
+COORDINATE_RE = re.compile(r'(\d{1,2}\.\d+)[°\s]*([NS])[,\s]*(\d{1,3}\.\d+)[°\s]*([EW])')
+AREA_RE = re.compile(r'(\d+(?:\.\d+)?)')
+ACRES_PER_HECTARE = 2.47105
+
+# Verifier decisions mapped onto patta_files' claim/approval status values
+DECISION_STATUS = {
+    'ACCEPTED': 'Approved',
+    'REJECTED': 'Rejected',
+    'FLAGGED_FOR_REVIEW': 'Pending'
+}
+
+
+def find_documents(root: str, extensions: Set[str] = DOCUMENT_EXTENSIONS) -> List[str]:
+    """All documents below root, in a stable (sorted) order"""
+    paths = []
+    for directory, subdirs, files in os.walk(root):
+        subdirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in extensions:
+                paths.append(os.path.join(directory, name))
+    return paths
+
+
+def parse_coordinates(text: str) -> Tuple[Optional[float], Optional[float]]:
+    """(latitude, longitude) from the first coordinate pair in the text, or (None, None)"""
+    match = COORDINATE_RE.search(text or '')
+    if not match:
+        return None, None
+    lat = float(match.group(1)) * (-1 if match.group(2) == 'S' else 1)
+    lon = float(match.group(3)) * (-1 if match.group(4) == 'W' else 1)
+    return lat, lon
+
+
+def parse_area_hectares(area: Optional[str]) -> float:
+    """Leading number of an extracted area, converted from acres when labelled so (0.0 if none)"""
+    match = AREA_RE.search(area or '')
+    if not match:
+        return 0.0
+    value = float(match.group(1))
+    if 'acre' in area.lower() or 'ஏக்கர்' in area:
+        value /= ACRES_PER_HECTARE
+    return round(value, 4)
+
+
+class IngestStore:
+    """
+    patta_files rows plus a per-hash checkpoint log, in fra_atlas.db
+
+    Each batch of documents is written in one transaction together with its
+    checkpoint rows, so after a crash the log and the table always agree and
+    a resumed run skips exactly the documents that were stored.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation, commit and close it"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        """Create patta_files (same schema as the web app) and the checkpoint log if needed"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS patta_files
+                            (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                             filename TEXT NOT NULL,
+                             original_filename TEXT NOT NULL,
+                             village_name TEXT NOT NULL,
+                             patta_holder TEXT NOT NULL,
+                             latitude REAL NOT NULL,
+                             longitude REAL NOT NULL,
+                             area_hectares REAL NOT NULL,
+                             tribal_group TEXT,
+                             family_size INTEGER,
+                             claim_status TEXT DEFAULT 'Pending',
+                             uploaded_by TEXT NOT NULL,
+                             uploaded_date TEXT NOT NULL,
+                             verified_by TEXT,
+                             verification_date TEXT,
+                             approval_status TEXT DEFAULT 'Pending',
+                             notes TEXT)''')
+            conn.execute('''CREATE TABLE IF NOT EXISTS patta_ingest_log
+                            (file_hash TEXT PRIMARY KEY,
+                             path TEXT NOT NULL,
+                             status TEXT NOT NULL,
+                             patta_file_id INTEGER,
+                             has_coordinates INTEGER NOT NULL DEFAULT 0,
+                             error TEXT,
+                             seconds REAL,
+                             processed_at TEXT NOT NULL)''')
+
+    def processed_hashes(self, include_failed: bool = True) -> Set[str]:
+        """Hashes already in the checkpoint log (optionally leaving failures out so they are retried)"""
+        query = 'SELECT file_hash FROM patta_ingest_log'
+        if not include_failed:
+            query += " WHERE status = 'done'"
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute(query)}
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Insert the patta_files rows and checkpoint entries for a batch in one transaction"""
+        processed_at = datetime.now().isoformat()
+        with self._connect() as conn:
+            for record in records:
+                row_id = None
+                row = record.get('row')
+                if row:
+                    # Re-ingesting a hash replaces the row stored for it earlier
+                    conn.execute('''DELETE FROM patta_files WHERE id IN
+                                    (SELECT patta_file_id FROM patta_ingest_log WHERE file_hash = ?)''',
+                                 (record['file_hash'],))
+                    cursor = conn.execute(f'''INSERT INTO patta_files ({', '.join(row)})
+                                              VALUES ({', '.join('?' * len(row))})''', list(row.values()))
+                    row_id = cursor.lastrowid
+                conn.execute('''INSERT OR REPLACE INTO patta_ingest_log
+                                (file_hash, path, status, patta_file_id, has_coordinates, error, seconds, processed_at)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                             (record['file_hash'], record['path'], 'done' if row else 'failed', row_id,
+                              int(record.get('has_coordinates', False)), record.get('error'),
+                              round(record.get('seconds', 0.0), 3), processed_at))
+
+    def ingested_rows(self) -> List[Dict[str, Any]]:
+        """Every patta_files row written by the ingester, with its hash and whether it has coordinates"""
+        with self._connect() as conn:
+            rows = conn.execute('''SELECT p.*, l.file_hash, l.has_coordinates
+                                   FROM patta_files p JOIN patta_ingest_log l ON l.patta_file_id = p.id
+                                   ORDER BY p.id''').fetchall()
+        return [dict(row) for row in rows]
+
+
+def extract_document(path: str, state: Optional[str] = None, verifier=None,
+                     file_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract (or fully verify) one document
+
+    Returns:
+        {'fields', 'latitude', 'longitude', 'decision'} or {'error'}
+    """
+    if verifier is not None:
+        results = verifier.verify_patta_document(path, state or 'Tamil Nadu', file_hash=file_hash)
+        if not results.get('success', False) and results.get('error'):
+            return {'error': results['error']}
+        ocr = results.get('ocr_extraction', {})
+        fields = dict(ocr.get('fields', {}))
+        # The verifier calls the area 'extent'
+        fields.setdefault('area', fields.get('extent'))
+        lat, lon = parse_coordinates(ocr.get('raw_text', ''))
+        decision = (results.get('final_decision') or {}).get('status')
+        return {'fields': fields, 'latitude': lat, 'longitude': lon, 'decision': decision}
+
+    engine = get_extraction_engine()
+    document = acquire_text(path, lang=engine.lang, config=engine.config)
+    result = engine.extract_document(document, state=state)
+    lat, lon = parse_coordinates(document.text)
+    return {'fields': result['fields'], 'latitude': lat, 'longitude': lon, 'decision': None,
+            'success_rate': result['success_rate'], 'ocr_used': document.ocr_used}
+
+
+def patta_file_row(path: str, root: str, extraction: Dict[str, Any], file_hash: str,
+                   uploaded_by: str = UPLOADED_BY) -> Dict[str, Any]:
+    """Map an extraction onto patta_files columns (NOT NULL columns get explicit placeholders)"""
+    fields = extraction['fields']
+    now = datetime.now().isoformat()
+    status = DECISION_STATUS.get(extraction.get('decision'), 'Pending')
+    notes = {key: fields.get(key) for key in ('patta_no', 'survey_no', 'taluk', 'district') if fields.get(key)}
+    notes['file_hash'] = file_hash
+    return {
+        'filename': os.path.relpath(path, root),
+        'original_filename': os.path.basename(path),
+        'village_name': fields.get('village') or 'Unknown',
+        'patta_holder': fields.get('owner_name') or fields.get('name') or 'Unknown',
+        # The table requires coordinates; 0/0 marks documents without any (see has_coordinates),
+        # and the atlas store leaves such rows off the map
+        'latitude': extraction['latitude'] if extraction['latitude'] is not None else 0.0,
+        'longitude': extraction['longitude'] if extraction['longitude'] is not None else 0.0,
+        'area_hectares': parse_area_hectares(fields.get('area')),
+        'claim_status': status,
+        'uploaded_by': uploaded_by,
+        'uploaded_date': now,
+        'verified_by': uploaded_by if extraction.get('decision') else None,
+        'verification_date': now if extraction.get('decision') else None,
+        'approval_status': status,
+        'notes': json.dumps(notes, ensure_ascii=False)
+    }
+
+
+def export_geojson(rows: List[Dict[str, Any]], path: str) -> int:
+    """Write ingested rows as a GeoJSON FeatureCollection (null geometry when no coordinates were found)"""
+    features = []
+    for row in rows:
+        properties = {key: value for key, value in row.items() if key not in ('latitude', 'longitude')}
+        geometry = ({'type': 'Point', 'coordinates': [row['longitude'], row['latitude']]}
+                    if row['has_coordinates'] else None)
+        features.append({'type': 'Feature', 'geometry': geometry, 'properties': properties})
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'type': 'FeatureCollection', 'features': features}, f, ensure_ascii=False)
+    return len(features)
+
+
+def export_parquet(rows: List[Dict[str, Any]], path: str) -> int:
+    """Write ingested rows as Parquet (needs pandas with pyarrow or fastparquet)"""
+    import pandas as pd
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    pd.DataFrame(rows).to_parquet(path, index=False)
+    return len(rows)
+
+
+class ProgressReporter:
+    """Periodic throughput log: processed, failed and skipped counts, docs/sec and ETA"""
+
+    def __init__(self, total: int, interval: float = REPORT_SECONDS):
+        self.total = total
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.done = self.failed = self.skipped = 0
+
+    def update(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        elapsed = now - self.start
+        processed = self.done + self.failed
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - processed - self.skipped
+        eta = f"{remaining / rate:.0f}s" if rate > 0 else 'n/a'
+        logger.info(f"Ingested {self.done}, failed {self.failed}, skipped {self.skipped} of {self.total} "
+                    f"({rate:.2f} docs/sec, ETA {eta})")
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.start
+        processed = self.done + self.failed
+        return {
+            'total': self.total,
+            'ingested': self.done,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'seconds': round(elapsed, 2),
+            'docs_per_sec': round(processed / elapsed, 3) if elapsed > 0 else 0.0
+        }
+
+
+def ingest(root: str, db_path: Optional[str] = None, state: Optional[str] = None, workers: Optional[int] = None,
+           verify: bool = False, retry_failed: bool = False, commit_every: int = COMMIT_EVERY,
+           uploaded_by: str = UPLOADED_BY, report_seconds: float = REPORT_SECONDS,
+           extract: Callable[..., Dict[str, Any]] = extract_document) -> Dict[str, Any]:
+    """
+    Ingest every document below root that is not already in the checkpoint log
+
+    db_path defaults to the web app's runtime atlas database (data/fra_atlas.db).
+
+    `extract` is called as extract(path, state=, verifier=, file_hash=) and
+    returns what extract_document does.
+
+    Returns:
+        Run summary with counts, elapsed seconds and docs/sec
+    """
+    store = IngestStore(db_path or default_db_path())
+    seen = store.processed_hashes(include_failed=not retry_failed)
+    paths = find_documents(root)
+    progress = ProgressReporter(len(paths), report_seconds)
+    logger.info(f"Found {len(paths)} document(s) under {root}; {len(seen)} hash(es) already processed")
+
+    verifier = None
+    if verify:
+        verification_dir = os.path.join(PROJECT_ROOT, 'patta_verification')
+        if verification_dir not in sys.path:
+            sys.path.append(verification_dir)
+        from patta_verifier import PattaVerifier
+        verifier = PattaVerifier()
+
+    hashes: Dict[str, str] = {}
+
+    def items():
+        """Hash lazily so workers start before the whole tree is read; duplicates are skipped too"""
+        for path in paths:
+            try:
+                file_hash = sha256_file(path)
+            except OSError as e:
+                logger.warning(f"Cannot read {path}: {e}")
+                progress.skipped += 1
+                continue
+            if file_hash in seen:
+                progress.skipped += 1
+                continue
+            seen.add(file_hash)
+            hashes[path] = file_hash
+            yield file_hash, path
+
+    def process(path: str) -> Dict[str, Any]:
+        return extract(path, state=state, verifier=verifier, file_hash=hashes.get(path))
+
+    batch: List[Dict[str, Any]] = []
+    extractor = BatchExtractor(max_workers=workers)
+    try:
+        for file_hash, path, extraction, seconds in extractor.run(items(), process):
+            record = {'file_hash': file_hash, 'path': path, 'seconds': seconds}
+            if 'error' in extraction:
+                record['error'] = extraction['error']
+                progress.failed += 1
+            else:
+                record['row'] = patta_file_row(path, root, extraction, file_hash, uploaded_by)
+                record['has_coordinates'] = extraction['latitude'] is not None
+                progress.done += 1
+            batch.append(record)
+            if len(batch) >= commit_every:
+                store.write_batch(batch)
+                batch = []
+            progress.update()
+    finally:
+        # Whatever finished before an interruption is still checkpointed
+        if batch:
+            store.write_batch(batch)
+        extractor.shutdown()
+
+    progress.update(force=True)
+    return progress.summary()
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description='Bulk-ingest a directory tree of patta/claim documents')
+    parser.add_argument('root', help='Directory to scan recursively')
+    parser.add_argument('--db', default=None, help="SQLite database holding patta_files (default: the web app's data/fra_atlas.db)")
+    parser.add_argument('--state', default=None, help='State of the documents, used to pick extraction strategies')
+    parser.add_argument('--workers', type=int, default=None, help='Documents processed in parallel')
+    parser.add_argument('--verify', action='store_true', help='Run full PattaVerifier verification instead of extraction only')
+    parser.add_argument('--retry-failed', action='store_true', help='Reprocess documents that failed in earlier runs')
+    parser.add_argument('--commit-every', type=int, default=COMMIT_EVERY, help='Documents per database transaction')
+    parser.add_argument('--uploaded-by', default=UPLOADED_BY, help='Value for patta_files.uploaded_by')
+    parser.add_argument('--report-seconds', type=float, default=REPORT_SECONDS, help='Seconds between throughput reports')
+    parser.add_argument('--geojson', default=DEFAULT_GEOJSON, help='GeoJSON export path (default: data/patta_files.geojson)')
+    parser.add_argument('--parquet', default=None, help='Parquet export path (optional)')
+    parser.add_argument('--no-export', action='store_true', help='Skip the GeoJSON/Parquet export')
+    args = parser.parse_args()
+
+    db_path = args.db or default_db_path()
+    summary = ingest(args.root, db_path=db_path, state=args.state, workers=args.workers, verify=args.verify,
+                     retry_failed=args.retry_failed, commit_every=max(1, args.commit_every),
+                     uploaded_by=args.uploaded_by, report_seconds=args.report_seconds)
+
+    if not args.no_export:
+        rows = IngestStore(db_path).ingested_rows()
+        if args.geojson:
+            logger.info(f"Wrote {export_geojson(rows, args.geojson)} feature(s) to {args.geojson}")
+        if args.parquet:
+            try:
+                logger.info(f"Wrote {export_parquet(rows, args.parquet)} row(s) to {args.parquet}")
+            except ImportError as e:
+                logger.error(f"Parquet export needs pandas and pyarrow: {e}")
+
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
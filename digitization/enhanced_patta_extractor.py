@@ -5,16 +5,24 @@ Based on improved regex patterns and OCR optimization
 
 import re
 import os
+import sys
 import json
 import logging
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime
-import pdfplumber
 from pdf2image import convert_from_path
 import pytesseract
 from PIL import Image
 import io
 
+# Add project root to path for shared OCR imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from digitization.ocr_pool import get_ocr_executor
+from digitization.extraction_engine import acquire_text
+
 # Configure Tesseract path for Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
@@ -22,6 +30,9 @@ pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tessera
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Tesseract options restricted to the Latin and Tamil characters found on pattas
+OCR_CONFIG = '--psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789அஆஇஈஉஊஎஏஐஒஓஔகஙசஜஞடணதநனபமயரலவழளறனஷஸஹ் '
+
 class EnhancedPattaExtractor:
     """Enhanced Patta Document Extractor with optimized Tamil+English OCR"""
     
@@ -42,17 +53,14 @@ class EnhancedPattaExtractor:
         try:
             # Convert PDF to images with higher DPI for better OCR
             images = convert_from_path(pdf_path, dpi=300)
-            all_text = []
+            logger.info(f"Processing {len(images)} page(s) with OCR...")
             
-            for i, img in enumerate(images):
-                logger.info(f"Processing page {i+1} with OCR...")
-                # Use Tamil+English with optimized config
-                txt = pytesseract.image_to_string(
-                    img, 
-                    lang="tam+eng",
-                    config='--psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789அஆஇஈஉஊஎஏஐஒஓஔகஙசஜஞடணதநனபமயரலவழளறனஷஸஹ் '
-                )
-                all_text.append(txt)
+            # Use Tamil+English with optimized config, pages in parallel
+            all_text = get_ocr_executor().ocr_pages(
+                images,
+                lang="tam+eng",
+                config=OCR_CONFIG
+            )
             
             return "\n".join(all_text)
             
@@ -232,26 +240,9 @@ class EnhancedPattaExtractor:
         """Main extraction method with enhanced processing"""
         logger.info(f"Starting enhanced extraction from PDF: {pdf_path}")
         
-        # Step 1: Try direct text extraction
-        text = ""
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for p in pdf.pages:
-                    t = p.extract_text() or ""
-                    text += t + "\n"
-            logger.info("Extracted text from PDF pages")
-        except Exception as e:
-            logger.error(f"PDF text extraction failed: {e}")
-            text = ""
-        
-        # Step 2: Always use OCR for Tamil documents (better accuracy)
-        logger.info("Using OCR for Tamil document processing...")
-        ocr_text = self.ocr_pdf(pdf_path)
-        if ocr_text and len(ocr_text.strip()) > len(text.strip()):
-            text = ocr_text
-            logger.info("OCR text used (better than PDF text)")
-        else:
-            logger.info("PDF text used (OCR not better)")
+        # Steps 1-2: Shared text acquisition (clean text layer pages as-is, OCR for the rest)
+        document = acquire_text(pdf_path, lang="tam+eng", config=OCR_CONFIG)
+        text = document.text
         
         # Step 3: Extract fields
         fields = self.extract_fields(text)
@@ -274,7 +265,8 @@ class EnhancedPattaExtractor:
             "confidence_scores": confidence_scores,
             "extraction_timestamp": datetime.now().isoformat(),
             "text_length": len(text),
-            "ocr_used": len(text.strip()) < 100
+            "ocr_used": document.ocr_used,
+            "page_sources": document.page_sources
         }
         
         logger.info("Enhanced extraction completed successfully")
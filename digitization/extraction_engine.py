@@ -0,0 +1,502 @@
+"""
+Unified Patta Extraction Engine
+Acquires a document's text once and runs registered field-extraction strategies over it, cheapest first, into one canonical schema
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+import threading
+import unicodedata
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Any
+import pdfplumber
+
+# Add project root to path for the root-level extractors
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from digitization.ocr_pool import get_ocr_executor
+from digitization.page_images import DocumentPages, render_pages
+from digitization.preprocessing import DEFAULT_PROFILE, PREPROCESS_PROFILES
+from digitization.script_router import AUTO_LANG
+from digitization.text_layer import assess_text_layer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Canonical output fields, in display order
+CANONICAL_FIELDS = [
+    'owner_name', 'father_or_husband', 'patta_no', 'survey_no', 'dag_no', 'khasra',
+    'area', 'village', 'taluk', 'district', 'date'
+]
+
+# Fields that must be confident before the engine stops trying further strategies
+CORE_FIELDS = ['owner_name', 'patta_no', 'survey_no', 'village', 'taluk', 'district']
+
+# Engine configuration (overridable through the environment)
+STOP_CONFIDENCE = float(os.environ.get('FRA_EXTRACTION_STOP_CONFIDENCE', 0.8))
+REVIEW_CONFIDENCE = 0.6
+OCR_DPI = 300
+OCR_CONFIG = '--psm 6'
+
+# Placeholder values the legacy extractors return for missing fields
+MISSING_VALUES = {'', 'not found', 'none', 'null'}
+
+STATE_ALIASES = {
+    'tn': 'tamil nadu',
+    'mp': 'madhya pradesh',
+    'od': 'odisha',
+    'or': 'odisha',
+    'tr': 'tripura',
+    'tg': 'telangana',
+    'ts': 'telangana',
+}
+
+# Shape of a plausible value per field; anything else is kept at low confidence
+NUMBER_RE = re.compile(r'^\d{1,6}(?:\s*[/\-]\s*\w{1,4}){0,3}$')
+FIELD_FORMATS = {
+    'patta_no': NUMBER_RE,
+    'survey_no': NUMBER_RE,
+    'dag_no': NUMBER_RE,
+    'khasra': NUMBER_RE,
+    'date': re.compile(r'^\d{1,2}[/\-\.]\d{1,2}[/\-\.]\d{2,4}$'),
+    'area': re.compile(r'^\d+(?:\.\d+)?(?:\s*\S+){0,2}$'),
+}
+NAME_FIELDS = {'owner_name': 6, 'father_or_husband': 6}
+PLACE_FIELDS = {'village': 4, 'taluk': 4, 'district': 4}
+
+
+def normalize_state(state: Optional[str]) -> Optional[str]:
+    """Lower-case state name with common abbreviations expanded ('TN' -> 'tamil nadu')"""
+    if not state:
+        return None
+    key = state.strip().lower()
+    return STATE_ALIASES.get(key, key)
+
+
+def clean_value(value: Any) -> Optional[str]:
+    """Collapse whitespace and map the legacy 'Not found' style placeholders to None"""
+    if value is None:
+        return None
+    value = re.sub(r'\s+', ' ', str(value)).strip()
+    return None if value.lower() in MISSING_VALUES else value
+
+
+def score_field(field: str, value: Optional[str]) -> float:
+    """
+    Confidence of a field value from its shape alone
+
+    Scoring is the same whichever strategy produced the value, so results of
+    different strategies can be compared and merged.
+    """
+    if not value:
+        return 0.0
+    if field in FIELD_FORMATS:
+        return 0.9 if FIELD_FORMATS[field].match(value) else 0.4
+    max_words = NAME_FIELDS.get(field) or PLACE_FIELDS.get(field)
+    if max_words:
+        plausible = (len(value.split()) <= max_words and len(value) <= 60
+                     and not any(ch.isdigit() for ch in value))
+        return 0.85 if plausible else 0.4
+    return 0.5
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize, collapse runs of spaces/tabs and drop blank lines, keeping line structure"""
+    text = unicodedata.normalize('NFC', text.replace('\r\n', '\n').replace('\r', '\n'))
+    lines = (re.sub(r'[ \t\f\v]+', ' ', line).strip() for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class DocumentText:
+    """Text of one document, acquired once and shared by every strategy"""
+
+    def __init__(self, pages: List[str], page_sources: List[Dict[str, Any]], source_file: str = ''):
+        self.pages = pages
+        self.page_sources = page_sources
+        self.source_file = source_file
+        self._normalized: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """Raw text of all pages, in page order"""
+        return '\n'.join(self.pages)
+
+    @property
+    def normalized(self) -> str:
+        """Normalized text (see normalize_text), computed on first use"""
+        if self._normalized is None:
+            self._normalized = normalize_text(self.text)
+        return self._normalized
+
+    @property
+    def ocr_used(self) -> bool:
+        """Whether any page's text came from OCR"""
+        return any(page.get('source') == 'ocr' for page in self.page_sources)
+
+
+def read_text_layer(pdf_path: str) -> Optional[List[str]]:
+    """Return the text layer of each PDF page, or None if the PDF could not be read"""
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            return [p.extract_text() or "" for p in pdf.pages]
+    except Exception as e:
+        logger.error(f"PDF text extraction failed: {e}")
+        return None
+
+
+def _ocr_records(file_path: str, page_indexes: Optional[List[int]], lang: str, config: str,
+                 preprocess: Optional[str], page_count: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+    """OCR the given pages (all pages when None) with the shared pool, keyed by page index"""
+    try:
+        if page_indexes is None:
+            pages = DocumentPages(file_path, dpi=OCR_DPI)
+            images = pages.pages()
+            page_indexes = list(range(len(images)))
+        else:
+            # Render only the pages that need OCR, one poppler call per contiguous run
+            images = render_pages(file_path, page_indexes, dpi=OCR_DPI, page_count=page_count)
+    except Exception as e:
+        logger.error(f"Could not render {file_path} for OCR: {e}")
+        return {}
+
+    logger.info(f"Processing {len(images)} page(s) with OCR...")
+    records = get_ocr_executor().run_pages(images, lang=lang, config=config, preprocess=preprocess)
+    return {index: record for index, record in zip(page_indexes, records)}
+
+
+def acquire_text(file_path: str, lang: str = AUTO_LANG, config: str = OCR_CONFIG,
+                 force_ocr: bool = False, preprocess: Optional[str] = DEFAULT_PROFILE) -> DocumentText:
+    """
+    Text acquisition stage: use each PDF page's text layer when it passes the
+    quality check and OCR only the pages that fail (images are always OCR'd)
+
+    Every page records where its text came from in DocumentText.page_sources.
+    """
+    source_file = os.path.basename(file_path)
+    page_texts = read_text_layer(file_path) if file_path.lower().endswith('.pdf') else None
+
+    if page_texts is None:
+        records = _ocr_records(file_path, None, lang, config, preprocess)
+        pages, sources = [], []
+        for i in sorted(records):
+            pages.append(records[i]['output'])
+            sources.append({'page': i + 1, 'source': 'ocr', 'usable': False, 'reasons': ['no_text_layer'],
+                            'ocr_lang': records[i]['lang'], 'ocr_seconds': round(records[i]['seconds'], 4),
+                            'preprocess': records[i]['preprocess']})
+        return DocumentText(pages, sources, source_file)
+
+    sources = []
+    for i, page_text in enumerate(page_texts):
+        decision = {'page': i + 1, **assess_text_layer(page_text)}
+        if force_ocr:
+            decision['reasons'].append('forced')
+        decision['source'] = 'text_layer' if decision['usable'] and not force_ocr else 'ocr'
+        sources.append(decision)
+
+    ocr_indexes = [d['page'] - 1 for d in sources if d['source'] == 'ocr']
+    if not ocr_indexes:
+        logger.info("Text layer usable on every page, OCR skipped")
+        return DocumentText(page_texts, sources, source_file)
+
+    logger.info(f"Text layer rejected on page(s) {[i + 1 for i in ocr_indexes]}, running OCR")
+    records = _ocr_records(file_path, ocr_indexes, lang, config, preprocess, page_count=len(page_texts))
+    for i in ocr_indexes:
+        record = records.get(i)
+        ocr_text = record['output'] if record else ""
+        if record:
+            sources[i]['ocr_lang'] = record['lang']
+            sources[i]['ocr_seconds'] = round(record['seconds'], 4)
+            sources[i]['preprocess'] = record['preprocess']
+        # Keep the text layer when OCR recovers less text than it had
+        if len(ocr_text.strip()) > len(page_texts[i].strip()):
+            page_texts[i] = ocr_text
+        else:
+            sources[i]['source'] = 'text_layer'
+            sources[i]['ocr_rejected'] = True
+    return DocumentText(page_texts, sources, source_file)
+
+
+class ExtractionStrategy(ABC):
+    """
+    A field-extraction step plugged into the engine
+
+    Subclasses set `name` and `cost` (relative CPU cost; the engine runs cheap
+    strategies first), optionally restrict `states` (lower-case names, None for
+    any state) and `doc_types`, and must implement extract_fields().
+    """
+
+    name = 'strategy'
+    cost = 1.0
+    states: Optional[Set[str]] = None
+    doc_types: Set[str] = {'patta'}
+
+    def applies_to(self, state: Optional[str], doc_type: str) -> bool:
+        """Whether this strategy handles documents of the given state and type"""
+        if doc_type not in self.doc_types:
+            return False
+        return self.states is None or state is None or state in self.states
+
+    @abstractmethod
+    def extract_fields(self, document: DocumentText) -> Dict[str, Optional[str]]:
+        """Return canonical field values found in the document (missing fields may be omitted)"""
+
+    def confidence(self, field: str, value: Optional[str]) -> float:
+        """Confidence of one extracted value (shape-based by default)"""
+        return score_field(field, value)
+
+    def describe(self) -> Dict[str, Any]:
+        """Registry listing entry"""
+        return {
+            'name': self.name,
+            'cost': self.cost,
+            'states': sorted(self.states) if self.states else None,
+            'doc_types': sorted(self.doc_types)
+        }
+
+
+class PattaExtractorStrategy(ExtractionStrategy):
+    """Multilingual pattern table of digitization.patta_extractor.PattaExtractor (8 scripts, script-prefiltered)"""
+
+    name = 'multilingual_patterns'
+    cost = 1.0
+    # PattaExtractor's keys that differ from the canonical ones
+    FIELD_MAP = {'name': 'owner_name'}
+
+    def extract_fields(self, document: DocumentText) -> Dict[str, Optional[str]]:
+        from digitization.patta_extractor import PattaExtractor
+        # PattaExtractor keeps per-document state, so each call gets its own instance;
+        # it applies its own cleanup, so it reads the raw text
+        parsed = PattaExtractor()._parse_text(document.text)
+        return {self.FIELD_MAP.get(key, key): value for key, value in parsed.items()
+                if self.FIELD_MAP.get(key, key) in CANONICAL_FIELDS}
+
+
+class LabelledPatternStrategy(ExtractionStrategy):
+    """
+    Adapter for the legacy extractors exposing extract_field(text, field_name)
+
+    Only their regex tables are used; their own PDF/OCR loops never run here.
+    """
+
+    def __init__(self, name: str, cost: float, factory: Callable[[], Any], states: Optional[Set[str]] = None):
+        self.name = name
+        self.cost = cost
+        self.states = states
+        self._factory = factory
+        self._parser = None
+        self._lock = threading.Lock()
+
+    def _get_parser(self):
+        """Import and build the wrapped extractor on first use"""
+        with self._lock:
+            if self._parser is None:
+                self._parser = self._factory()
+            return self._parser
+
+    def extract_fields(self, document: DocumentText) -> Dict[str, Optional[str]]:
+        parser = self._get_parser()
+        return {field: parser.extract_field(document.normalized, field) for field in CANONICAL_FIELDS}
+
+
+class EnhancedExtractorStrategy(ExtractionStrategy):
+    """Regex set of digitization.enhanced_patta_extractor (already keyed by canonical field)"""
+
+    name = 'enhanced_tamil'
+    cost = 3.0
+    states = {'tamil nadu'}
+
+    def extract_fields(self, document: DocumentText) -> Dict[str, Optional[str]]:
+        from digitization.enhanced_patta_extractor import EnhancedPattaExtractor
+        return EnhancedPattaExtractor().extract_fields(document.normalized)
+
+
+def _expert_parser():
+    from digitization.expert_patta_parser import ExpertPattaParser
+    return ExpertPattaParser()
+
+
+def _production_parser():
+    from production_patta_extractor import ProductionPattaExtractor
+    return ProductionPattaExtractor()
+
+
+def _final_parser():
+    from final_comprehensive_extractor import FinalComprehensiveExtractor
+    return FinalComprehensiveExtractor()
+
+
+class ExtractorRegistry:
+    """Strategies available to the engine, looked up per state and document type"""
+
+    def __init__(self):
+        self._strategies: Dict[str, ExtractionStrategy] = {}
+        self._lock = threading.Lock()
+
+    def register(self, strategy: ExtractionStrategy) -> ExtractionStrategy:
+        """Add a strategy (replacing any registered under the same name)"""
+        with self._lock:
+            self._strategies[strategy.name] = strategy
+        return strategy
+
+    def unregister(self, name: str) -> None:
+        """Remove a strategy by name"""
+        with self._lock:
+            self._strategies.pop(name, None)
+
+    def get(self, name: str) -> Optional[ExtractionStrategy]:
+        """Return a strategy by name"""
+        return self._strategies.get(name)
+
+    def strategies_for(self, state: Optional[str] = None, doc_type: str = 'patta') -> List[ExtractionStrategy]:
+        """Strategies applicable to a document, cheapest first (registration order breaks ties)"""
+        state = normalize_state(state)
+        with self._lock:
+            strategies = list(self._strategies.values())
+        return sorted((s for s in strategies if s.applies_to(state, doc_type)), key=lambda s: s.cost)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """All registered strategies, cheapest first"""
+        with self._lock:
+            strategies = list(self._strategies.values())
+        return [s.describe() for s in sorted(strategies, key=lambda s: s.cost)]
+
+
+def register_default_strategies(registry: ExtractorRegistry) -> ExtractorRegistry:
+    """Register the repository's extractors as strategies"""
+    tamil_nadu = {'tamil nadu'}
+    registry.register(PattaExtractorStrategy())
+    registry.register(LabelledPatternStrategy('expert_tamil', 2.0, _expert_parser, states=tamil_nadu))
+    registry.register(LabelledPatternStrategy('production_tamil', 2.0, _production_parser, states=tamil_nadu))
+    registry.register(EnhancedExtractorStrategy())
+    # Lazy .*? lookahead patterns, the most expensive table
+    registry.register(LabelledPatternStrategy('comprehensive_tamil', 4.0, _final_parser, states=tamil_nadu))
+    return registry
+
+
+# Process-wide registry used by the engine unless another is passed in
+extractor_registry = register_default_strategies(ExtractorRegistry())
+
+
+class ExtractionEngine:
+    """
+    Staged extraction pipeline
+
+    1. Text acquisition (text layer or OCR, per page, shared by every strategy)
+    2. Normalization (available to strategies as DocumentText.normalized)
+    3. Field extraction by each applicable strategy, cheapest first, keeping the
+       most confident value per field and stopping once every core field is
+       at least `stop_confidence`
+    4. Post-processing into the canonical schema
+    """
+
+    def __init__(self, registry: Optional[ExtractorRegistry] = None, stop_confidence: float = STOP_CONFIDENCE,
+                 core_fields: Optional[List[str]] = None, lang: str = AUTO_LANG, config: str = OCR_CONFIG,
+                 preprocess: Optional[str] = None):
+        self.registry = registry or extractor_registry
+        self.stop_confidence = stop_confidence
+        self.core_fields = core_fields or CORE_FIELDS
+        self.lang = lang
+        self.config = config
+        # Pre-processing profile; by default the one named after the document type, if any
+        self.preprocess = preprocess
+
+    def extract(self, file_path: str, state: Optional[str] = None, doc_type: str = 'patta',
+                force_ocr: bool = False) -> Dict[str, Any]:
+        """Run the full pipeline on a PDF or image"""
+        start = time.perf_counter()
+        preprocess = self.preprocess or (doc_type if doc_type in PREPROCESS_PROFILES else DEFAULT_PROFILE)
+        try:
+            document = acquire_text(file_path, lang=self.lang, config=self.config, force_ocr=force_ocr,
+                                    preprocess=preprocess)
+        except Exception as e:
+            logger.error(f"Text acquisition failed for {file_path}: {e}")
+            return {'source_file': os.path.basename(file_path), 'success': False, 'error': str(e)}
+        acquisition_seconds = time.perf_counter() - start
+
+        result = self.extract_document(document, state=state, doc_type=doc_type)
+        result['timings']['text_acquisition_seconds'] = round(acquisition_seconds, 4)
+        result['timings']['total_seconds'] = round(time.perf_counter() - start, 4)
+        return result
+
+    def extract_document(self, document: DocumentText, state: Optional[str] = None,
+                         doc_type: str = 'patta') -> Dict[str, Any]:
+        """Run the strategies over already acquired text"""
+        fields: Dict[str, Optional[str]] = {field: None for field in CANONICAL_FIELDS}
+        confidence: Dict[str, float] = {field: 0.0 for field in CANONICAL_FIELDS}
+        field_sources: Dict[str, str] = {}
+        runs = []
+        stopped_early = False
+
+        strategies = self.registry.strategies_for(state, doc_type)
+        for position, strategy in enumerate(strategies):
+            strategy_start = time.perf_counter()
+            run = {'name': strategy.name, 'cost': strategy.cost, 'fields_improved': [], 'error': None}
+            try:
+                found = strategy.extract_fields(document)
+            except Exception as e:
+                logger.warning(f"Strategy {strategy.name} failed: {e}")
+                run['error'] = str(e)
+                found = {}
+
+            for field, raw_value in found.items():
+                if field not in fields:
+                    continue
+                value = clean_value(raw_value)
+                score = strategy.confidence(field, value) if value else 0.0
+                if score > confidence[field]:
+                    fields[field] = value
+                    confidence[field] = score
+                    field_sources[field] = strategy.name
+                    run['fields_improved'].append(field)
+
+            run['seconds'] = round(time.perf_counter() - strategy_start, 4)
+            runs.append(run)
+            if all(confidence[field] >= self.stop_confidence for field in self.core_fields):
+                stopped_early = position < len(strategies) - 1
+                break
+
+        extracted = sum(1 for value in fields.values() if value)
+        return {
+            'source_file': document.source_file,
+            'success': True,
+            'state': normalize_state(state),
+            'doc_type': doc_type,
+            'fields': fields,
+            'confidence': {field: round(score, 2) for field, score in confidence.items()},
+            'field_sources': field_sources,
+            'needs_review': [field for field in CANONICAL_FIELDS if confidence[field] < REVIEW_CONFIDENCE],
+            'success_rate': round(extracted / len(CANONICAL_FIELDS) * 100, 1),
+            'strategies': runs,
+            'stopped_early': stopped_early,
+            'page_sources': document.page_sources,
+            'ocr_used': document.ocr_used,
+            'raw_text_snippet': document.text[:1000],
+            'text_length': len(document.text),
+            'timings': {'strategy_seconds': round(sum(run['seconds'] for run in runs), 4)},
+            'extraction_timestamp': datetime.now().isoformat()
+        }
+
+
+_shared_engine: Optional[ExtractionEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_extraction_engine() -> ExtractionEngine:
+    """Return the process-wide engine over the default registry"""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = ExtractionEngine()
+        return _shared_engine
+
+
+def extract_patta(file_path: str, state: Optional[str] = None, doc_type: str = 'patta') -> Dict[str, Any]:
+    """Extract a patta into the canonical schema with the shared engine"""
+    return get_extraction_engine().extract(file_path, state=state, doc_type=doc_type)
@@ -0,0 +1,163 @@
+"""
+Shared Model Registry
+Loads spaCy pipelines lazily on first use, once per process, and can pre-warm them (and the OCR pool) in the background
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Registry configuration (overridable through the environment)
+SPACY_MODEL = os.environ.get('FRA_SPACY_MODEL', 'en_core_web_sm')
+# Only entities are used, so the dependency parser and lemmatizer are not loaded
+SPACY_DISABLE = [name for name in os.environ.get('FRA_SPACY_DISABLE', 'parser,lemmatizer').split(',') if name]
+PREWARM_ENABLED = os.environ.get('FRA_MODEL_PREWARM', '1') == '1'
+
+# Batched NER over many documents (nlp.pipe)
+NER_BATCH_SIZE = int(os.environ.get('FRA_NER_BATCH_SIZE', 64))
+NER_PROCESSES = int(os.environ.get('FRA_NER_PROCESSES', 1))
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded spaCy pipelines
+
+    Loading happens on first use rather than at import or construction time,
+    so the app starts without paying for models it may not need, and every
+    module asking for the same (model, disabled components) shares one
+    instance. Failed loads are remembered so a missing model is reported once
+    instead of being retried on every request.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+        self._errors: Dict[Tuple[str, Tuple[str, ...]], Exception] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_spacy(self, name: Optional[str] = None, disable: Optional[List[str]] = None):
+        """
+        Return the spaCy pipeline for `name`, loading it on first use
+
+        Raises:
+            OSError: The model is not installed (or spaCy is not available)
+        """
+        name = name or SPACY_MODEL
+        key = (name, tuple(sorted(SPACY_DISABLE if disable is None else disable)))
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have finished loading while this one waited
+            if key in self._models:
+                return self._models[key]
+            if key in self._errors:
+                raise self._errors[key]
+
+            start = time.perf_counter()
+            try:
+                import spacy
+                model = spacy.load(name, disable=list(key[1]))
+            except ImportError as e:
+                self._errors[key] = OSError(f"spaCy is not installed: {e}")
+                raise self._errors[key]
+            except OSError as e:
+                self._errors[key] = e
+                raise
+            seconds = time.perf_counter() - start
+            self._models[key] = model
+            self._load_seconds[name] = round(seconds, 3)
+            logger.info(f"Loaded spaCy model '{name}' in {seconds:.2f}s (disabled: {', '.join(key[1]) or 'none'})")
+            return model
+
+    def is_loaded(self, name: Optional[str] = None) -> bool:
+        """Whether any pipeline for the model has been loaded"""
+        name = name or SPACY_MODEL
+        return any(key[0] == name for key in self._models)
+
+    def stats(self) -> Dict[str, Any]:
+        """Loaded models, their load times and failed loads"""
+        return {
+            'loaded': sorted({key[0] for key in self._models}),
+            'load_seconds': dict(self._load_seconds),
+            'failed': sorted({key[0] for key in self._errors})
+        }
+
+
+model_registry = ModelRegistry()
+
+
+def get_spacy_model(name: Optional[str] = None, disable: Optional[List[str]] = None):
+    """Shared spaCy pipeline from the process-wide registry (raises OSError if unavailable)"""
+    return model_registry.get_spacy(name, disable)
+
+
+def pipe_docs(texts: Iterable[Any], batch_size: int = NER_BATCH_SIZE, n_process: int = NER_PROCESSES,
+              as_tuples: bool = False, name: Optional[str] = None) -> Iterator[Any]:
+    """
+    Stream texts through the shared pipeline with nlp.pipe
+
+    Texts are consumed lazily and docs are yielded in input order as each
+    batch finishes, so a backfill over thousands of documents holds at most a
+    few batches in memory. With n_process > 1 spaCy fans batches out to worker
+    processes (scripts using this must guard their entry point with
+    `if __name__ == "__main__"`).
+
+    Args:
+        texts: Strings, or (text, context) tuples when as_tuples is set
+        batch_size: Texts per batch
+        n_process: Worker processes; -1 uses every core
+        as_tuples: Yield (doc, context) pairs so callers can carry ids or paths along
+
+    Yields:
+        spaCy Docs, or (Doc, context) pairs
+    """
+    nlp = model_registry.get_spacy(name)
+    if n_process == -1:
+        n_process = os.cpu_count() or 1
+    yield from nlp.pipe(texts, batch_size=max(1, batch_size), n_process=max(1, n_process), as_tuples=as_tuples)
+
+
+def _prewarm(models: List[str], warm_ocr: bool) -> None:
+    """Load the given models and start the OCR workers, logging instead of raising"""
+    for name in models:
+        try:
+            model_registry.get_spacy(name)
+        except OSError as e:
+            logger.warning(f"Could not pre-warm spaCy model '{name}': {e}")
+    if warm_ocr:
+        try:
+            from digitization.ocr_pool import get_ocr_executor
+            get_ocr_executor().warm_up()
+        except Exception as e:
+            logger.warning(f"Could not pre-warm OCR workers: {e}")
+
+
+def prewarm_models(models: Optional[List[str]] = None, warm_ocr: bool = True,
+                   background: bool = True) -> Optional[threading.Thread]:
+    """
+    Load models ahead of the first request
+
+    Meant to be called once the server is starting up; with `background` the
+    work runs on a daemon thread so it never delays binding the port, and
+    requests arriving before it finishes simply wait on the same load.
+
+    Returns:
+        The pre-warm thread, or None when run inline or disabled by FRA_MODEL_PREWARM=0
+    """
+    if not PREWARM_ENABLED:
+        return None
+    models = models or [SPACY_MODEL]
+    if not background:
+        _prewarm(models, warm_ocr)
+        return None
+    thread = threading.Thread(target=_prewarm, args=(models, warm_ocr), name='model-prewarm', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,261 @@
+"""
+Tesseract OCR Backends
+Runs Tesseract either as a subprocess per call (pytesseract) or through long-lived in-process API handles (tesserocr)
+"""
+
+import os
+import shlex
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Any
+import pytesseract
+from PIL import Image
+
+try:
+    import tesserocr
+except ImportError:  # optional: pip install tesserocr
+    tesserocr = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 'auto' uses tesserocr when it is installed, 'tesserocr' or 'subprocess' force one backend
+DEFAULT_BACKEND = os.environ.get('FRA_OCR_BACKEND', 'auto')
+
+# Loaded API handles kept per worker thread; each holds one language set's traineddata in memory
+MAX_API_HANDLES = int(os.environ.get('FRA_OCR_MAX_HANDLES', 4))
+
+# Column order of Tesseract's TSV output, as returned by image_to_data
+TSV_COLUMNS = ['level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+               'left', 'top', 'width', 'height', 'conf', 'text']
+
+
+def parse_config(config: str) -> Tuple[Optional[int], Optional[int], Dict[str, str]]:
+    """
+    Split a pytesseract-style config string into (psm, oem, variables)
+
+    Understands '--psm N', '--oem N' and '-c name=value', which is all the
+    extractors pass.
+    """
+    psm = oem = None
+    variables: Dict[str, str] = {}
+    tokens = shlex.split(config or '')
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        value = tokens[i + 1] if i + 1 < len(tokens) else ''
+        if token == '--psm':
+            psm = int(value)
+            i += 1
+        elif token == '--oem':
+            oem = int(value)
+            i += 1
+        elif token == '-c' and '=' in value:
+            name, _, setting = value.partition('=')
+            variables[name] = setting
+            i += 1
+        elif token.startswith('-c') and '=' in token[2:]:
+            name, _, setting = token[2:].partition('=')
+            variables[name] = setting
+        else:
+            logger.debug(f"Ignoring Tesseract option '{token}'")
+        i += 1
+    return psm, oem, variables
+
+
+def parse_tsv(tsv: str) -> Dict[str, List[Any]]:
+    """Tesseract TSV rows to the column dictionary pytesseract.image_to_data returns"""
+    data: Dict[str, List[Any]] = {column: [] for column in TSV_COLUMNS}
+    for line in tsv.splitlines():
+        fields = line.split('\t')
+        if len(fields) < len(TSV_COLUMNS) - 1 or fields[0] == 'level':
+            continue
+        fields += [''] * (len(TSV_COLUMNS) - len(fields))
+        for column, value in zip(TSV_COLUMNS, fields):
+            if column == 'text':
+                data[column].append(value)
+            elif column == 'conf':
+                data[column].append(float(value))
+            else:
+                data[column].append(int(value))
+    return data
+
+
+class SubprocessBackend:
+    """pytesseract: one tesseract process per call, re-loading traineddata every time"""
+
+    name = 'subprocess'
+
+    def image_to_string(self, image: Image.Image, lang: Optional[str] = None, config: str = '',
+                        timeout: float = 0) -> str:
+        kwargs = {'config': config, 'timeout': timeout}
+        if lang:
+            kwargs['lang'] = lang
+        return pytesseract.image_to_string(image, **kwargs)
+
+    def image_to_data(self, image: Image.Image, lang: Optional[str] = None, config: str = '',
+                      timeout: float = 0) -> Dict[str, List[Any]]:
+        kwargs = {'config': config, 'timeout': timeout}
+        if lang:
+            kwargs['lang'] = lang
+        return pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, **kwargs)
+
+    def image_to_osd(self, image: Image.Image) -> Dict[str, Any]:
+        """Orientation and script detection; returns at least 'script' and 'script_conf'"""
+        return pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT)
+
+    def preload(self, lang: Optional[str] = None, config: str = '') -> None:
+        """Nothing to keep loaded: every call starts a fresh tesseract process"""
+
+
+class TesserocrBackend:
+    """
+    tesserocr: Tesseract's C++ API in-process, with initialised handles reused across calls
+
+    Loading traineddata dominates short pages (especially 'tam+eng'), so each
+    OCR worker keeps its handles alive between pages and documents. Handles
+    are not thread-safe and are therefore cached per thread, keyed by language,
+    engine mode and variables, with the least recently used one closed beyond
+    MAX_API_HANDLES. Languages a handle cannot be initialised for (missing
+    traineddata) fall back to the subprocess backend.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, max_handles: int = MAX_API_HANDLES):
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        self.max_handles = max(1, max_handles)
+        self.fallback = SubprocessBackend()
+        self._local = threading.local()
+
+    def _handles(self) -> 'OrderedDict[Tuple, Any]':
+        handles = getattr(self._local, 'handles', None)
+        if handles is None:
+            handles = self._local.handles = OrderedDict()
+        return handles
+
+    def _get_api(self, lang: Optional[str], oem: Optional[int], variables: Dict[str, str]):
+        """Return an initialised handle for the key, creating (and evicting) as needed"""
+        lang = lang or 'eng'
+        key = (lang, oem, tuple(sorted(variables.items())))
+        handles = self._handles()
+        api = handles.get(key)
+        if api is not None:
+            handles.move_to_end(key)
+            return api
+
+        kwargs = {'lang': lang, 'variables': dict(variables)}
+        if oem is not None:
+            kwargs['oem'] = oem
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        handles[key] = api
+        logger.info(f"Loaded Tesseract API handle for '{lang}' in process {os.getpid()}")
+        while len(handles) > self.max_handles:
+            _, stale = handles.popitem(last=False)
+            stale.End()
+        return api
+
+    def _recognize(self, image: Image.Image, lang: Optional[str], config: str, timeout: float):
+        """
+        Run recognition on a handle for (lang, config)
+
+        Returns the handle holding the result, or None when no handle can be
+        initialised for the language so the caller should fall back.
+        """
+        psm, oem, variables = parse_config(config)
+        try:
+            api = self._get_api(lang, oem, variables)
+        except RuntimeError as e:
+            logger.warning(f"tesserocr could not load '{lang}' ({e}), using subprocess OCR")
+            return None
+        api.SetPageSegMode(psm if psm is not None else tesserocr.PSM.AUTO)
+        api.SetImage(image)
+        if not api.Recognize(int(timeout * 1000) if timeout else 0):
+            api.Clear()
+            raise RuntimeError('Tesseract process timeout')
+        return api
+
+    def image_to_string(self, image: Image.Image, lang: Optional[str] = None, config: str = '',
+                        timeout: float = 0) -> str:
+        api = self._recognize(image, lang, config, timeout)
+        if api is None:
+            return self.fallback.image_to_string(image, lang, config, timeout)
+        text = api.GetUTF8Text()
+        api.Clear()
+        return text
+
+    def image_to_data(self, image: Image.Image, lang: Optional[str] = None, config: str = '',
+                      timeout: float = 0) -> Dict[str, List[Any]]:
+        api = self._recognize(image, lang, config, timeout)
+        if api is None:
+            return self.fallback.image_to_data(image, lang, config, timeout)
+        data = parse_tsv(api.GetTSVText(0))
+        api.Clear()
+        return data
+
+    def image_to_osd(self, image: Image.Image) -> Dict[str, Any]:
+        """Orientation and script detection; returns at least 'script' and 'script_conf'"""
+        api = self._get_api('osd', None, {})
+        api.SetPageSegMode(tesserocr.PSM.OSD_ONLY)
+        api.SetImage(image)
+        osd = api.DetectOrientationScript()
+        api.Clear()
+        if not osd:
+            raise RuntimeError('OSD failed')
+        return {'script': osd['script_name'], 'script_conf': osd['script_conf'],
+                'orientation': osd['orient_deg'], 'orientation_conf': osd['orient_conf']}
+
+    def preload(self, lang: Optional[str] = None, config: str = '') -> None:
+        """Load the handle for (lang, config) ahead of the first page"""
+        _, oem, variables = parse_config(config)
+        try:
+            self._get_api(lang, oem, variables)
+        except RuntimeError as e:
+            logger.warning(f"tesserocr could not load '{lang}': {e}")
+
+    def close(self) -> None:
+        """Release this thread's handles"""
+        handles = self._handles()
+        while handles:
+            _, api = handles.popitem()
+            api.End()
+
+
+_backends: Dict[str, Any] = {}
+_backends_lock = threading.Lock()
+
+
+def resolve_backend_name(name: Optional[str] = None) -> str:
+    """Concrete backend for a requested name ('auto', 'tesserocr' or 'subprocess')"""
+    name = name or DEFAULT_BACKEND
+    if name == 'auto':
+        return 'tesserocr' if tesserocr is not None else 'subprocess'
+    if name == 'tesserocr' and tesserocr is None:
+        logger.warning("tesserocr is not installed, using subprocess OCR")
+        return 'subprocess'
+    if name not in ('tesserocr', 'subprocess'):
+        logger.warning(f"Unknown OCR backend '{name}', using subprocess OCR")
+        return 'subprocess'
+    return name
+
+
+def get_ocr_backend(name: Optional[str] = None, tesseract_cmd: Optional[str] = None):
+    """
+    Return this process's backend instance, created on first use
+
+    OCR pool workers call this for every page, so a tesserocr backend and its
+    loaded handles live as long as the worker process.
+    """
+    resolved = resolve_backend_name(name)
+    if tesseract_cmd:
+        # Spawned workers do not inherit the module-level path set by the extractors
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    with _backends_lock:
+        backend = _backends.get(resolved)
+        if backend is None:
+            backend = TesserocrBackend() if resolved == 'tesserocr' else SubprocessBackend()
+            _backends[resolved] = backend
+        return backend
@@ -1,26 +1,27 @@
 import pytesseract
 from pdf2image import convert_from_path
-import spacy
 import pandas as pd
 import geopandas as gpd
 from shapely.geometry import Point
 import re
 import os
+import sys
+
+# Add project root to path for shared OCR imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from digitization.ocr_pool import get_ocr_executor
 
 # Set Tesseract path (adjust if different)
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
-
 def pdf_to_text(pdf_path):
     """Convert PDF to text using OCR"""
     try:
         pages = convert_from_path(pdf_path)
-        text = ""
-        for page in pages:
-            text += pytesseract.image_to_string(page)
-        return text
+        return "".join(get_ocr_executor().ocr_pages(pages))
     except Exception as e:
         print(f"Error processing PDF: {e}")
         # Fallback sample text for demo
@@ -33,9 +34,7 @@ def pdf_to_text(pdf_path):
         """
 
 def extract_entities(text):
-    """Extract village, patta holder, coordinates using NER and regex"""
-    doc = nlp(text)
-    
+    """Extract village, patta holder, coordinates using the labelled patterns, then demo defaults"""
     village = None
     patta_holder = None
     latitude = None
@@ -0,0 +1,230 @@
+"""
+Parallel Page-Level OCR Executor
+Runs Tesseract on the pages of a document in a bounded process pool and reassembles results in page order
+"""
+
+import os
+import time
+import atexit
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple, Any
+import pytesseract
+from PIL import Image
+from digitization.ocr_backend import get_ocr_backend, resolve_backend_name
+from digitization.preprocessing import DEFAULT_PROFILE, preprocess_page
+from digitization.script_router import AUTO_LANG, FALLBACK_LANG, route_page_lang
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pool configuration (overridable through the environment)
+DEFAULT_WORKERS = int(os.environ.get('FRA_OCR_WORKERS', min(4, os.cpu_count() or 1)))
+DEFAULT_PAGE_TIMEOUT = float(os.environ.get('FRA_OCR_PAGE_TIMEOUT', 120))
+
+# Extra time allowed on top of the Tesseract timeout for pickling and scheduling
+RESULT_GRACE_SECONDS = 10
+
+
+def _ocr_page_task(image: Image.Image, lang: Optional[str], config: str, mode: str, timeout: float,
+                   tesseract_cmd: str, preprocess: Optional[str] = None,
+                   backend: Optional[str] = None) -> Tuple[Any, float, Optional[str], Dict[str, Any]]:
+    """Worker entry point: pre-process and OCR one page and return (output, OCR seconds, lang used, pre-processing stats)"""
+    # The backend instance (and any loaded tesserocr handles) lives as long as the worker process
+    engine = get_ocr_backend(backend, tesseract_cmd)
+
+    image, prep = preprocess_page(image, preprocess)
+    start = time.perf_counter()
+    if lang == AUTO_LANG:
+        # Routing runs in the worker so script detection is parallel across pages too
+        lang, _ = route_page_lang(image, backend=backend)
+    if mode == 'data':
+        output = engine.image_to_data(image, lang=lang, config=config, timeout=timeout)
+    else:
+        output = engine.image_to_string(image, lang=lang, config=config, timeout=timeout)
+    return output, time.perf_counter() - start, lang, prep
+
+
+def _warm_up_task(tesseract_cmd: str, backend: Optional[str], lang: Optional[str], config: str) -> int:
+    """Worker entry point: create the backend and load the handle for the default language"""
+    get_ocr_backend(backend, tesseract_cmd).preload(lang, config)
+    return os.getpid()
+
+
+class PageOCRExecutor:
+    """
+    Bounded process pool for page-level OCR
+
+    Tesseract is single-threaded per page, so multi-page pattas are fanned out
+    across worker processes. Results always come back in page order, each page
+    is bounded by a timeout (enforced by pytesseract killing the tesseract
+    process, or by tesserocr cancelling recognition), and the number of pages
+    in flight is capped so concurrent uploads cannot queue unbounded page
+    images in memory.
+
+    Workers are long-lived, so with the tesserocr backend (see
+    digitization.ocr_backend) each one loads traineddata once and reuses it
+    for every later page.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, page_timeout: Optional[float] = None,
+                 backend: Optional[str] = None):
+        self.max_workers = max(1, max_workers or DEFAULT_WORKERS)
+        self.page_timeout = page_timeout or DEFAULT_PAGE_TIMEOUT
+        self.backend = resolve_backend_name(backend)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Create the worker pool on first use"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                logger.info(f"Started OCR pool with {self.max_workers} {self.backend} worker(s)")
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        """Drop a broken pool so the next call starts a fresh one"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def run_pages(self, images: List[Image.Image], lang: Optional[str] = None, config: str = '',
+                  mode: str = 'string', preprocess: Optional[str] = DEFAULT_PROFILE) -> List[Dict[str, Any]]:
+        """
+        OCR every page and return one record per page, in page order
+
+        Args:
+            images: Page images (PIL)
+            lang: Tesseract language string, e.g. 'tam+eng', or AUTO_LANG to pick
+                the language packs of each page from its detected script
+            config: Extra Tesseract options, e.g. '--psm 6'
+            mode: 'string' for image_to_string output, 'data' for image_to_data dictionaries
+            preprocess: Pre-processing profile (see digitization.preprocessing), None or 'none' to skip
+
+        Returns:
+            List of {'page', 'output', 'seconds', 'lang', 'preprocess', 'error'} dicts;
+            failed or timed-out pages carry an error message and an empty output
+        """
+        tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+        empty = {} if mode == 'data' else ''
+
+        # A pool only pays off when there is more than one page to spread out
+        if self.max_workers == 1 or len(images) <= 1:
+            results = []
+            for i, image in enumerate(images):
+                try:
+                    output, seconds, page_lang, prep = _ocr_page_task(image, lang, config, mode, self.page_timeout,
+                                                                      tesseract_cmd, preprocess, self.backend)
+                    results.append({'page': i, 'output': output, 'seconds': seconds, 'lang': page_lang,
+                                    'preprocess': prep, 'error': None})
+                except Exception as e:
+                    logger.error(f"OCR failed for page {i + 1}: {e}")
+                    results.append({'page': i, 'output': empty, 'seconds': 0.0, 'lang': None, 'preprocess': None,
+                                    'error': str(e)})
+            return results
+
+        futures = []
+        try:
+            pool = self._get_pool()
+            for image in images:
+                self._in_flight.acquire()
+                try:
+                    future = pool.submit(_ocr_page_task, image, lang, config, mode, self.page_timeout, tesseract_cmd,
+                                         preprocess, self.backend)
+                except BaseException:
+                    # The done callback below never runs for a task that was not submitted
+                    self._in_flight.release()
+                    raise
+                future.add_done_callback(lambda _: self._in_flight.release())
+                futures.append(future)
+        except (BrokenProcessPool, RuntimeError) as e:
+            # RuntimeError: the pool was shut down under us, e.g. by configure_ocr_executor swapping executors
+            logger.error(f"OCR pool unusable, retrying sequentially: {e}")
+            for future in futures:
+                future.cancel()
+            self._reset_pool()
+            return PageOCRExecutor(max_workers=1, page_timeout=self.page_timeout, backend=self.backend).run_pages(
+                images, lang=lang, config=config, mode=mode, preprocess=preprocess)
+
+        results = []
+        for i, future in enumerate(futures):
+            try:
+                output, seconds, page_lang, prep = future.result(timeout=self.page_timeout + RESULT_GRACE_SECONDS)
+                results.append({'page': i, 'output': output, 'seconds': seconds, 'lang': page_lang,
+                                'preprocess': prep, 'error': None})
+            except FutureTimeoutError:
+                future.cancel()
+                logger.error(f"OCR timed out for page {i + 1} after {self.page_timeout}s")
+                results.append({'page': i, 'output': empty, 'seconds': self.page_timeout, 'lang': None,
+                                'preprocess': None, 'error': 'timeout'})
+            except BrokenProcessPool as e:
+                logger.error(f"OCR worker crashed on page {i + 1}: {e}")
+                self._reset_pool()
+                results.append({'page': i, 'output': empty, 'seconds': 0.0, 'lang': None, 'preprocess': None,
+                                'error': str(e)})
+            except Exception as e:
+                logger.error(f"OCR failed for page {i + 1}: {e}")
+                results.append({'page': i, 'output': empty, 'seconds': 0.0, 'lang': None, 'preprocess': None,
+                                'error': str(e)})
+        return results
+
+    def warm_up(self, lang: Optional[str] = FALLBACK_LANG, config: str = '--psm 6') -> None:
+        """
+        Start the worker processes and have each load its OCR backend
+
+        Used by the model pre-warmer so the first upload does not pay for
+        process start-up and (with tesserocr) traineddata loading.
+        """
+        tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+        try:
+            pool = self._get_pool()
+            futures = [pool.submit(_warm_up_task, tesseract_cmd, self.backend, lang, config)
+                       for _ in range(self.max_workers)]
+            pids = {future.result(timeout=self.page_timeout) for future in futures}
+            logger.info(f"Warmed up {len(pids)} OCR worker(s)")
+        except Exception as e:
+            logger.warning(f"OCR warm-up failed: {e}")
+
+    def ocr_pages(self, images: List[Image.Image], lang: Optional[str] = None, config: str = '',
+                  preprocess: Optional[str] = DEFAULT_PROFILE) -> List[str]:
+        """OCR every page with image_to_string and return the page texts in page order"""
+        return [record['output'] for record in self.run_pages(images, lang=lang, config=config, preprocess=preprocess)]
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+_shared_executor: Optional[PageOCRExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def get_ocr_executor() -> PageOCRExecutor:
+    """Return the process-wide OCR executor shared by all extractors"""
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is None:
+            _shared_executor = PageOCRExecutor()
+            atexit.register(_shared_executor.shutdown)
+        return _shared_executor
+
+
+def configure_ocr_executor(max_workers: Optional[int] = None, page_timeout: Optional[float] = None,
+                           backend: Optional[str] = None) -> PageOCRExecutor:
+    """Replace the shared executor with one using the given worker count, per-page timeout and OCR backend"""
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is not None:
+            _shared_executor.shutdown()
+        _shared_executor = PageOCRExecutor(max_workers=max_workers, page_timeout=page_timeout, backend=backend)
+        atexit.register(_shared_executor.shutdown)
+        return _shared_executor
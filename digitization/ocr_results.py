@@ -0,0 +1,185 @@
+"""
+Shared OCR Results for Patta Documents
+Runs a single Tesseract image_to_data pass per page and exposes text, word boxes and confidences to every consumer
+"""
+
+import time
+import logging
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from PIL import Image
+from digitization.ocr_backend import get_ocr_backend
+from digitization.ocr_pool import get_ocr_executor
+from digitization.preprocessing import DEFAULT_PROFILE, preprocess_page
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PageOCR:
+    """OCR output for one page: words with boxes and confidences, plus reconstructed text"""
+
+    def __init__(self, page_index: int, words: List[Dict[str, Any]], seconds: float = 0.0,
+                 lang: Optional[str] = None, preprocess: Optional[Dict[str, Any]] = None):
+        self.page_index = page_index
+        self.words = words
+        self.seconds = seconds
+        self.lang = lang
+        self.preprocess = preprocess
+        self._text: Optional[str] = None
+
+    @classmethod
+    def from_data(cls, page_index: int, data: Dict[str, List[Any]], seconds: float = 0.0,
+                  lang: Optional[str] = None, preprocess: Optional[Dict[str, Any]] = None) -> 'PageOCR':
+        """
+        Build a page result from pytesseract's image_to_data dictionary output
+
+        Word boxes are shifted by the pre-processing crop offset so they are in page pixels.
+        """
+        offset_x, offset_y = preprocess['offset'] if preprocess else (0, 0)
+        words = []
+        for i, raw in enumerate(data.get('text', [])):
+            word = (raw or '').strip()
+            if not word:
+                continue
+            try:
+                conf = float(data['conf'][i])
+            except (TypeError, ValueError):
+                conf = -1.0
+            words.append({
+                'text': word,
+                'conf': conf,
+                'left': int(data['left'][i]) + offset_x,
+                'top': int(data['top'][i]) + offset_y,
+                'width': int(data['width'][i]),
+                'height': int(data['height'][i]),
+                'block': int(data['block_num'][i]),
+                'par': int(data['par_num'][i]),
+                'line': int(data['line_num'][i])
+            })
+        return cls(page_index, words, seconds, lang, preprocess)
+
+    @property
+    def text(self) -> str:
+        """Page text rebuilt from word positions (lines joined by newlines, blocks by blank lines)"""
+        if self._text is None:
+            lines = []
+            current_key = None
+            current_block = None
+            for word in self.words:
+                key = (word['block'], word['par'], word['line'])
+                if key != current_key:
+                    if current_block is not None and word['block'] != current_block:
+                        lines.append('')
+                    lines.append(word['text'])
+                    current_key = key
+                    current_block = word['block']
+                else:
+                    lines[-1] += ' ' + word['text']
+            self._text = '\n'.join(lines) + ('\n' if lines else '')
+        return self._text
+
+    @property
+    def mean_confidence(self) -> float:
+        """Mean Tesseract confidence over recognised words (0-100)"""
+        confs = [w['conf'] for w in self.words if w['conf'] >= 0]
+        return sum(confs) / len(confs) if confs else 0.0
+
+    def find_words(self, keywords: Iterable[str]) -> List[Dict[str, Any]]:
+        """Return words that contain any of the given keywords (case-insensitive)"""
+        keys = [k.upper() for k in keywords]
+        return [w for w in self.words if any(k in w['text'].upper() for k in keys)]
+
+
+class DocumentOCR:
+    """OCR output for a whole document, one PageOCR per page in page order"""
+
+    def __init__(self, pages: List[PageOCR], lang: Optional[str] = None, config: str = ''):
+        self.pages = pages
+        self.lang = lang
+        self.config = config
+
+    @property
+    def text(self) -> str:
+        """Full document text in page order"""
+        return ''.join(page.text for page in self.pages)
+
+    def page_text(self, index: int = 0) -> str:
+        """Text of a single page ('' if the page does not exist)"""
+        return self.pages[index].text if 0 <= index < len(self.pages) else ''
+
+    @property
+    def mean_confidence(self) -> float:
+        """Mean word confidence across all pages (0-100)"""
+        confs = [w['conf'] for page in self.pages for w in page.words if w['conf'] >= 0]
+        return sum(confs) / len(confs) if confs else 0.0
+
+    def preprocess_stats(self) -> Dict[str, Any]:
+        """Pixels before/after pre-processing and the seconds it took, summed over pages"""
+        stats = [page.preprocess for page in self.pages if page.preprocess]
+        pixels_in = sum(s['pixels_in'] for s in stats)
+        pixels_out = sum(s['pixels_out'] for s in stats)
+        return {
+            'profile': stats[0]['profile'] if stats else None,
+            'pixels_in': pixels_in,
+            'pixels_out': pixels_out,
+            'pixel_reduction': round(1 - pixels_out / pixels_in, 4) if pixels_in else 0.0,
+            'skew_degrees': [s['skew_degrees'] for s in stats],
+            'seconds': round(sum(s['seconds'] for s in stats), 4)
+        }
+
+    @property
+    def tesseract_calls(self) -> int:
+        """Number of Tesseract invocations that produced this result"""
+        return len(self.pages)
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary of the OCR pass for reporting"""
+        return {
+            'pages': len(self.pages),
+            'tesseract_calls': self.tesseract_calls,
+            'words': sum(len(page.words) for page in self.pages),
+            'mean_confidence': round(self.mean_confidence, 2),
+            'ocr_seconds': round(sum(page.seconds for page in self.pages), 4),
+            'page_langs': [page.lang for page in self.pages],
+            'preprocess': self.preprocess_stats()
+        }
+
+
+def ocr_page(image: Image.Image, page_index: int = 0, lang: Optional[str] = None,
+             config: str = '--psm 6', preprocess: Optional[str] = DEFAULT_PROFILE,
+             backend: Optional[str] = None) -> PageOCR:
+    """Run one image_to_data pass over a (pre-processed) page"""
+    image, prep = preprocess_page(image, preprocess)
+    start = time.perf_counter()
+    data = get_ocr_backend(backend).image_to_data(image, lang=lang, config=config)
+    return PageOCR.from_data(page_index, data, time.perf_counter() - start, lang, prep)
+
+
+def ocr_cache_key(lang: Optional[str] = None, config: str = '--psm 6',
+                  preprocess: Optional[str] = DEFAULT_PROFILE) -> Tuple[Optional[str], str, Optional[str]]:
+    """Key of an OCR result in DocumentPages.ocr_cache"""
+    return (lang, config, preprocess)
+
+
+def get_document_ocr(pages, lang: Optional[str] = None, config: str = '--psm 6',
+                     preprocess: Optional[str] = DEFAULT_PROFILE) -> DocumentOCR:
+    """
+    Return the OCR result for a DocumentPages context, running Tesseract only on first use
+
+    Results are memoised on the context per (lang, config, preprocess), so every
+    step that needs text, word boxes or confidences for the same document shares one pass.
+    """
+    key = ocr_cache_key(lang, config, preprocess)
+    cached = pages.ocr_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Pages are recognised in parallel by the shared OCR pool and come back in page order
+    records = get_ocr_executor().run_pages(pages.pages(), lang=lang, config=config, mode='data', preprocess=preprocess)
+    page_results = [PageOCR.from_data(r['page'], r['output'], r['seconds'], r['lang'], r['preprocess'])
+                    for r in records]
+    result = DocumentOCR(page_results, lang=lang, config=config)
+    pages.ocr_cache[key] = result
+    logger.info(f"OCR completed for {len(page_results)} page(s) with {result.tesseract_calls} Tesseract call(s)")
+    return result
@@ -0,0 +1,202 @@
+"""
+Shared Page Rasterization for Patta Documents
+Renders each page of a PDF/image once and shares the decoded PIL/NumPy pages across every consumer
+"""
+
+import time
+import logging
+from typing import Dict, List, Optional, Tuple, Any
+import cv2
+import numpy as np
+from PIL import Image
+from pdf2image import convert_from_path
+from digitization.upload_ingest import sha256_file
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default render resolution (OCR needs 300 dpi, the other checks are happy with anything >= 200)
+DEFAULT_DPI = 300
+# Share of a PDF's pages above which render_pages rasterizes the whole document in one poppler call
+FULL_RENDER_FRACTION = 0.5
+
+
+def page_runs(page_indexes: List[int]) -> List[Tuple[int, int]]:
+    """Contiguous (first, last) runs of 0-based page indexes, e.g. [0, 1, 2, 5] -> [(0, 2), (5, 5)]"""
+    runs: List[Tuple[int, int]] = []
+    for index in sorted(set(page_indexes)):
+        if runs and index == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], index)
+        else:
+            runs.append((index, index))
+    return runs
+
+
+def render_pages(pdf_path: str, page_indexes: List[int], dpi: int = DEFAULT_DPI,
+                 page_count: Optional[int] = None) -> List[Image.Image]:
+    """
+    Rasterize some pages of a PDF, in the order of page_indexes
+
+    Every convert_from_path call starts pdftoppm and re-parses the PDF, so
+    contiguous pages are rendered with one first_page/last_page range each,
+    and when page_count shows that most of the document is wanted (scanned
+    PDFs with no text layer) it is rendered in a single call.
+    """
+    if not page_indexes:
+        return []
+    runs = page_runs(page_indexes)
+    if page_count and len(runs) > 1 and len(set(page_indexes)) >= page_count * FULL_RENDER_FRACTION:
+        runs = [(0, page_count - 1)]
+    rendered: Dict[int, Image.Image] = {}
+    for first, last in runs:
+        images = convert_from_path(pdf_path, dpi=dpi, first_page=first + 1, last_page=last + 1)
+        rendered.update(zip(range(first, first + len(images)), images))
+    return [rendered[index] for index in page_indexes]
+
+
+class DocumentPages:
+    """
+    Per-document page image context
+
+    Rasterizes a PDF with poppler exactly once, at the highest DPI any consumer
+    has asked for, and caches the PIL pages plus their NumPy conversions so that
+    OCR, QR, watermark and tampering checks all read the same decoded pages.
+    Image files are decoded once with PIL in the same way.
+    """
+
+    def __init__(self, file_path: str, dpi: int = DEFAULT_DPI, file_hash: Optional[str] = None):
+        self.file_path = file_path
+        self.dpi = dpi
+        self.is_pdf = file_path.lower().endswith('.pdf')
+        self._file_hash = file_hash
+
+        self._pages: Optional[List[Image.Image]] = None
+        self._arrays: Dict[Tuple[int, str], np.ndarray] = {}
+        self._error: Optional[Exception] = None
+
+        # OCR results keyed by (lang, config, preprocess), filled by digitization.ocr_results
+        self.ocr_cache: Dict[Tuple[Optional[str], str, Optional[str]], Any] = {}
+
+        self.timings = {
+            'rasterize_seconds': 0.0,
+            'array_conversion_seconds': 0.0,
+            'rasterize_calls': 0,
+            'page_requests': 0
+        }
+
+    def require_dpi(self, dpi: int) -> None:
+        """Register the DPI a consumer needs; must be called before the first render to avoid a re-render"""
+        if dpi <= self.dpi:
+            return
+        if self._pages is not None:
+            logger.warning(f"Re-rendering {self.file_path} at {dpi} dpi (was {self.dpi} dpi)")
+            self._pages = None
+            self._arrays = {}
+            self.ocr_cache = {}
+        self.dpi = dpi
+
+    def pages(self) -> List[Image.Image]:
+        """Return all pages as RGB PIL images, rendering them on first use"""
+        self.timings['page_requests'] += 1
+
+        if self._pages is not None:
+            return self._pages
+        if self._error is not None:
+            # Do not hammer poppler again for a document that already failed
+            raise self._error
+
+        start = time.perf_counter()
+        try:
+            if self.is_pdf:
+                images = convert_from_path(self.file_path, dpi=self.dpi)
+            else:
+                with Image.open(self.file_path) as img:
+                    images = [img.convert('RGB')]
+        except Exception as e:
+            self._error = e
+            raise
+        finally:
+            self.timings['rasterize_seconds'] += time.perf_counter() - start
+            self.timings['rasterize_calls'] += 1
+
+        self._pages = [img if img.mode == 'RGB' else img.convert('RGB') for img in images]
+        logger.info(f"Rendered {len(self._pages)} page(s) of {self.file_path} at {self.dpi} dpi "
+                    f"in {self.timings['rasterize_seconds']:.2f}s")
+        return self._pages
+
+    def sha256(self) -> str:
+        """Return the document's SHA-256, reusing the hash computed at upload time when available"""
+        if self._file_hash is None:
+            self._file_hash = sha256_file(self.file_path)
+        return self._file_hash
+
+    def page(self, index: int = 0) -> Image.Image:
+        """Return a single page as a PIL image"""
+        return self.pages()[index]
+
+    def page_count(self) -> int:
+        """Return the number of pages in the document"""
+        return len(self.pages())
+
+    def array(self, index: int = 0, mode: str = 'bgr') -> np.ndarray:
+        """
+        Return a page as a NumPy array in OpenCV layout
+
+        Args:
+            index: Page index (0-based)
+            mode: 'bgr' for colour arrays, 'gray' for single channel, 'rgb' for PIL channel order
+        """
+        key = (index, mode)
+        if key in self._arrays:
+            return self._arrays[key]
+
+        rgb = np.asarray(self.page(index))
+        start = time.perf_counter()
+        if mode == 'rgb':
+            arr = rgb
+        elif mode == 'bgr':
+            arr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+        elif mode == 'gray':
+            arr = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+        else:
+            raise ValueError(f"Unsupported array mode: {mode}")
+        self.timings['array_conversion_seconds'] += time.perf_counter() - start
+
+        self._arrays[key] = arr
+        return arr
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize rendering cost and the work saved by sharing pages
+
+        Every page request after the first would previously have been a separate
+        convert_from_path call, so the saving is estimated from the measured render time.
+        Consumers served from the shared OCR result never request pages at all, so this
+        is a lower bound.
+        """
+        avoided = max(0, self.timings['page_requests'] - self.timings['rasterize_calls'])
+        per_render = (self.timings['rasterize_seconds'] / self.timings['rasterize_calls']
+                      if self.timings['rasterize_calls'] else 0.0)
+        return {
+            'dpi': self.dpi,
+            'page_count': len(self._pages) if self._pages is not None else 0,
+            'rasterize_seconds': round(self.timings['rasterize_seconds'], 4),
+            'array_conversion_seconds': round(self.timings['array_conversion_seconds'], 4),
+            'rasterize_calls': self.timings['rasterize_calls'],
+            'page_requests': self.timings['page_requests'],
+            'rasterizations_avoided': avoided,
+            'estimated_seconds_saved': round(avoided * per_render, 4)
+        }
+
+    def close(self) -> None:
+        """Release the cached page images"""
+        if self._pages:
+            for img in self._pages:
+                try:
+                    img.close()
+                except Exception:
+                    pass
+        self._pages = None
+        self._arrays = {}
+        self.ocr_cache = {}
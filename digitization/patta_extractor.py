@@ -5,9 +5,10 @@ Extracts structured data from uploaded Patta Document PDFs
 
 import os
 import re
+import sys
 import json
 import logging
-from typing import Dict, Optional, List, Tuple
+from typing import Dict, FrozenSet, Optional, List, Pattern, Set, Tuple
 from datetime import datetime
 import pdfplumber
 from pdf2image import convert_from_path
@@ -15,6 +16,15 @@ import pytesseract
 from PIL import Image
 import io
 
+# Add project root to path for shared OCR imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from digitization.ocr_pool import get_ocr_executor
+from digitization.script_router import AUTO_LANG
+from digitization.scripts import detect_scripts, pattern_scripts
+
 # Configure Tesseract path for Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
@@ -22,6 +32,170 @@ pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tessera
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Enhanced field patterns for Tamil+English Patta documents
+FIELD_PATTERNS = {
+    'name': [
+        # English patterns
+        r'(?:name|owner|holder|patta holder)[\s:]*([^\n\r]+)',
+        r'(?:name of|owner name|patta holder name)[\s:]*([^\n\r]+)',
+        r'(?:Name|Owner|Holder|Patta Holder)[\s:]*([^\n\r]+)',
+        # Tamil patterns (with OCR spacing tolerance)
+        r'(?:ப\s*ய\s*ர\s*|உ\s*ர\s*ம\s*ய\s*ள\s*ர\s*|ப\s*ட\s*ட\s*ா\s*உ\s*ர\s*ம\s*ய\s*ள\s*ர\s*)[\s:]*([^\n\r]+)',
+        r'(?:ப\s*ய\s*ர\s*|ப\s*ட\s*ட\s*ா\s*த\s*ர\s*ர\s*)[\s:]*([^\n\r]+)',
+        # Tamil patterns (normal)
+        r'(?:பெயர்|உரிமையாளர்|பட்டா\s*உரிமையாளர்)[\s:]*([^\n\r]+)',
+        r'(?:பெயர்|பட்டா\s*தாரர்)[\s:]*([^\n\r]+)',
+        # OCR tolerance patterns
+        r'(?:Paita|Pata|Patta)[\s:]*([^\n\r]+)',
+        r'(?:பைட்டா|பட்டா)[\s:]*([^\n\r]+)'
+    ],
+    'father_or_husband': [
+        # English patterns
+        r'(?:father|husband|father\'s name|husband\'s name)[\s:]*([^\n\r]+)',
+        r'(?:father name|husband name)[\s:]*([^\n\r]+)',
+        r'(?:Father|Husband|Father\'s Name|Husband\'s Name)[\s:]*([^\n\r]+)',
+        # Tamil patterns
+        r'(?:தந்தை|கணவர்|தந்தை பெயர்|கணவர் பெயர்)[\s:]*([^\n\r]+)',
+        r'(?:தந்தை\s*பெயர்|கணவர்\s*பெயர்)[\s:]*([^\n\r]+)',
+        # OCR tolerance patterns
+        r'(?:Fathar|Fathor|Husbend)[\s:]*([^\n\r]+)',
+        r'(?:தந்தை|கணவர்)[\s:]*([^\n\r]+)'
+    ],
+    'patta_no': [
+        # English patterns
+        r'(?:patta number|patta no|patta)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:Patta Number|Patta No|Patta)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        # Tamil patterns (with OCR spacing tolerance)
+        r'(?:ப\s*ட\s*ட\s*ா\s*எ\s*ண\s*|ப\s*ட\s*ட\s*ா\s*)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:ப\s*ட\s*ட\s*ா\s*எ\s*ண\s*|ப\s*ட\s*ட\s*ா\s*ந\s*ம\s*ப\s*ர\s*)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        # Tamil patterns (normal)
+        r'(?:பட்டா எண்|பட்டா\s*எண்|பட்டா)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:பட்டா\s*எண்|பட்டா\s*நம்பர்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        # OCR tolerance patterns
+        r'(?:Paita|Pata|Patta)\s*(?:Number|No|Num)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:பைட்டா|பட்டா)\s*(?:எண்|நம்பர்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)'
+    ],
+    'survey_no': [
+        # English patterns
+        r'(?:survey number|survey no|survey)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:Survey Number|Survey No|Survey)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        # Tamil patterns
+        r'(?:சர்வே எண்|சர்வே\s*எண்|சர்வே)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:சர்வே\s*எண்|சர்வே\s*நம்பர்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        # OCR tolerance patterns
+        r'(?:Survay|Survai|Survey)\s*(?:Number|No|Num)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:சர்வே|சர்வை)\s*(?:எண்|நம்பர்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)'
+    ],
+    'dag_no': [
+        r'(?:dag number|dag no|dag)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:डाग नंबर|डाग संख्या|डाग)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:டாக் எண்|டாக்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:డాగ్ నంబర్|డాగ్)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:ಡಾಗ್ ಸಂಖ್ಯೆ|ಡಾಗ್)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:ഡാഗ് നമ്പർ|ഡാഗ്)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:ডাগ নম্বর|ডাগ)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:ଡାଗ୍ ନମ୍ବର|ଡାଗ୍)[\s:]*([^\n\r\d]*\d+[^\n\r]*)'
+    ],
+    'khasra': [
+        r'(?:khasra number|khasra no|khasra)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:खसरा नंबर|खसरा संख्या|खसरा)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:கஸ்ரா எண்|கஸ்ரா)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:ఖస్రా నంబర్|ఖస్రా)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:ಖಸ್ರಾ ಸಂಖ್ಯೆ|ಖಸ್ರಾ)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:ഖസ്രാ നമ്പർ|ഖസ്രാ)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:খসরা নম্বর|খসরা)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
+        r'(?:ଖସ୍ରା ନମ୍ବର|ଖସ୍ରା)[\s:]*([^\n\r\d]*\d+[^\n\r]*)'
+    ],
+    'area': [
+        r'(?:area|extent|land area)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:acres?|hectares?|sq\.?\s*ft|sq\.?\s*m|गज|एकड़|हेक्टेयर|ஏக்கர்|హెక్టార్|ಎಕರೆ|ഏക്കർ|একর|ଏକର))',
+        r'(?:क्षेत्रफल|जमीन का क्षेत्रफल|क्षेत्र)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:गज|एकड़|हेक्टेयर|वर्ग फुट|वर्ग मीटर))',
+        r'(?:பரப்பளவு|நில பரப்பளவு|பரப்பு)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:ஏக்கர்|ஹெக்டேர்|சதுர அடி|சதுர மீட்டர்))',
+        r'(?:వైశాల్యం|భూమి వైశాల్యం|వైశాల్య)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:హెక్టార్|ఎకరం|చదరపు అడుగులు|చదరపు మీటర్లు))',
+        r'(?:ವಿಸ್ತೀರ್ಣ|ಭೂಮಿ ವಿಸ್ತೀರ್ಣ|ವಿಸ್ತೀರ್ಣ)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:ಎಕರೆ|ಹೆಕ್ಟೇರ್|ಚದರ ಅಡಿ|ಚದರ ಮೀಟರ್))',
+        r'(?:വിസ്തീർണ്ണം|ഭൂമി വിസ്തീർണ്ണം|വിസ്തീർണ്ണം)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:ഏക്കർ|ഹെക്ടർ|ചതുര അടി|ചതുര മീറ്റർ))',
+        r'(?:ক্ষেত্রফল|জমির ক্ষেত্রফল|ক্ষেত্র)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:একর|হেক্টর|বর্গ ফুট|বর্গ মিটার))',
+        r'(?:କ୍ଷେତ୍ରଫଳ|ଜମିର କ୍ଷେତ୍ରଫଳ|କ୍ଷେତ୍ର)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:ଏକର|ହେକ୍ଟର|ବର୍ଗ ଫୁଟ|ବର୍ଗ ମିଟର))'
+    ],
+    'village': [
+        r'(?:village|gram|gaon)[\s:]*([^\n\r]+)',
+        r'(?:गांव|ग्राम|विलेज)[\s:]*([^\n\r]+)',
+        r'(?:கிராமம்|ஊர்|வில்லேஜ்)[\s:]*([^\n\r]+)',
+        r'(?:గ్రామం|ఊరు|విలేజ్)[\s:]*([^\n\r]+)',
+        r'(?:ಗ್ರಾಮ|ಊರು|ವಿಲೇಜ್)[\s:]*([^\n\r]+)',
+        r'(?:ഗ്രാമം|ഊര്|വില്ലേജ്)[\s:]*([^\n\r]+)',
+        r'(?:গ্রাম|উর|ভিলেজ)[\s:]*([^\n\r]+)',
+        r'(?:ଗ୍ରାମ|ଊର|ଭିଲେଜ୍)[\s:]*([^\n\r]+)'
+    ],
+    'taluk': [
+        r'(?:taluk|taluka|tehsil|mandal)[\s:]*([^\n\r]+)',
+        r'(?:तालुका|तहसील|मंडल)[\s:]*([^\n\r]+)',
+        r'(?:தாலுகா|தெஹ்சில்|மண்டலம்)[\s:]*([^\n\r]+)',
+        r'(?:తాలూకా|తహసీల్|మండలం)[\s:]*([^\n\r]+)',
+        r'(?:ತಾಲೂಕು|ತಹಸೀಲು|ಮಂಡಲ)[\s:]*([^\n\r]+)',
+        r'(?:താലൂക്ക്|തഹസീൽ|മണ്ഡലം)[\s:]*([^\n\r]+)',
+        r'(?:তালুক|তহশিল|মণ্ডল)[\s:]*([^\n\r]+)',
+        r'(?:ତାଲୁକ|ତହସିଲ|ମଣ୍ଡଳ)[\s:]*([^\n\r]+)'
+    ],
+    'district': [
+        r'(?:district|zila|jila)[\s:]*([^\n\r]+)',
+        r'(?:जिला|डिस्ट्रिक्ट)[\s:]*([^\n\r]+)',
+        # Tamil patterns (with OCR spacing tolerance)
+        r'(?:ம\s*வ\s*ட\s*ட\s*ம\s*|ட\s*ட\s*ர\s*க\s*ட\s*)[\s:]*([^\n\r]+)',
+        # Tamil patterns (normal)
+        r'(?:மாவட்டம்|டிஸ்ட்ரிக்ட்)[\s:]*([^\n\r]+)',
+        # Specific Tamil Nadu pattern
+        r'மாவட்டம்\s*:\s*([^\n\r]+)',
+        r'ம\s*வ\s*ட\s*ட\s*ம\s*:\s*([^\n\r]+)',
+        r'(?:జిల్లా|డిస్ట్రిక్ట్)[\s:]*([^\n\r]+)',
+        r'(?:ಜಿಲ್ಲೆ|ಡಿಸ್ಟ್ರಿಕ್ಟ್)[\s:]*([^\n\r]+)',
+        r'(?:ജില്ല|ഡിസ്ട്രിക്റ്റ്)[\s:]*([^\n\r]+)',
+        r'(?:জেলা|ডিস্ট্রিক্ট)[\s:]*([^\n\r]+)',
+        r'(?:ଜିଲ୍ଲା|ଡିଷ୍ଟ୍ରିକ୍ଟ୍)[\s:]*([^\n\r]+)'
+    ],
+    'date': [
+        r'(?:date|issued on|date of issue)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
+        r'(?:तारीख|जारी की तारीख|दिनांक)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
+        r'(?:தேதி|வெளியிடப்பட்ட தேதி|திகதி)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
+        r'(?:తేదీ|విడుదల తేదీ|దినాంకం)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
+        r'(?:ದಿನಾಂಕ|ವಿಡುಗಡೆ ದಿನಾಂಕ|ತಾರೀಖು)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
+        r'(?:തീയതി|വിഡുദല തീയതി|ദിനാംകം)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
+        r'(?:তারিখ|প্রকাশের তারিখ|দিনাংক)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
+        r'(?:ତାରିଖ|ପ୍ରକାଶ ତାରିଖ|ଦିନାଙ୍କ)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)'
+    ]
+}
+
+
+def compile_field_patterns(field_patterns: Dict[str, List[str]]) -> Dict[str, List[Tuple[Pattern, FrozenSet[str]]]]:
+    """
+    Compile a field pattern table, tagging each regex with the scripts of its label
+
+    A pattern whose label is written in a script absent from the text cannot
+    match, so extraction skips it without scanning.
+    """
+    compiled = {}
+    for field, patterns in field_patterns.items():
+        compiled[field] = []
+        for pattern in patterns:
+            try:
+                regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+            except re.error as e:
+                logger.warning(f"Skipping invalid {field} pattern: {str(e)}")
+                continue
+            compiled[field].append((regex, frozenset(pattern_scripts(pattern))))
+    return compiled
+
+COMPILED_FIELD_PATTERNS = compile_field_patterns(FIELD_PATTERNS)
+
+# Text cleanup expressions shared by every extraction
+WHITESPACE_RE = re.compile(r'\s+')
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s:/\-\.]')
+FIELD_KEYWORDS_RE = re.compile(r'\b(name|owner|father|husband|patta|survey|dag|khasra|area|village|taluk|district|date)\b',
+                               re.IGNORECASE)
+FIELD_PREFIX_RE = re.compile(r'^(name|owner|father|husband|patta|survey|dag|khasra|area|village|taluk|district|date)[\s:]*',
+                             re.IGNORECASE)
+VALUE_PUNCTUATION_RE = re.compile(r'[^\w\s/\-\.]')
+
+
 class PattaExtractor:
     """
     Main class for extracting structured data from Patta documents
@@ -31,138 +205,11 @@ class PattaExtractor:
         self.extracted_data = {}
         self.raw_text = ""
         self.confidence_scores = {}
+        self.page_langs = []
         
-        # Enhanced field patterns for Tamil+English Patta documents
-        self.field_patterns = {
-            'name': [
-                # English patterns
-                r'(?:name|owner|holder|patta holder)[\s:]*([^\n\r]+)',
-                r'(?:name of|owner name|patta holder name)[\s:]*([^\n\r]+)',
-                r'(?:Name|Owner|Holder|Patta Holder)[\s:]*([^\n\r]+)',
-                # Tamil patterns (with OCR spacing tolerance)
-                r'(?:ப\s*ய\s*ர\s*|உ\s*ர\s*ம\s*ய\s*ள\s*ர\s*|ப\s*ட\s*ட\s*ா\s*உ\s*ர\s*ம\s*ய\s*ள\s*ர\s*)[\s:]*([^\n\r]+)',
-                r'(?:ப\s*ய\s*ர\s*|ப\s*ட\s*ட\s*ா\s*த\s*ர\s*ர\s*)[\s:]*([^\n\r]+)',
-                # Tamil patterns (normal)
-                r'(?:பெயர்|உரிமையாளர்|பட்டா\s*உரிமையாளர்)[\s:]*([^\n\r]+)',
-                r'(?:பெயர்|பட்டா\s*தாரர்)[\s:]*([^\n\r]+)',
-                # OCR tolerance patterns
-                r'(?:Paita|Pata|Patta)[\s:]*([^\n\r]+)',
-                r'(?:பைட்டா|பட்டா)[\s:]*([^\n\r]+)'
-            ],
-            'father_or_husband': [
-                # English patterns
-                r'(?:father|husband|father\'s name|husband\'s name)[\s:]*([^\n\r]+)',
-                r'(?:father name|husband name)[\s:]*([^\n\r]+)',
-                r'(?:Father|Husband|Father\'s Name|Husband\'s Name)[\s:]*([^\n\r]+)',
-                # Tamil patterns
-                r'(?:தந்தை|கணவர்|தந்தை பெயர்|கணவர் பெயர்)[\s:]*([^\n\r]+)',
-                r'(?:தந்தை\s*பெயர்|கணவர்\s*பெயர்)[\s:]*([^\n\r]+)',
-                # OCR tolerance patterns
-                r'(?:Fathar|Fathor|Husbend)[\s:]*([^\n\r]+)',
-                r'(?:தந்தை|கணவர்)[\s:]*([^\n\r]+)'
-            ],
-            'patta_no': [
-                # English patterns
-                r'(?:patta number|patta no|patta)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:Patta Number|Patta No|Patta)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                # Tamil patterns (with OCR spacing tolerance)
-                r'(?:ப\s*ட\s*ட\s*ா\s*எ\s*ண\s*|ப\s*ட\s*ட\s*ா\s*)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:ப\s*ட\s*ட\s*ா\s*எ\s*ண\s*|ப\s*ட\s*ட\s*ா\s*ந\s*ம\s*ப\s*ர\s*)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                # Tamil patterns (normal)
-                r'(?:பட்டா எண்|பட்டா\s*எண்|பட்டா)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:பட்டா\s*எண்|பட்டா\s*நம்பர்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                # OCR tolerance patterns
-                r'(?:Paita|Pata|Patta)\s*(?:Number|No|Num)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:பைட்டா|பட்டா)\s*(?:எண்|நம்பர்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)'
-            ],
-            'survey_no': [
-                # English patterns
-                r'(?:survey number|survey no|survey)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:Survey Number|Survey No|Survey)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                # Tamil patterns
-                r'(?:சர்வே எண்|சர்வே\s*எண்|சர்வே)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:சர்வே\s*எண்|சர்வே\s*நம்பர்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                # OCR tolerance patterns
-                r'(?:Survay|Survai|Survey)\s*(?:Number|No|Num)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:சர்வே|சர்வை)\s*(?:எண்|நம்பர்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)'
-            ],
-            'dag_no': [
-                r'(?:dag number|dag no|dag)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:डाग नंबर|डाग संख्या|डाग)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:டாக் எண்|டாக்)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:డాగ్ నంబర్|డాగ్)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:ಡಾಗ್ ಸಂಖ್ಯೆ|ಡಾಗ್)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:ഡാഗ് നമ്പർ|ഡാഗ്)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:ডাগ নম্বর|ডাগ)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:ଡାଗ୍ ନମ୍ବର|ଡାଗ୍)[\s:]*([^\n\r\d]*\d+[^\n\r]*)'
-            ],
-            'khasra': [
-                r'(?:khasra number|khasra no|khasra)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:खसरा नंबर|खसरा संख्या|खसरा)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:கஸ்ரா எண்|கஸ்ரா)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:ఖస్రా నంబర్|ఖస్రా)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:ಖಸ್ರಾ ಸಂಖ್ಯೆ|ಖಸ್ರಾ)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:ഖസ്രാ നമ്പർ|ഖസ്രാ)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:খসরা নম্বর|খসরা)[\s:]*([^\n\r\d]*\d+[^\n\r]*)',
-                r'(?:ଖସ୍ରା ନମ୍ବର|ଖସ୍ରା)[\s:]*([^\n\r\d]*\d+[^\n\r]*)'
-            ],
-            'area': [
-                r'(?:area|extent|land area)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:acres?|hectares?|sq\.?\s*ft|sq\.?\s*m|गज|एकड़|हेक्टेयर|ஏக்கர்|హెక్టార్|ಎಕರೆ|ഏക്കർ|একর|ଏକର))',
-                r'(?:क्षेत्रफल|जमीन का क्षेत्रफल|क्षेत्र)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:गज|एकड़|हेक्टेयर|वर्ग फुट|वर्ग मीटर))',
-                r'(?:பரப்பளவு|நில பரப்பளவு|பரப்பு)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:ஏக்கர்|ஹெக்டேர்|சதுர அடி|சதுர மீட்டர்))',
-                r'(?:వైశాల్యం|భూమి వైశాల్యం|వైశాల్య)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:హెక్టార్|ఎకరం|చదరపు అడుగులు|చదరపు మీటర్లు))',
-                r'(?:ವಿಸ್ತೀರ್ಣ|ಭೂಮಿ ವಿಸ್ತೀರ್ಣ|ವಿಸ್ತೀರ್ಣ)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:ಎಕರೆ|ಹೆಕ್ಟೇರ್|ಚದರ ಅಡಿ|ಚದರ ಮೀಟರ್))',
-                r'(?:വിസ്തീർണ്ണം|ഭൂമി വിസ്തീർണ്ണം|വിസ്തീർണ്ണം)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:ഏക്കർ|ഹെക്ടർ|ചതുര അടി|ചതുര മീറ്റർ))',
-                r'(?:ক্ষেত্রফল|জমির ক্ষেত্রফল|ক্ষেত্র)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:একর|হেক্টর|বর্গ ফুট|বর্গ মিটার))',
-                r'(?:କ୍ଷେତ୍ରଫଳ|ଜମିର କ୍ଷେତ୍ରଫଳ|କ୍ଷେତ୍ର)[\s:]*([^\n\r\d]*\d+[^\n\r]*(?:ଏକର|ହେକ୍ଟର|ବର୍ଗ ଫୁଟ|ବର୍ଗ ମିଟର))'
-            ],
-            'village': [
-                r'(?:village|gram|gaon)[\s:]*([^\n\r]+)',
-                r'(?:गांव|ग्राम|विलेज)[\s:]*([^\n\r]+)',
-                r'(?:கிராமம்|ஊர்|வில்லேஜ்)[\s:]*([^\n\r]+)',
-                r'(?:గ్రామం|ఊరు|విలేజ్)[\s:]*([^\n\r]+)',
-                r'(?:ಗ್ರಾಮ|ಊರು|ವಿಲೇಜ್)[\s:]*([^\n\r]+)',
-                r'(?:ഗ്രാമം|ഊര്|വില്ലേജ്)[\s:]*([^\n\r]+)',
-                r'(?:গ্রাম|উর|ভিলেজ)[\s:]*([^\n\r]+)',
-                r'(?:ଗ୍ରାମ|ଊର|ଭିଲେଜ୍)[\s:]*([^\n\r]+)'
-            ],
-            'taluk': [
-                r'(?:taluk|taluka|tehsil|mandal)[\s:]*([^\n\r]+)',
-                r'(?:तालुका|तहसील|मंडल)[\s:]*([^\n\r]+)',
-                r'(?:தாலுகா|தெஹ்சில்|மண்டலம்)[\s:]*([^\n\r]+)',
-                r'(?:తాలూకా|తహసీల్|మండలం)[\s:]*([^\n\r]+)',
-                r'(?:ತಾಲೂಕು|ತಹಸೀಲು|ಮಂಡಲ)[\s:]*([^\n\r]+)',
-                r'(?:താലൂക്ക്|തഹസീൽ|മണ്ഡലം)[\s:]*([^\n\r]+)',
-                r'(?:তালুক|তহশিল|মণ্ডল)[\s:]*([^\n\r]+)',
-                r'(?:ତାଲୁକ|ତହସିଲ|ମଣ୍ଡଳ)[\s:]*([^\n\r]+)'
-            ],
-            'district': [
-                r'(?:district|zila|jila)[\s:]*([^\n\r]+)',
-                r'(?:जिला|डिस्ट्रिक्ट)[\s:]*([^\n\r]+)',
-                # Tamil patterns (with OCR spacing tolerance)
-                r'(?:ம\s*வ\s*ட\s*ட\s*ம\s*|ட\s*ட\s*ர\s*க\s*ட\s*)[\s:]*([^\n\r]+)',
-                # Tamil patterns (normal)
-                r'(?:மாவட்டம்|டிஸ்ட்ரிக்ட்)[\s:]*([^\n\r]+)',
-                # Specific Tamil Nadu pattern
-                r'மாவட்டம்\s*:\s*([^\n\r]+)',
-                r'ம\s*வ\s*ட\s*ட\s*ம\s*:\s*([^\n\r]+)',
-                r'(?:జిల్లా|డిస్ట్రిక్ట్)[\s:]*([^\n\r]+)',
-                r'(?:ಜಿಲ್ಲೆ|ಡಿಸ್ಟ್ರಿಕ್ಟ್)[\s:]*([^\n\r]+)',
-                r'(?:ജില്ല|ഡിസ്ട്രിക്റ്റ്)[\s:]*([^\n\r]+)',
-                r'(?:জেলা|ডিস্ট্রিক্ট)[\s:]*([^\n\r]+)',
-                r'(?:ଜିଲ୍ଲା|ଡିଷ୍ଟ୍ରିକ୍ଟ୍)[\s:]*([^\n\r]+)'
-            ],
-            'date': [
-                r'(?:date|issued on|date of issue)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
-                r'(?:तारीख|जारी की तारीख|दिनांक)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
-                r'(?:தேதி|வெளியிடப்பட்ட தேதி|திகதி)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
-                r'(?:తేదీ|విడుదల తేదీ|దినాంకం)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
-                r'(?:ದಿನಾಂಕ|ವಿಡುಗಡೆ ದಿನಾಂಕ|ತಾರೀಖು)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
-                r'(?:തീയതി|വിഡുദല തീയതി|ദിനാംകം)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
-                r'(?:তারিখ|প্রকাশের তারিখ|দিনাংক)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)',
-                r'(?:ତାରିଖ|ପ୍ରକାଶ ତାରିଖ|ଦିନାଙ୍କ)[\s:]*([^\n\r\d]*\d{1,2}[\/\-\.]\d{1,2}[\/\-\.]\d{2,4}[^\n\r]*)'
-            ]
-        }
+        # Field patterns are compiled once at import (see COMPILED_FIELD_PATTERNS)
+        self.field_patterns = FIELD_PATTERNS
+        self.compiled_patterns = COMPILED_FIELD_PATTERNS
     
     def extract_from_pdf(self, pdf_path: str) -> Dict:
         """
@@ -221,22 +268,18 @@ class PattaExtractor:
             images = convert_from_path(pdf_path, dpi=300)
             text = ""
             
-            for i, image in enumerate(images):
-                # Convert PIL image to bytes
-                img_bytes = io.BytesIO()
-                image.save(img_bytes, format='PNG')
-                img_bytes.seek(0)
-                
-                # Perform OCR with Tamil+English focus
-                page_text = pytesseract.image_to_string(
-                    Image.open(img_bytes),
-                    lang='tam+eng',  # Tamil + English for Patta documents
-                    config='--psm 6'  # Assume uniform block of text
-                )
-                
-                if page_text:
-                    text += page_text + "\n"
-                    logger.info(f"OCR completed for page {i + 1}")
+            # Perform OCR with each page's detected script (+ English), pages in parallel
+            records = get_ocr_executor().run_pages(
+                images,
+                lang=AUTO_LANG,  # Tamil+English when the script cannot be detected
+                config='--psm 6'  # Assume uniform block of text
+            )
+            self.page_langs = [record['lang'] for record in records]
+            
+            for record in records:
+                if record['output']:
+                    text += record['output'] + "\n"
+                    logger.info(f"OCR completed for page {record['page'] + 1} ({record['lang']})")
             
             self.raw_text = text
             return text if len(text.strip()) > 50 else ""
@@ -266,9 +309,12 @@ class PattaExtractor:
         # Clean and normalize text
         text = self._clean_text(text)
         
+        # Only patterns labelled in a script present in the text can match
+        scripts = detect_scripts(text)
+        
         # Extract each field
-        for field, patterns in self.field_patterns.items():
-            extracted_value = self._extract_field_value(text, patterns)
+        for field, patterns in self.compiled_patterns.items():
+            extracted_value = self._extract_field_value(text, patterns, scripts)
             if extracted_value:
                 result[field] = extracted_value
                 self.confidence_scores[field] = self._calculate_confidence(extracted_value, text)
@@ -295,27 +341,29 @@ class PattaExtractor:
         Clean and normalize text for better pattern matching
         """
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         
         # Remove special characters that might interfere
-        text = re.sub(r'[^\w\s:/\-\.]', ' ', text)
+        text = SPECIAL_CHARS_RE.sub(' ', text)
         
         # Normalize case for English text
-        text = re.sub(r'\b(name|owner|father|husband|patta|survey|dag|khasra|area|village|taluk|district|date)\b', 
-                     lambda m: m.group(1).lower(), text, flags=re.IGNORECASE)
+        text = FIELD_KEYWORDS_RE.sub(lambda m: m.group(1).lower(), text)
         
         return text.strip()
     
-    def _extract_field_value(self, text: str, patterns: List[str]) -> str:
+    def _extract_field_value(self, text: str, patterns: List[Tuple[Pattern, FrozenSet[str]]],
+                             scripts: Optional[Set[str]] = None) -> str:
         """
-        Extract field value using multiple patterns
+        Extract field value using multiple compiled patterns (first pattern in order wins)
         """
-        for pattern in patterns:
+        for regex, label_scripts in patterns:
+            if scripts is not None and label_scripts and not (label_scripts & scripts):
+                continue
             try:
-                matches = re.findall(pattern, text, re.IGNORECASE | re.MULTILINE)
-                if matches:
+                match = regex.search(text)
+                if match:
                     # Take the first match and clean it
-                    value = matches[0].strip()
+                    value = (match.group(1) or '').strip()
                     if value and len(value) > 2:  # Minimum length threshold
                         return self._clean_field_value(value)
             except Exception as e:
@@ -329,14 +377,13 @@ class PattaExtractor:
         Clean extracted field value
         """
         # Remove common prefixes/suffixes
-        value = re.sub(r'^(name|owner|father|husband|patta|survey|dag|khasra|area|village|taluk|district|date)[\s:]*', 
-                      '', value, flags=re.IGNORECASE)
+        value = FIELD_PREFIX_RE.sub('', value)
         
         # Remove extra punctuation
-        value = re.sub(r'[^\w\s/\-\.]', '', value)
+        value = VALUE_PUNCTUATION_RE.sub('', value)
         
         # Remove extra whitespace
-        value = re.sub(r'\s+', ' ', value).strip()
+        value = WHITESPACE_RE.sub(' ', value).strip()
         
         return value
     
@@ -452,6 +499,7 @@ class PattaExtractor:
             "confidence_scores": self.confidence_scores,
             "average_confidence": round(sum(self.confidence_scores.values()) / len(self.confidence_scores), 2) if self.confidence_scores else 0,
             "text_length": len(self.raw_text),
+            "ocr_page_langs": self.page_langs,
             "extraction_timestamp": datetime.now().isoformat()
         }
 
@@ -0,0 +1,99 @@
+"""
+Per-Page OCR Language Router
+Detects the dominant script of a page with Tesseract OSD on a downscaled copy and picks only the traineddata it needs
+"""
+
+import os
+import logging
+import functools
+from typing import Dict, Optional, Set, Tuple
+import pytesseract
+from PIL import Image
+from digitization.ocr_backend import get_ocr_backend
+from digitization.scripts import tesseract_lang
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pass as the OCR language to have each page routed to its own language packs
+AUTO_LANG = 'auto'
+
+# Router configuration (overridable through the environment)
+FALLBACK_LANG = os.environ.get('FRA_OCR_FALLBACK_LANG', 'tam+eng')
+MIN_SCRIPT_CONFIDENCE = float(os.environ.get('FRA_OCR_MIN_SCRIPT_CONF', 1.0))
+DETECTION_WIDTH = 1200
+
+# Tesseract OSD script names for the scripts found on Indian land records
+OSD_SCRIPTS: Dict[str, str] = {
+    'Latin': 'latin',
+    'Devanagari': 'devanagari',
+    'Bengali': 'bengali',
+    'Oriya': 'odia',
+    'Tamil': 'tamil',
+    'Telugu': 'telugu',
+    'Kannada': 'kannada',
+    'Malayalam': 'malayalam',
+}
+
+
+@functools.lru_cache(maxsize=1)
+def installed_languages() -> Set[str]:
+    """Traineddata available to the local Tesseract (empty if it cannot be listed)"""
+    try:
+        return set(pytesseract.get_languages(config=''))
+    except Exception as e:
+        logger.warning(f"Could not list Tesseract languages: {e}")
+        return set()
+
+
+def _downscale(image: Image.Image, width: int = DETECTION_WIDTH) -> Image.Image:
+    """Grayscale copy no wider than `width`; OSD only needs the glyph shapes"""
+    small = image.convert('L')
+    if small.width > width:
+        height = max(1, round(small.height * width / small.width))
+        small = small.resize((width, height))
+    return small
+
+
+def detect_page_script(image: Image.Image, backend: Optional[str] = None) -> Tuple[Optional[str], float]:
+    """
+    Return the dominant script of a page and OSD's confidence in it
+
+    The script is one of OSD_SCRIPTS' values, or None when OSD fails (no
+    osd.traineddata, too little text) or reports a script we have no patterns for.
+    """
+    try:
+        osd = get_ocr_backend(backend).image_to_osd(_downscale(image))
+    except Exception as e:
+        logger.debug(f"Script detection failed: {e}")
+        return None, 0.0
+    confidence = float(osd.get('script_conf') or 0.0)
+    return OSD_SCRIPTS.get(osd.get('script')), confidence
+
+
+def route_page_lang(image: Image.Image, fallback: str = FALLBACK_LANG,
+                    backend: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """
+    Pick the Tesseract language string for one page
+
+    English is always kept alongside an Indic script since pattas mix English
+    labels and numerals into vernacular text. OSD only reports the dominant
+    script, so a page detected as Latin (often a vernacular patta that is
+    mostly English labels and digits) keeps `fallback` and its Indic packs.
+    Uncertain detections, or scripts whose traineddata is not installed, fall
+    back to `fallback` too.
+
+    Returns:
+        (lang, detected_script)
+    """
+    script, confidence = detect_page_script(image, backend)
+    if script is None or script == 'latin' or confidence < MIN_SCRIPT_CONFIDENCE:
+        return fallback, script
+
+    lang = tesseract_lang({script, 'latin'})
+    available = installed_languages()
+    if available and not set(lang.split('+')) <= available:
+        logger.warning(f"Traineddata for '{lang}' not installed, using '{fallback}'")
+        return fallback, script
+    return lang, script
@@ -0,0 +1,88 @@
+"""
+Indic Script Detection
+Identifies which writing systems appear in text so extractors only run the patterns and language packs they need
+"""
+
+import re
+from typing import Dict, Iterable, Set, Tuple
+
+# Unicode blocks of the scripts found on Indian land records
+SCRIPT_RANGES: Dict[str, Tuple[int, int]] = {
+    'devanagari': (0x0900, 0x097F),
+    'bengali': (0x0980, 0x09FF),
+    'odia': (0x0B00, 0x0B7F),
+    'tamil': (0x0B80, 0x0BFF),
+    'telugu': (0x0C00, 0x0C7F),
+    'kannada': (0x0C80, 0x0CFF),
+    'malayalam': (0x0D00, 0x0D7F),
+}
+
+# Tesseract traineddata for each script (Devanagari documents are treated as Hindi)
+TESSERACT_LANGS: Dict[str, str] = {
+    'latin': 'eng',
+    'devanagari': 'hin',
+    'bengali': 'ben',
+    'odia': 'ori',
+    'tamil': 'tam',
+    'telugu': 'tel',
+    'kannada': 'kan',
+    'malayalam': 'mal',
+}
+
+# Regex escapes such as \s or \d, removed before looking for literal letters in a pattern
+_ESCAPE_RE = re.compile(r'\\.')
+
+
+def char_script(ch: str) -> str:
+    """Return the script of a single character ('latin', an Indic script name, or '' for anything else)"""
+    if ('a' <= ch <= 'z') or ('A' <= ch <= 'Z'):
+        return 'latin'
+    code = ord(ch)
+    if code < 0x0900 or code > 0x0D7F:
+        return ''
+    for script, (low, high) in SCRIPT_RANGES.items():
+        if low <= code <= high:
+            return script
+    return ''
+
+
+def detect_scripts(text: str) -> Set[str]:
+    """Return the set of scripts present in text (one pass over its distinct characters)"""
+    scripts = set()
+    for ch in set(text):
+        script = char_script(ch)
+        if script:
+            scripts.add(script)
+    return scripts
+
+
+def script_counts(text: str) -> Dict[str, int]:
+    """Count the letters of each script in text"""
+    counts: Dict[str, int] = {}
+    for ch in text:
+        script = char_script(ch)
+        if script:
+            counts[script] = counts.get(script, 0) + 1
+    return counts
+
+
+def pattern_scripts(pattern: str) -> Set[str]:
+    """
+    Return the scripts of the literal keywords in a regex pattern
+
+    Only the part before the first capturing group is inspected, since that is
+    the label a match has to start with; the captured value may be in any script.
+    """
+    prefix = _ESCAPE_RE.sub('', pattern)
+    capture = re.search(r'\((?!\?)', prefix)
+    if capture:
+        prefix = prefix[:capture.start()]
+    return detect_scripts(prefix)
+
+
+def tesseract_lang(scripts: Iterable[str], fallback: str = 'eng') -> str:
+    """Build a Tesseract language string (e.g. 'tam+eng') for a set of scripts"""
+    langs = [TESSERACT_LANGS[s] for s in sorted(scripts) if s != 'latin' and s in TESSERACT_LANGS]
+    if 'latin' in scripts or not langs:
+        langs.append('eng')
+    return '+'.join(langs) or fallback
@@ -5,6 +5,14 @@ import pytesseract
 from pdf2image import convert_from_path
 import re
 import os
+import sys
+
+# Add project root to path for shared OCR imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from digitization.ocr_pool import get_ocr_executor
 
 # Set Tesseract path (adjust if different)
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
@@ -15,12 +23,10 @@ def pdf_to_text(pdf_path):
         # Convert PDF to images
         images = convert_from_path(pdf_path, dpi=300)
         
-        # Extract text from each image
-        text = ""
-        for image in images:
-            text += pytesseract.image_to_string(image, lang='eng') + "\n"
+        # Extract text from each image, pages in parallel
+        page_texts = get_ocr_executor().ocr_pages(images, lang='eng')
         
-        return text
+        return "".join(page_text + "\n" for page_text in page_texts)
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return ""
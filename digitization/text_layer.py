@@ -0,0 +1,125 @@
+"""
+PDF Text Layer Quality Scoring
+Decides per page whether pdfplumber's text layer is good enough to skip OCR
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Any
+from digitization.scripts import char_script
+
+# Thresholds for trusting a page's text layer
+MIN_TEXT_CHARS = 30
+MAX_INVALID_RATIO = 0.02
+MIN_INDIC_RATIO = 0.9
+MAX_ORPHAN_SIGN_RATIO = 0.05
+MAX_LEGACY_FONT_RATIO = 0.05
+MIN_KEYWORD_HITS = 1
+# Long pages (annexures, notes) are trusted without keywords if everything else checks out
+KEYWORD_EXEMPT_CHARS = 500
+
+# Labels found on Tamil Nadu and other e-service pattas
+PATTA_KEYWORDS = [
+    'patta', 'survey', 'village', 'taluk', 'district', 'owner', 'extent',
+    'பட்டா', 'புல எண்', 'சர்வே', 'கிராமம்', 'வட்டம்', 'மாவட்டம்', 'உரிமையாளர்', 'பரப்பு'
+]
+
+# pdfplumber emits (cid:NN) for glyphs its font has no Unicode mapping for
+CID_RE = re.compile(r'\(cid:\d+\)')
+
+# ASCII-mapped legacy Tamil fonts (Bamini, TAM) spell the pulli as ';' inside words, e.g. "gl;lh"
+LEGACY_PULLI_RE = re.compile(r'[A-Za-z];[A-Za-z]')
+
+# Tamil consonants and the dependent vowel signs / virama that must follow one
+TAMIL_CONSONANTS = (0x0B95, 0x0BB9)
+TAMIL_SIGNS = (0x0BBE, 0x0BCD)
+
+
+def _is_invalid(ch: str) -> bool:
+    """Replacement, private-use, control, or Latin-1/Extended letters left behind by legacy Tamil fonts"""
+    code = ord(ch)
+    if ch == '\ufffd' or 0xE000 <= code <= 0xF8FF:
+        return True
+    if 0x00C0 <= code <= 0x024F:
+        return True
+    return unicodedata.category(ch) == 'Cc' and ch not in '\n\r\t'
+
+
+def score_text_layer(text: str, keywords: Iterable[str] = PATTA_KEYWORDS) -> Dict[str, Any]:
+    """
+    Measure a page's extracted text
+
+    Returns:
+        Dict with the character count, ratio of invalid glyphs, Tamil and Indic
+        glyph ratios among non-ASCII letters, ratio of Tamil vowel signs not
+        attached to a consonant (a symptom of visually ordered text layers), ratio
+        of words spelled in an ASCII-mapped legacy Tamil font and the number of
+        patta keywords found
+    """
+    cid_count = len(CID_RE.findall(text))
+    # Decomposed two-part vowel signs are composed so they are not counted as orphans
+    text = unicodedata.normalize('NFC', CID_RE.sub('', text))
+    chars = [ch for ch in text if not ch.isspace()]
+
+    invalid = cid_count
+    non_ascii = tamil = indic = 0
+    signs = orphan_signs = 0
+    previous = ''
+    for ch in text:
+        code = ord(ch)
+        if _is_invalid(ch):
+            invalid += 1
+        elif code > 0x7F and unicodedata.category(ch)[0] in 'LM':
+            non_ascii += 1
+            script = char_script(ch)
+            if script == 'tamil':
+                tamil += 1
+            if script and script != 'latin':
+                indic += 1
+            if TAMIL_SIGNS[0] <= code <= TAMIL_SIGNS[1]:
+                signs += 1
+                prev_code = ord(previous) if previous else 0
+                if not (TAMIL_CONSONANTS[0] <= prev_code <= TAMIL_CONSONANTS[1]):
+                    orphan_signs += 1
+        previous = ch
+
+    words = len(text.split())
+    lowered = text.lower()
+    keyword_hits = sum(1 for keyword in keywords if keyword.lower() in lowered)
+    total = len(chars) + cid_count
+    return {
+        'chars': len(chars),
+        'invalid_ratio': round(invalid / total, 4) if total else 0.0,
+        'tamil_ratio': round(tamil / non_ascii, 4) if non_ascii else 0.0,
+        'indic_ratio': round(indic / non_ascii, 4) if non_ascii else 1.0,
+        'orphan_sign_ratio': round(orphan_signs / signs, 4) if signs else 0.0,
+        'legacy_font_ratio': round(len(LEGACY_PULLI_RE.findall(text)) / words, 4) if words else 0.0,
+        'keyword_hits': keyword_hits
+    }
+
+
+def assess_text_layer(text: str, keywords: Iterable[str] = PATTA_KEYWORDS) -> Dict[str, Any]:
+    """
+    Score a page's text layer and decide whether it can be used instead of OCR
+
+    Returns:
+        score_text_layer()'s metrics plus 'usable' and the 'reasons' it is not
+    """
+    metrics = score_text_layer(text, keywords)
+    reasons: List[str] = []
+    if metrics['chars'] < MIN_TEXT_CHARS:
+        reasons.append('too_little_text')
+    if metrics['invalid_ratio'] > MAX_INVALID_RATIO:
+        reasons.append('invalid_unicode')
+    if metrics['indic_ratio'] < MIN_INDIC_RATIO:
+        reasons.append('unmapped_glyphs')
+    if metrics['orphan_sign_ratio'] > MAX_ORPHAN_SIGN_RATIO:
+        reasons.append('misordered_vowel_signs')
+    if metrics['legacy_font_ratio'] > MAX_LEGACY_FONT_RATIO:
+        reasons.append('legacy_font_encoding')
+    if metrics['keyword_hits'] < MIN_KEYWORD_HITS and metrics['chars'] < KEYWORD_EXEMPT_CHARS:
+        reasons.append('no_keywords')
+
+    metrics['usable'] = not reasons
+    metrics['reasons'] = reasons
+    return metrics
@@ -0,0 +1,172 @@
+"""
+Streaming Upload Ingest
+Writes uploaded documents to disk in chunks while computing SHA-256 and size in the same pass
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+from typing import Dict, Iterator, Optional, Any, BinaryIO
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upload limits (overridable through the environment)
+MAX_FILE_SIZE = int(float(os.environ.get('FRA_MAX_UPLOAD_MB', 10)) * 1024 * 1024)
+
+# Chunk size used when streaming uploads to disk and hashing files
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit"""
+
+    def __init__(self, max_size: int, size: Optional[int] = None):
+        limit_mb = max_size // (1024 * 1024)
+        super().__init__(f"File size must be less than {limit_mb}MB")
+        self.max_size = max_size
+        self.size = size
+
+
+class IngestedUpload:
+    """
+    An upload that has been streamed, with the metadata gathered on the way
+
+    path is None for uploads that were only hashed (see hash_upload).
+    """
+
+    def __init__(self, path: Optional[str], original_filename: str, size: int, sha256: str,
+                 content_type: Optional[str] = None):
+        self.path = path
+        self.original_filename = original_filename
+        self.size = size
+        self.sha256 = sha256
+        self.content_type = content_type
+
+    @property
+    def filename(self) -> Optional[str]:
+        """Name of the stored file (None if it was not stored)"""
+        return os.path.basename(self.path) if self.path else None
+
+    def open(self) -> BinaryIO:
+        """Open the stored file for reading"""
+        return open(self.path, 'rb')
+
+    def remove(self) -> None:
+        """Delete the stored file, ignoring files that are already gone or were never stored"""
+        if not self.path:
+            return
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metadata reported alongside verification and extraction results"""
+        return {
+            'original_filename': self.original_filename,
+            'saved_filename': self.filename,
+            'file_size': self.size,
+            'file_hash': self.sha256,
+            'content_type': self.content_type
+        }
+
+
+def sha256_file(file_path: str) -> str:
+    """Compute the SHA-256 of a file on disk without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_declared_size(content_length: Optional[int], max_size: int = MAX_FILE_SIZE) -> None:
+    """
+    Reject a request whose declared Content-Length already exceeds the limit
+
+    Call before touching request.files so oversized bodies are refused without being read.
+    """
+    if content_length and content_length > max_size:
+        raise UploadTooLargeError(max_size, content_length)
+
+
+def _read_chunks(stream: BinaryIO, max_size: int) -> Iterator[bytes]:
+    """Yield a body in CHUNK_SIZE pieces, raising UploadTooLargeError as soon as it passes max_size"""
+    size = 0
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+        size += len(chunk)
+        if size > max_size:
+            raise UploadTooLargeError(max_size, size)
+        yield chunk
+
+
+def hash_upload(file_storage, max_size: int = MAX_FILE_SIZE) -> IngestedUpload:
+    """
+    Hash and measure an upload without storing it (the returned upload has no path)
+
+    Used when the file will only be stored if its hash is unknown, e.g. to
+    answer from the result cache while the verification queue is full.
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds max_size
+    """
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in _read_chunks(file_storage.stream, max_size):
+        size += len(chunk)
+        digest.update(chunk)
+    return IngestedUpload(None, file_storage.filename or '', size, digest.hexdigest(),
+                          getattr(file_storage, 'mimetype', None))
+
+
+def ingest_upload(file_storage, dest_dir: str, filename: Optional[str] = None,
+                  max_size: int = MAX_FILE_SIZE) -> IngestedUpload:
+    """
+    Stream an uploaded file to disk, hashing and measuring it on the way
+
+    The body is copied in CHUNK_SIZE pieces into a temporary file in dest_dir,
+    so memory use stays flat regardless of document size, and the copy is
+    abandoned as soon as it passes max_size. The temporary file is renamed
+    into place only once the whole upload has been received.
+
+    Args:
+        file_storage: Werkzeug FileStorage (anything with .stream and .filename)
+        dest_dir: Directory to store the file in (created if missing)
+        filename: Stored file name; may contain '{sha256}', which is filled in with the
+            content hash. Defaults to '{sha256}' plus the original extension.
+        max_size: Maximum accepted size in bytes
+
+    Returns:
+        IngestedUpload describing the stored file
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds max_size
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    original_filename = file_storage.filename or ''
+    if filename is None:
+        filename = '{sha256}' + os.path.splitext(original_filename)[1].lower()
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=dest_dir, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in _read_chunks(file_storage.stream, max_size):
+                size += len(chunk)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    sha256 = digest.hexdigest()
+    final_path = os.path.join(dest_dir, filename.replace('{sha256}', sha256))
+    os.replace(temp_path, final_path)
+
+    logger.info(f"Stored upload {original_filename} ({size} bytes, sha256 {sha256[:12]}...) at {final_path}")
+    return IngestedUpload(final_path, original_filename, size, sha256,
+                          getattr(file_storage, 'mimetype', None))
@@ -5,10 +5,11 @@ Combines OCR processing with optimized regex patterns
 """
 
 import re, os, json
-import pdfplumber
 from pdf2image import convert_from_path
 import pytesseract
 import logging
+from digitization.ocr_pool import get_ocr_executor
+from digitization.extraction_engine import acquire_text
 from datetime import datetime
 from typing import Dict
 
@@ -134,17 +135,14 @@ class FinalComprehensiveExtractor:
         try:
             # Convert PDF to images with higher DPI for better OCR
             images = convert_from_path(pdf_path, dpi=300)
-            all_text = []
+            logger.info(f"Processing {len(images)} page(s) with OCR...")
             
-            for i, img in enumerate(images):
-                logger.info(f"Processing page {i+1} with OCR...")
-                # Use Tamil+English with optimized config
-                txt = pytesseract.image_to_string(
-                    img, 
-                    lang="tam+eng",
-                    config='--psm 6'
-                )
-                all_text.append(txt)
+            # Use Tamil+English with optimized config, pages in parallel
+            all_text = get_ocr_executor().ocr_pages(
+                images,
+                lang="tam+eng",
+                config='--psm 6'
+            )
             
             return "\n".join(all_text)
             
@@ -156,26 +154,9 @@ class FinalComprehensiveExtractor:
         """Main extraction method combining OCR and regex"""
         logger.info(f"Starting comprehensive extraction from PDF: {pdf_path}")
         
-        # Step 1: Try direct text extraction
-        text = ""
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for p in pdf.pages:
-                    t = p.extract_text() or ""
-                    text += t + "\n"
-            logger.info("Extracted text from PDF pages")
-        except Exception as e:
-            logger.error(f"PDF text extraction failed: {e}")
-            text = ""
-        
-        # Step 2: Always use OCR for Tamil documents (better accuracy)
-        logger.info("Using OCR for Tamil document processing...")
-        ocr_text = self.ocr_pdf(pdf_path)
-        if ocr_text and len(ocr_text.strip()) > len(text.strip()):
-            text = ocr_text
-            logger.info("OCR text used (better than PDF text)")
-        else:
-            logger.info("PDF text used (OCR not better)")
+        # Steps 1-2: Shared text acquisition (clean text layer pages as-is, OCR for the rest)
+        document = acquire_text(pdf_path, lang="tam+eng", config='--psm 6')
+        text = document.text
         
         # Step 3: Extract fields using your optimized regex patterns
         result = {
@@ -206,7 +187,8 @@ class FinalComprehensiveExtractor:
             "extraction_timestamp": datetime.now().isoformat(),
             "text_length": len(text),
             "success_rate": success_rate,
-            "ocr_used": len(text.strip()) < 100,
+            "ocr_used": document.ocr_used,
+            "page_sources": document.page_sources,
             "method": "OCR + Optimized Regex"
         }
 
@@ -0,0 +1,174 @@
+"""
+Verification History Store
+Keeps one compact, indexed summary row per verification so history queries never touch the result files
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Any
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Database file name, created next to the web app's fra_atlas.db
+HISTORY_DB_NAME = 'verification_history.db'
+
+# Maximum page size served by query()
+MAX_PAGE_SIZE = 200
+
+
+def summarize_results(verification_id: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a full verification result to its history summary
+
+    Quick and basic verifications report their decision under quick_decision /
+    basic_decision rather than final_decision, so all three are considered.
+    """
+    decision = (results.get('final_decision') or results.get('basic_decision')
+                or results.get('quick_decision') or {})
+    file_info = results.get('file_info', {})
+    return {
+        'verification_id': verification_id,
+        'timestamp': results.get('verification_timestamp') or file_info.get('upload_timestamp', ''),
+        'filename': file_info.get('original_filename', ''),
+        'state': results.get('state', ''),
+        'verification_type': results.get('verification_type', 'full'),
+        'status': results.get('status', ''),
+        'final_decision': decision.get('status', ''),
+        'confidence': decision.get('confidence', 0) or 0,
+        'file_hash': file_info.get('file_hash')
+    }
+
+
+class VerificationHistoryStore:
+    """
+    SQLite table of verification summaries
+
+    Rows are written once when a verification's results are saved. Listing,
+    filtering by state or decision and pagination are served by indexes, so
+    the cost of a history page does not grow with the size of the archive.
+    """
+
+    COLUMNS = ['verification_id', 'timestamp', 'filename', 'state', 'verification_type',
+               'status', 'final_decision', 'confidence', 'file_hash']
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation, commit and close it"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        """Create the history table and indexes if needed"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS verification_history
+                            (verification_id TEXT PRIMARY KEY,
+                             timestamp TEXT NOT NULL,
+                             filename TEXT,
+                             state TEXT,
+                             verification_type TEXT,
+                             status TEXT,
+                             final_decision TEXT,
+                             confidence REAL,
+                             file_hash TEXT,
+                             recorded_at TEXT NOT NULL)''')
+            conn.execute('''CREATE INDEX IF NOT EXISTS idx_history_timestamp
+                            ON verification_history (timestamp DESC, verification_id DESC)''')
+            conn.execute('''CREATE INDEX IF NOT EXISTS idx_history_state
+                            ON verification_history (state, timestamp DESC)''')
+            conn.execute('''CREATE INDEX IF NOT EXISTS idx_history_decision
+                            ON verification_history (final_decision, timestamp DESC)''')
+            conn.execute('''CREATE TABLE IF NOT EXISTS verification_history_meta
+                            (key TEXT PRIMARY KEY, value TEXT)''')
+
+    def record(self, verification_id: str, results: Dict[str, Any]) -> None:
+        """Insert or replace the summary row for a verification"""
+        summary = summarize_results(verification_id, results)
+        self._insert([summary])
+
+    def _insert(self, summaries: List[Dict[str, Any]]) -> None:
+        recorded_at = datetime.now().isoformat()
+        rows = [tuple(s[c] for c in self.COLUMNS) + (recorded_at,) for s in summaries]
+        with self._lock, self._connect() as conn:
+            conn.executemany(f'''INSERT OR REPLACE INTO verification_history
+                                 ({', '.join(self.COLUMNS)}, recorded_at)
+                                 VALUES ({', '.join('?' * (len(self.COLUMNS) + 1))})''', rows)
+
+    def query(self, state: Optional[str] = None, decision: Optional[str] = None,
+              limit: int = 50, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return one page of summaries, newest first, plus the total matching count
+
+        Args:
+            state: Only verifications for this state
+            decision: Only verifications with this final decision (ACCEPTED, REJECTED, ...)
+            limit: Page size (capped at MAX_PAGE_SIZE)
+            offset: Number of rows to skip
+        """
+        clauses, params = [], []
+        if state:
+            clauses.append('state = ?')
+            params.append(state)
+        if decision:
+            clauses.append('final_decision = ?')
+            params.append(decision)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        offset = max(0, int(offset))
+
+        with self._connect() as conn:
+            rows = conn.execute(f'''SELECT {', '.join(self.COLUMNS)} FROM verification_history{where}
+                                    ORDER BY timestamp DESC, verification_id DESC
+                                    LIMIT ? OFFSET ?''', params + [limit, offset]).fetchall()
+            total = conn.execute(f'SELECT COUNT(*) FROM verification_history{where}', params).fetchone()[0]
+        return [dict(row) for row in rows], total
+
+    def import_result_files(self, upload_dir: str) -> int:
+        """
+        One-off import of *_results.json files written before the store existed
+
+        Runs only once per database; later calls return 0 immediately.
+        """
+        with self._connect() as conn:
+            done = conn.execute("SELECT value FROM verification_history_meta WHERE key = 'result_files_imported'").fetchone()
+        if done or not os.path.isdir(upload_dir):
+            return 0
+
+        summaries = []
+        for result_file in os.listdir(upload_dir):
+            if not result_file.endswith('_results.json'):
+                continue
+            try:
+                with open(os.path.join(upload_dir, result_file), 'r') as f:
+                    results = json.load(f)
+                summaries.append(summarize_results(result_file.replace('_results.json', ''), results))
+            except Exception as e:
+                logger.warning(f"Error reading result file {result_file}: {e}")
+
+        if summaries:
+            self._insert(summaries)
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO verification_history_meta (key, value) VALUES ('result_files_imported', ?)",
+                         (datetime.now().isoformat(),))
+        logger.info(f"Imported {len(summaries)} existing verification result(s) into history")
+        return len(summaries)
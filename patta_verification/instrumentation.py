@@ -0,0 +1,317 @@
+"""
+Verification Pipeline Instrumentation
+Records wall time, CPU time and peak RSS per verification step and sub-check, with rolling percentiles and sampled profiling
+"""
+
+import os
+import sys
+import math
+import time
+import uuid
+import random
+import pstats
+import cProfile
+import logging
+import threading
+import functools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Deque, Dict, Iterator, List, Optional, Any
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Instrumentation configuration (overridable through the environment)
+METRICS_WINDOW = int(os.environ.get('FRA_METRICS_WINDOW', 500))
+PROFILE_SAMPLE_RATE = float(os.environ.get('FRA_PROFILE_SAMPLE_RATE', 0))
+PROFILE_DIR = os.environ.get('FRA_PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles'))
+PROFILE_TOP_FUNCTIONS = 15
+
+# Timings of the verification running in the current thread/context
+_current_timings: contextvars.ContextVar = contextvars.ContextVar('verification_timings', default=None)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 2)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class MetricsRegistry:
+    """
+    Rolling latency windows per stage
+
+    Keeps the last `window` wall and CPU samples for each stage name so the
+    metrics endpoint can report recent percentiles without unbounded memory.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window = window
+        self._wall: Dict[str, Deque[float]] = {}
+        self._cpu: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: float) -> None:
+        """Add one sample for a stage"""
+        with self._lock:
+            if name not in self._wall:
+                self._wall[name] = deque(maxlen=self.window)
+                self._cpu[name] = deque(maxlen=self.window)
+                self._counts[name] = 0
+            self._wall[name].append(wall_seconds)
+            self._cpu[name].append(cpu_seconds)
+            self._counts[name] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return count and p50/p90/p95/p99 latency per stage over the rolling window"""
+        with self._lock:
+            samples = {name: (sorted(self._wall[name]), sorted(self._cpu[name]), self._counts[name])
+                       for name in self._wall}
+
+        stages = {}
+        for name, (wall, cpu, count) in sorted(samples.items()):
+            stages[name] = {
+                'count': count,
+                'window': len(wall),
+                'wall_seconds': {
+                    'mean': round(sum(wall) / len(wall), 4),
+                    'p50': round(percentile(wall, 50), 4),
+                    'p90': round(percentile(wall, 90), 4),
+                    'p95': round(percentile(wall, 95), 4),
+                    'p99': round(percentile(wall, 99), 4),
+                    'max': round(wall[-1], 4)
+                },
+                'cpu_seconds': {
+                    'p50': round(percentile(cpu, 50), 4),
+                    'p95': round(percentile(cpu, 95), 4)
+                }
+            }
+        return {'window': self.window, 'stages': stages}
+
+    def reset(self) -> None:
+        """Drop all samples"""
+        with self._lock:
+            self._wall.clear()
+            self._cpu.clear()
+            self._counts.clear()
+
+
+# Process-wide registry fed by every instrumented verification
+metrics_registry = MetricsRegistry()
+
+
+class StageTimings:
+    """
+    Timings for one verification
+
+    Stages may nest; a sub-check timed while a step is running is recorded as
+    'step.sub_check'. Repeated stages accumulate and count their calls. CPU time
+    is this thread's CPU, so OCR done in the worker pool shows up as wall time
+    only (see ocr_extraction.ocr_stats for the per-page OCR seconds).
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = metrics_registry):
+        self.registry = registry
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._stack: List[str] = []
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.thread_time()
+        self._start_rss = peak_rss_mb()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block as a (possibly nested) stage"""
+        full_name = '.'.join(self._stack + [name])
+        self._stack.append(name)
+        # Create the entry up front so stages are listed in the order they started
+        entry = self.stages.setdefault(full_name, {
+            'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'calls': 0,
+            'peak_rss_mb': None, 'peak_rss_growth_mb': 0.0
+        })
+        rss_before = peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            rss_after = peak_rss_mb()
+            self._stack.pop()
+
+            entry['wall_seconds'] += wall
+            entry['cpu_seconds'] += cpu
+            entry['calls'] += 1
+            if rss_after is not None:
+                entry['peak_rss_mb'] = rss_after
+                entry['peak_rss_growth_mb'] += rss_after - rss_before
+            if self.registry is not None:
+                self.registry.record(full_name, wall, cpu)
+
+    def add(self, name: str, wall_seconds: float, cpu_seconds: float = 0.0, **extra: Any) -> None:
+        """
+        Record work timed elsewhere (e.g. in OCR worker processes) as a stage nested under the current one
+
+        Extra keyword values (such as pixel counts) are summed into the stage entry.
+        """
+        full_name = '.'.join(self._stack + [name])
+        entry = self.stages.setdefault(full_name, {
+            'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'calls': 0,
+            'peak_rss_mb': None, 'peak_rss_growth_mb': 0.0
+        })
+        entry['wall_seconds'] += wall_seconds
+        entry['cpu_seconds'] += cpu_seconds
+        entry['calls'] += 1
+        for key, value in extra.items():
+            entry.setdefault('extra', {})
+            entry['extra'][key] = entry['extra'].get(key, 0) + value
+        if self.registry is not None:
+            self.registry.record(full_name, wall_seconds, cpu_seconds)
+
+    @contextmanager
+    def activate(self) -> Iterator['StageTimings']:
+        """Make these timings the target of @timed sub-checks in the current context"""
+        token = _current_timings.set(self)
+        try:
+            yield self
+        finally:
+            _current_timings.reset(token)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable summary: overall totals plus every stage in execution order"""
+        total_wall = time.perf_counter() - self._start_wall
+        total_cpu = time.thread_time() - self._start_cpu
+        rss = peak_rss_mb()
+        return {
+            'total': {
+                'wall_seconds': round(total_wall, 4),
+                'cpu_seconds': round(total_cpu, 4),
+                'peak_rss_mb': rss,
+                'peak_rss_growth_mb': round(rss - self._start_rss, 2) if rss is not None else None
+            },
+            'stages': {
+                name: {
+                    'wall_seconds': round(entry['wall_seconds'], 4),
+                    'cpu_seconds': round(entry['cpu_seconds'], 4),
+                    'calls': entry['calls'],
+                    'peak_rss_mb': entry['peak_rss_mb'],
+                    'peak_rss_growth_mb': round(entry['peak_rss_growth_mb'], 2),
+                    **entry.get('extra', {})
+                }
+                for name, entry in self.stages.items()
+            }
+        }
+
+    def finish(self) -> Dict[str, Any]:
+        """Record the overall verification time in the registry and return the summary"""
+        summary = self.to_dict()
+        if self.registry is not None:
+            self.registry.record('total', summary['total']['wall_seconds'], summary['total']['cpu_seconds'])
+        return summary
+
+
+def timed(name: str):
+    """
+    Decorator timing a sub-check as a stage of the verification running in this context
+
+    Outside an instrumented verification the function runs untimed.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _current_timings.get()
+            if timings is None:
+                return func(*args, **kwargs)
+            with timings.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_stage(name: str, wall_seconds: float, cpu_seconds: float = 0.0, **extra: Any) -> None:
+    """Record externally timed work on the verification running in this context (no-op outside one)"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(name, wall_seconds, cpu_seconds, **extra)
+
+
+# cProfile hooks are process-wide on recent Pythons, so only one sampled run profiles at a time
+_profile_lock = threading.Lock()
+
+
+@contextmanager
+def sampled_profile(sample_rate: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Profile the block with cProfile for a sampled fraction of calls
+
+    Yields a dict that, for sampled runs, is filled on exit with the path of the
+    dumped .prof file and the top functions by cumulative time; otherwise it stays empty.
+    """
+    rate = PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+    report: Dict[str, Any] = {}
+    if rate <= 0 or random.random() >= rate or not _profile_lock.acquire(blocking=False):
+        yield report
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except Exception as e:
+        # Another profiling tool is already hooked in
+        _profile_lock.release()
+        logger.warning(f"Profiling skipped: {e}")
+        yield report
+        return
+
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        try:
+            _save_profile(profiler, report)
+        except Exception as e:
+            logger.warning(f"Could not save verification profile: {e}")
+        finally:
+            _profile_lock.release()
+
+
+def _save_profile(profiler: cProfile.Profile, report: Dict[str, Any]) -> None:
+    """Dump a finished profile to PROFILE_DIR and summarize its top functions into report"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.prof")
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(path)
+
+    top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP_FUNCTIONS]
+    report['path'] = path
+    report['top_functions'] = [
+        {
+            'function': f"{filename}:{line}({func})",
+            'calls': nc,
+            'total_seconds': round(tt, 4),
+            'cumulative_seconds': round(ct, 4)
+        }
+        for (filename, line, func), (cc, nc, tt, ct, callers) in top
+    ]
+    logger.info(f"Saved verification profile to {path}")
@@ -5,25 +5,53 @@ Implements all rules and conditions for online Patta verification with OCR, port
 
 import os
 import re
+import sys
 import json
-import hashlib
 import requests
 import pytesseract
-import spacy
 from PIL import Image
-from pdf2image import convert_from_path
 from datetime import datetime
 import qrcode
 from qrcode import QRCode
 import cv2
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, List, Tuple, Optional, Any
 import logging
+from contextlib import contextmanager
+
+# Add project root to path for shared digitization imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+# Sibling verification modules are imported flat, as verification_api does
+VERIFICATION_DIR = os.path.dirname(os.path.abspath(__file__))
+if VERIFICATION_DIR not in sys.path:
+    sys.path.append(VERIFICATION_DIR)
+
+from digitization.model_registry import get_spacy_model
+from digitization.page_images import DocumentPages
+from digitization.ocr_results import DocumentOCR, get_document_ocr, ocr_cache_key
+from instrumentation import StageTimings, record_stage, sampled_profile, timed
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Version of the verification pipeline; bump when extraction or decision rules change
+# so that cached results from the previous pipeline are no longer served
+PIPELINE_VERSION = '1.1'
+
+# Steps of a full verification, in execution order
+VERIFICATION_STEPS = [
+    'ocr_extraction',
+    'portal_verification',
+    'gis_verification',
+    'authentication',
+    'ec_validation',
+    'final_decision'
+]
+
 class PattaVerifier:
     """
     Comprehensive Patta Document Verification System
@@ -41,13 +69,6 @@ class PattaVerifier:
         # Configure Tesseract path
         pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
         
-        # Load NLP model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.warning("spaCy model not found. Using basic regex extraction.")
-            self.nlp = None
-        
         # State portal configurations
         self.state_portals = {
             'Tamil Nadu': {
@@ -88,17 +109,37 @@ class PattaVerifier:
         # OCR confidence threshold
         self.ocr_confidence_threshold = 90
         
-    def extract_document_data(self, file_path: str) -> Dict[str, Any]:
+        # Render resolution shared by OCR and authentication checks
+        self.render_dpi = 300
+        
+        # Tesseract settings for the single shared OCR pass
+        self.ocr_config = '--psm 6'
+    
+    @property
+    def nlp(self):
+        """spaCy pipeline from the shared model registry, loaded on first use (None if not installed)"""
+        try:
+            return get_spacy_model()
+        except OSError:
+            logger.warning("spaCy model not found. Using basic regex extraction.")
+            return None
+    
+    def extract_document_data(self, file_path: str, pages: Optional[DocumentPages] = None) -> Dict[str, Any]:
         """
         Extract all required data from Patta document using OCR
         
+        Args:
+            file_path: Path to the document file
+            pages: Shared page images for the document (rendered on demand if omitted)
+        
         Returns:
             Dict containing extracted data with confidence scores
         """
         logger.info(f"Extracting data from document: {file_path}")
         
         # Convert document to text
-        text = self._convert_to_text(file_path)
+        pages = self._page_images(file_path, pages)
+        text = self._convert_to_text(file_path, pages)
         
         # Extract structured data
         extracted_data = {
@@ -109,6 +150,12 @@ class PattaVerifier:
             'ocr_quality': self._assess_ocr_quality(text)
         }
         
+        # Word-level confidence from the shared OCR pass
+        ocr = pages.ocr_cache.get(ocr_cache_key(config=self.ocr_config))
+        if ocr is not None:
+            extracted_data['ocr_quality']['mean_word_confidence'] = round(ocr.mean_confidence, 2)
+            extracted_data['ocr_stats'] = ocr.stats()
+        
         # Extract each field with confidence scoring
         for field, pattern in self.patterns.items():
             value, confidence = self._extract_field_with_confidence(text, pattern, field)
@@ -120,24 +167,37 @@ class PattaVerifier:
         
         return extracted_data
     
-    def _convert_to_text(self, file_path: str) -> str:
+    def _page_images(self, file_path: str, pages: Optional[DocumentPages]) -> DocumentPages:
+        """Return the shared page images, creating a private context for standalone calls"""
+        if pages is None:
+            pages = DocumentPages(file_path, dpi=self.render_dpi)
+        return pages
+    
+    @timed('ocr')
+    def _document_ocr(self, file_path: str, pages: Optional[DocumentPages] = None) -> DocumentOCR:
+        """Return the shared OCR result (per-page text, word boxes, confidences) for the document"""
+        pages = self._page_images(file_path, pages)
+        pages.require_dpi(300)
+        fresh = ocr_cache_key(config=self.ocr_config) not in pages.ocr_cache
+        ocr = get_document_ocr(pages, config=self.ocr_config)
+        if fresh:
+            # Pre-processing and Tesseract run in the OCR workers; record their summed per-page seconds
+            prep = ocr.preprocess_stats()
+            record_stage('preprocess', prep['seconds'], prep['seconds'],
+                         pixels_in=prep['pixels_in'], pixels_out=prep['pixels_out'])
+            tesseract_seconds = sum(page.seconds for page in ocr.pages)
+            record_stage('tesseract', tesseract_seconds, tesseract_seconds)
+        return ocr
+    
+    def _convert_to_text(self, file_path: str, pages: Optional[DocumentPages] = None) -> str:
         """Convert PDF/image to text using OCR"""
         try:
-            if file_path.lower().endswith('.pdf'):
-                # Convert PDF to images
-                images = convert_from_path(file_path, dpi=300)
-                text = ""
-                for img in images:
-                    text += pytesseract.image_to_string(img, config='--psm 6')
-                return text
-            else:
-                # Process image directly
-                img = Image.open(file_path)
-                return pytesseract.image_to_string(img, config='--psm 6')
+            return self._document_ocr(file_path, pages).text
         except Exception as e:
             logger.error(f"Error converting document to text: {e}")
             return ""
     
+    @timed('field_extraction')
     def _extract_field_with_confidence(self, text: str, pattern: str, field_name: str) -> Tuple[str, float]:
         """Extract field value with confidence scoring"""
         try:
@@ -265,6 +325,7 @@ class PattaVerifier:
                 'verified': False
             }
     
+    @timed('portal_request')
     def _simulate_portal_verification(self, data: Dict[str, str], state: str) -> Dict[str, Any]:
         """
         Simulate portal verification (replace with actual API calls in production)
@@ -430,12 +491,13 @@ class PattaVerifier:
         # For simulation, we'll assume coordinates within India are valid
         return 6.0 <= lat <= 37.0 and 68.0 <= lon <= 97.0
     
-    def verify_authentication_features(self, file_path: str) -> Dict[str, Any]:
+    def verify_authentication_features(self, file_path: str, pages: Optional[DocumentPages] = None) -> Dict[str, Any]:
         """
         Verify authentication features like QR codes, watermarks, and digital signatures
         
         Args:
             file_path: Path to the document file
+            pages: Shared page images for the document (rendered on demand if omitted)
             
         Returns:
             Authentication verification results
@@ -453,13 +515,15 @@ class PattaVerifier:
         }
         
         try:
+            pages = self._page_images(file_path, pages)
+            
             # Check for QR code
-            qr_result = self._detect_qr_code(file_path)
+            qr_result = self._detect_qr_code(file_path, pages)
             auth_result['qr_code_present'] = qr_result['present']
             auth_result['qr_code_valid'] = qr_result['valid']
             
             # Check for watermark
-            watermark_result = self._detect_watermark(file_path)
+            watermark_result = self._detect_watermark(file_path, pages)
             auth_result['watermark_present'] = watermark_result['present']
             
             # Check for digital signature
@@ -467,7 +531,7 @@ class PattaVerifier:
             auth_result['digital_signature_present'] = signature_result['present']
             
             # Detect tampering
-            tampering_result = self._detect_tampering(file_path)
+            tampering_result = self._detect_tampering(file_path, pages)
             auth_result['tampering_detected'] = tampering_result['detected']
             auth_result['issues'].extend(tampering_result['issues'])
             
@@ -490,15 +554,12 @@ class PattaVerifier:
         
         return auth_result
     
-    def _detect_qr_code(self, file_path: str) -> Dict[str, Any]:
+    @timed('qr_code')
+    def _detect_qr_code(self, file_path: str, pages: Optional[DocumentPages] = None) -> Dict[str, Any]:
         """Detect and validate QR code in document"""
         try:
-            # Convert to image if PDF
-            if file_path.lower().endswith('.pdf'):
-                images = convert_from_path(file_path)
-                img = np.array(images[0])
-            else:
-                img = cv2.imread(file_path)
+            # First page from the shared render
+            img = self._page_images(file_path, pages).array(0, mode='bgr')
             
             # Detect QR codes
             detector = cv2.QRCodeDetector()
@@ -530,34 +591,33 @@ class PattaVerifier:
         
         return False
     
-    def _detect_watermark(self, file_path: str) -> Dict[str, Any]:
+    @timed('watermark')
+    def _detect_watermark(self, file_path: str, pages: Optional[DocumentPages] = None) -> Dict[str, Any]:
         """Detect watermark in document"""
         try:
-            # Convert to image if PDF
-            if file_path.lower().endswith('.pdf'):
-                images = convert_from_path(file_path)
-                img = np.array(images[0])
-            else:
-                img = cv2.imread(file_path)
-            
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            
             # Look for watermark patterns (simplified detection)
             # In production, use more sophisticated watermark detection
             watermark_keywords = ['GOVERNMENT', 'OFFICIAL', 'VERIFIED', 'AUTHENTIC']
             
-            # Use OCR to detect watermark text
-            watermark_text = pytesseract.image_to_string(gray, config='--psm 8')
+            # Read watermark words from the shared OCR pass of the first page
+            ocr = self._document_ocr(file_path, pages)
+            matches = ocr.pages[0].find_words(watermark_keywords) if ocr.pages else []
+            watermark_text = ' '.join(word['text'] for word in matches)
             
-            watermark_found = any(keyword in watermark_text.upper() for keyword in watermark_keywords)
-            
-            return {'present': watermark_found, 'text': watermark_text}
+            return {
+                'present': len(matches) > 0,
+                'text': watermark_text,
+                'boxes': [
+                    {key: word[key] for key in ('left', 'top', 'width', 'height', 'conf')}
+                    for word in matches
+                ]
+            }
             
         except Exception as e:
             logger.error(f"Watermark detection error: {e}")
             return {'present': False, 'text': '', 'error': str(e)}
     
+    @timed('digital_signature')
     def _detect_digital_signature(self, file_path: str) -> Dict[str, Any]:
         """Detect digital signature in document"""
         try:
@@ -576,7 +636,8 @@ class PattaVerifier:
             logger.error(f"Digital signature detection error: {e}")
             return {'present': False, 'type': 'error', 'error': str(e)}
     
-    def _detect_tampering(self, file_path: str) -> Dict[str, Any]:
+    @timed('tampering')
+    def _detect_tampering(self, file_path: str, pages: Optional[DocumentPages] = None) -> Dict[str, Any]:
         """Detect signs of document tampering"""
         tampering_result = {
             'detected': False,
@@ -585,8 +646,8 @@ class PattaVerifier:
         }
         
         try:
-            # Check file integrity
-            file_hash = hashlib.sha256(open(file_path, 'rb').read()).hexdigest()
+            # Check file integrity (hashed in chunks, or taken from the upload)
+            tampering_result['file_hash'] = self._page_images(file_path, pages).sha256()
             
             # Check for common tampering indicators
             issues = []
@@ -598,8 +659,7 @@ class PattaVerifier:
             
             # Check for multiple versions of same text (copy-paste indicators)
             if file_path.lower().endswith('.pdf'):
-                images = convert_from_path(file_path)
-                text = pytesseract.image_to_string(images[0])
+                text = self._document_ocr(file_path, pages).page_text(0)
                 
                 # Look for repeated text patterns that might indicate tampering
                 words = text.split()
@@ -675,6 +735,7 @@ class PattaVerifier:
         
         return ec_result
     
+    @timed('ec_request')
     def _simulate_ec_data(self, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate Encumbrance Certificate data (replace with actual EC integration)"""
         # This is simulation data - in production, integrate with actual EC systems
@@ -807,13 +868,18 @@ class PattaVerifier:
         
         return decision
     
-    def verify_patta_document(self, file_path: str, state: str = 'Tamil Nadu') -> Dict[str, Any]:
+    def verify_patta_document(self, file_path: str, state: str = 'Tamil Nadu',
+                              progress_callback: Optional[Callable[[str, int, int], None]] = None,
+                              file_hash: Optional[str] = None) -> Dict[str, Any]:
         """
         Complete Patta document verification process
         
         Args:
             file_path: Path to the Patta document
             state: State for portal verification
+            progress_callback: Optional callable receiving (step, steps_completed, total_steps)
+                before each step starts
+            file_hash: SHA-256 of the document if already known (e.g. computed while ingesting the upload)
             
         Returns:
             Complete verification results
@@ -823,56 +889,79 @@ class PattaVerifier:
         verification_results = {
             'document_path': file_path,
             'state': state,
+            'pipeline_version': PIPELINE_VERSION,
             'verification_timestamp': datetime.now().isoformat(),
             'steps_completed': [],
             'final_decision': None
         }
         
-        try:
-            # Step 1: OCR Extraction
-            logger.info("Step 1: OCR Extraction")
-            ocr_result = self.extract_document_data(file_path)
-            verification_results['ocr_extraction'] = ocr_result
-            verification_results['steps_completed'].append('ocr_extraction')
-            
-            # Step 2: Portal Verification
-            logger.info("Step 2: Portal Verification")
-            portal_result = self.verify_with_portal(ocr_result, state)
-            verification_results['portal_verification'] = portal_result
-            verification_results['steps_completed'].append('portal_verification')
-            
-            # Step 3: GIS Verification
-            logger.info("Step 3: GIS Verification")
-            gis_result = self.verify_gis_coordinates(ocr_result, portal_result.get('portal_data', {}))
-            verification_results['gis_verification'] = gis_result
-            verification_results['steps_completed'].append('gis_verification')
-            
-            # Step 4: Authentication Verification
-            logger.info("Step 4: Authentication Verification")
-            auth_result = self.verify_authentication_features(file_path)
-            verification_results['authentication'] = auth_result
-            verification_results['steps_completed'].append('authentication')
-            
-            # Step 5: EC Cross-validation
-            logger.info("Step 5: EC Cross-validation")
-            ec_result = self.cross_validate_with_ec(ocr_result)
-            verification_results['ec_validation'] = ec_result
-            verification_results['steps_completed'].append('ec_validation')
-            
-            # Step 6: Final Decision
-            logger.info("Step 6: Final Decision")
-            final_decision = self.make_final_decision(verification_results)
-            verification_results['final_decision'] = final_decision
-            verification_results['steps_completed'].append('final_decision')
-            
-            verification_results['status'] = 'completed'
-            verification_results['success'] = True
-            
-        except Exception as e:
-            logger.error(f"Verification process error: {e}")
-            verification_results['status'] = 'error'
-            verification_results['success'] = False
-            verification_results['error'] = str(e)
+        # Render the document once and share the pages across every step
+        pages = DocumentPages(file_path, dpi=self.render_dpi, file_hash=file_hash)
+        
+        # Wall/CPU/RSS per step and sub-check, plus an occasional cProfile capture
+        timings = StageTimings()
+        
+        @contextmanager
+        def step(name: str):
+            if progress_callback:
+                progress_callback(name, len(verification_results['steps_completed']), len(VERIFICATION_STEPS))
+            with timings.stage(name):
+                yield
+            verification_results['steps_completed'].append(name)
+        
+        with timings.activate(), sampled_profile() as profile:
+            try:
+                # Step 1: OCR Extraction
+                logger.info("Step 1: OCR Extraction")
+                with step('ocr_extraction'):
+                    ocr_result = self.extract_document_data(file_path, pages)
+                    verification_results['ocr_extraction'] = ocr_result
+                
+                # Step 2: Portal Verification
+                logger.info("Step 2: Portal Verification")
+                with step('portal_verification'):
+                    portal_result = self.verify_with_portal(ocr_result, state)
+                    verification_results['portal_verification'] = portal_result
+                
+                # Step 3: GIS Verification
+                logger.info("Step 3: GIS Verification")
+                with step('gis_verification'):
+                    gis_result = self.verify_gis_coordinates(ocr_result, portal_result.get('portal_data', {}))
+                    verification_results['gis_verification'] = gis_result
+                
+                # Step 4: Authentication Verification
+                logger.info("Step 4: Authentication Verification")
+                with step('authentication'):
+                    auth_result = self.verify_authentication_features(file_path, pages)
+                    verification_results['authentication'] = auth_result
+                
+                # Step 5: EC Cross-validation
+                logger.info("Step 5: EC Cross-validation")
+                with step('ec_validation'):
+                    ec_result = self.cross_validate_with_ec(ocr_result)
+                    verification_results['ec_validation'] = ec_result
+                
+                # Step 6: Final Decision
+                logger.info("Step 6: Final Decision")
+                with step('final_decision'):
+                    final_decision = self.make_final_decision(verification_results)
+                    verification_results['final_decision'] = final_decision
+                
+                verification_results['status'] = 'completed'
+                verification_results['success'] = True
+                
+            except Exception as e:
+                logger.error(f"Verification process error: {e}")
+                verification_results['status'] = 'error'
+                verification_results['success'] = False
+                verification_results['error'] = str(e)
+            finally:
+                verification_results['page_rendering'] = pages.stats()
+                pages.close()
+        
+        verification_results['timings'] = timings.finish()
+        if profile:
+            verification_results['profile'] = profile
         
         return verification_results
 
@@ -0,0 +1,188 @@
+"""
+Content-Addressed Verification Result Cache
+Persists verification results keyed by document SHA-256, state, verification type and pipeline version
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Any
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache configuration (overridable through the environment)
+DEFAULT_CACHE_PATH = os.environ.get(
+    'FRA_VERIFICATION_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'verification_cache.db')
+)
+DEFAULT_MAX_BYTES = int(float(os.environ.get('FRA_VERIFICATION_CACHE_MB', 256)) * 1024 * 1024)
+DEFAULT_MAX_ENTRIES = int(os.environ.get('FRA_VERIFICATION_CACHE_ENTRIES', 10000))
+
+class VerificationResultCache:
+    """
+    Persistent LRU cache of verification results
+
+    Entries live in a small SQLite database so they survive restarts and are
+    shared between worker processes. The key is the document's SHA-256 plus the
+    state, verification type and pipeline version, so a re-uploaded copy of the
+    same patta is answered without re-running OCR, portal, GIS, authentication
+    and EC checks, while a pipeline upgrade naturally misses. The cache is
+    bounded by total payload size and entry count; least recently used entries
+    are evicted first.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation (so the cache is safe across threads), commit and close it"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        """Create the cache table and indexes if needed"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS verification_cache
+                            (cache_key TEXT PRIMARY KEY,
+                             file_hash TEXT NOT NULL,
+                             state TEXT NOT NULL,
+                             verification_type TEXT NOT NULL,
+                             pipeline_version TEXT NOT NULL,
+                             result_json TEXT NOT NULL,
+                             size_bytes INTEGER NOT NULL,
+                             created_at REAL NOT NULL,
+                             last_accessed REAL NOT NULL,
+                             hit_count INTEGER DEFAULT 0)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_last_accessed ON verification_cache (last_accessed)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_file_hash ON verification_cache (file_hash)')
+
+    @staticmethod
+    def make_key(file_hash: str, state: str, verification_type: str, pipeline_version: str) -> str:
+        """Build the cache key for a document/state/type/pipeline combination"""
+        return f"{file_hash}:{state}:{verification_type}:{pipeline_version}"
+
+    def get(self, file_hash: str, state: str, verification_type: str,
+            pipeline_version: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result, or None on a miss"""
+        key = self.make_key(file_hash, state, verification_type, pipeline_version)
+        try:
+            with self._connect() as conn:
+                row = conn.execute('SELECT result_json, created_at FROM verification_cache WHERE cache_key = ?',
+                                   (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute('''UPDATE verification_cache
+                                SET last_accessed = ?, hit_count = hit_count + 1
+                                WHERE cache_key = ?''', (time.time(), key))
+            result = json.loads(row['result_json'])
+            result['cache'] = {
+                'hit': True,
+                'file_hash': file_hash,
+                'cached_at': row['created_at']
+            }
+            logger.info(f"Verification cache hit for {file_hash[:12]}... ({state}, {verification_type})")
+            return result
+        except Exception as e:
+            logger.warning(f"Verification cache lookup failed: {e}")
+            return None
+
+    def put(self, file_hash: str, state: str, verification_type: str, pipeline_version: str,
+            result: Dict[str, Any]) -> bool:
+        """Store a result and evict least recently used entries beyond the size limits"""
+        key = self.make_key(file_hash, state, verification_type, pipeline_version)
+        payload = json.dumps({k: v for k, v in result.items() if k != 'cache'}, default=str)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            logger.warning(f"Result for {file_hash[:12]}... too large to cache ({size} bytes)")
+            return False
+
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute('''INSERT OR REPLACE INTO verification_cache
+                                (cache_key, file_hash, state, verification_type, pipeline_version,
+                                 result_json, size_bytes, created_at, last_accessed, hit_count)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)''',
+                             (key, file_hash, state, verification_type, pipeline_version,
+                              payload, size, now, now))
+                self._evict(conn)
+            return True
+        except Exception as e:
+            logger.warning(f"Verification cache store failed: {e}")
+            return False
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """Delete least recently used entries until the cache fits its limits"""
+        count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM verification_cache').fetchone()
+        evicted = 0
+        if count <= self.max_entries and total <= self.max_bytes:
+            return evicted
+
+        rows = conn.execute('SELECT cache_key, size_bytes FROM verification_cache ORDER BY last_accessed ASC').fetchall()
+        for row in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM verification_cache WHERE cache_key = ?', (row['cache_key'],))
+            count -= 1
+            total -= row['size_bytes']
+            evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} verification cache entr{'y' if evicted == 1 else 'ies'}")
+        return evicted
+
+    def invalidate(self, file_hash: Optional[str] = None, state: Optional[str] = None,
+                   pipeline_version: Optional[str] = None) -> int:
+        """
+        Remove cached results
+
+        With no arguments every entry is removed; otherwise only entries matching
+        all of the given file hash, state and pipeline version.
+        """
+        clauses, params = [], []
+        for column, value in (('file_hash', file_hash), ('state', state), ('pipeline_version', pipeline_version)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self._lock, self._connect() as conn:
+            removed = conn.execute(f"DELETE FROM verification_cache{where}", params).rowcount
+        logger.info(f"Invalidated {removed} verification cache entr{'y' if removed == 1 else 'ies'}")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, stored bytes, limits and total hits"""
+        with self._connect() as conn:
+            count, total, hits = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0), COALESCE(SUM(hit_count), 0) FROM verification_cache'
+            ).fetchone()
+        return {
+            'entries': count,
+            'size_bytes': total,
+            'total_hits': hits,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'db_path': self.db_path
+        }
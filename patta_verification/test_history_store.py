@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the Verification History Store
+Checks recording, filtering, pagination and the one-off import of result files
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from history_store import VerificationHistoryStore
+
+def _result(state, decision, timestamp):
+    return {
+        'state': state,
+        'status': 'completed',
+        'verification_timestamp': timestamp,
+        'final_decision': {'status': decision, 'confidence': 85},
+        'file_info': {'original_filename': 'patta.pdf'},
+        'ocr_extraction': {'raw_text': 'x' * 1000}
+    }
+
+def test_query_filters_and_pages():
+    """History is newest first and can be filtered and paged"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = VerificationHistoryStore(os.path.join(tmp_dir, 'history.db'))
+        store.record('20250101_100000', _result('Tamil Nadu', 'ACCEPTED', '2025-01-01T10:00:00'))
+        store.record('20250102_100000', _result('Karnataka', 'REJECTED', '2025-01-02T10:00:00'))
+        store.record('20250103_100000', _result('Tamil Nadu', 'REJECTED', '2025-01-03T10:00:00'))
+
+        rows, total = store.query()
+        assert total == 3
+        assert [r['verification_id'] for r in rows] == ['20250103_100000', '20250102_100000', '20250101_100000']
+
+        rows, total = store.query(state='Tamil Nadu', decision='REJECTED')
+        assert total == 1 and rows[0]['verification_id'] == '20250103_100000'
+
+        rows, total = store.query(limit=1, offset=1)
+        assert total == 3 and rows[0]['verification_id'] == '20250102_100000'
+        print("✅ History filtering and pagination")
+
+def test_import_result_files():
+    """Existing result files are imported exactly once"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        upload_dir = os.path.join(tmp_dir, 'uploads')
+        os.makedirs(upload_dir)
+        with open(os.path.join(upload_dir, '20250101_100000_results.json'), 'w') as f:
+            json.dump(_result('Telangana', 'ACCEPTED', '2025-01-01T10:00:00'), f)
+
+        store = VerificationHistoryStore(os.path.join(tmp_dir, 'history.db'))
+        assert store.import_result_files(upload_dir) == 1
+        assert store.import_result_files(upload_dir) == 0
+
+        rows, total = store.query(state='Telangana')
+        assert total == 1 and rows[0]['final_decision'] == 'ACCEPTED'
+        print("✅ History import of result files")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Verification History Store Tests")
+    test_query_filters_and_pages()
+    test_import_result_files()
+    print("🎉 All history store tests passed")
+
+if __name__ == "__main__":
+    main()
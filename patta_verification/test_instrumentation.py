@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for Verification Pipeline Instrumentation
+Checks nested stage timings, rolling percentiles and sampled profiling
+"""
+
+import os
+import sys
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+import instrumentation
+from instrumentation import MetricsRegistry, StageTimings, percentile, sampled_profile, timed
+
+@timed('qr_code')
+def _detect_qr_code():
+    return sum(range(10000))
+
+def test_nested_stages():
+    """Sub-checks run inside a step are recorded as step.sub_check"""
+    registry = MetricsRegistry()
+    timings = StageTimings(registry)
+
+    with timings.activate():
+        with timings.stage('authentication'):
+            _detect_qr_code()
+            _detect_qr_code()
+
+    # Outside an active verification the decorator is a no-op
+    _detect_qr_code()
+
+    summary = timings.finish()
+    assert list(summary['stages']) == ['authentication', 'authentication.qr_code']
+    assert summary['stages']['authentication.qr_code']['calls'] == 2
+    assert summary['total']['wall_seconds'] >= summary['stages']['authentication']['wall_seconds']
+
+    snapshot = registry.snapshot()['stages']
+    assert snapshot['authentication.qr_code']['count'] == 2
+    assert snapshot['total']['count'] == 1
+    print("✅ Nested stage timings")
+
+def test_percentiles():
+    """Nearest-rank percentiles over the rolling window"""
+    values = sorted(float(v) for v in range(1, 101))
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) == 0.0
+
+    registry = MetricsRegistry(window=10)
+    for v in range(100):
+        registry.record('ocr_extraction', float(v), 0.0)
+    stage = registry.snapshot()['stages']['ocr_extraction']
+    assert stage['count'] == 100 and stage['window'] == 10
+    assert stage['wall_seconds']['p50'] == 94.0
+    print("✅ Rolling percentiles")
+
+def test_sampled_profile():
+    """Sampled runs dump a profile; unsampled runs leave the report empty"""
+    profile_dir = instrumentation.PROFILE_DIR
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        instrumentation.PROFILE_DIR = tmp_dir
+        try:
+            with sampled_profile(sample_rate=0) as report:
+                _detect_qr_code()
+            assert report == {}
+
+            with sampled_profile(sample_rate=1) as report:
+                _detect_qr_code()
+            assert os.path.exists(report['path'])
+            assert report['top_functions']
+        finally:
+            instrumentation.PROFILE_DIR = profile_dir
+        print("✅ Sampled profiling")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Instrumentation Tests")
+    test_nested_stages()
+    test_percentiles()
+    test_sampled_profile()
+    print("🎉 All instrumentation tests passed")
+
+if __name__ == "__main__":
+    main()
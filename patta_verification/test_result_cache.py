@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the Verification Result Cache
+Checks hits, misses, LRU eviction and invalidation against a temporary database
+"""
+
+import os
+import sys
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from result_cache import VerificationResultCache
+
+def _make_cache(tmp_dir, **kwargs):
+    return VerificationResultCache(db_path=os.path.join(tmp_dir, 'cache.db'), **kwargs)
+
+def test_hit_and_miss():
+    """A stored result is returned for the same key only"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir)
+        result = {'success': True, 'final_decision': {'status': 'ACCEPTED', 'confidence': 85}}
+
+        assert cache.get('abc', 'Tamil Nadu', 'full', '1.1') is None
+        assert cache.put('abc', 'Tamil Nadu', 'full', '1.1', result)
+
+        cached = cache.get('abc', 'Tamil Nadu', 'full', '1.1')
+        assert cached['final_decision'] == result['final_decision']
+        assert cached['cache']['hit'] is True
+
+        # Any change of state, type or pipeline version is a miss
+        assert cache.get('abc', 'Karnataka', 'full', '1.1') is None
+        assert cache.get('abc', 'Tamil Nadu', 'quick', '1.1') is None
+        assert cache.get('abc', 'Tamil Nadu', 'full', '1.2') is None
+
+        assert cache.stats()['total_hits'] == 1
+        print("✅ Cache hit/miss")
+
+def test_lru_eviction():
+    """The least recently used entry is evicted first"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir, max_entries=2)
+        cache.put('a', 'Tamil Nadu', 'full', '1.1', {'success': True})
+        cache.put('b', 'Tamil Nadu', 'full', '1.1', {'success': True})
+        cache.get('a', 'Tamil Nadu', 'full', '1.1')
+        cache.put('c', 'Tamil Nadu', 'full', '1.1', {'success': True})
+
+        assert cache.get('a', 'Tamil Nadu', 'full', '1.1') is not None
+        assert cache.get('b', 'Tamil Nadu', 'full', '1.1') is None
+        assert cache.get('c', 'Tamil Nadu', 'full', '1.1') is not None
+        print("✅ Cache LRU eviction")
+
+def test_invalidate():
+    """Invalidation removes matching entries only"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = _make_cache(tmp_dir)
+        cache.put('a', 'Tamil Nadu', 'full', '1.1', {'success': True})
+        cache.put('a', 'Karnataka', 'full', '1.1', {'success': True})
+        cache.put('b', 'Tamil Nadu', 'full', '1.1', {'success': True})
+
+        assert cache.invalidate(file_hash='a', state='Tamil Nadu') == 1
+        assert cache.get('a', 'Karnataka', 'full', '1.1') is not None
+        assert cache.invalidate() == 2
+        assert cache.stats()['entries'] == 0
+        print("✅ Cache invalidation")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Verification Result Cache Tests")
+    test_hit_and_miss()
+    test_lru_eviction()
+    test_invalidate()
+    print("🎉 All cache tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the Verification Job Queue
+Checks status transitions, progress reporting and backpressure with dummy tasks
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+from verification_jobs import VerificationJobQueue, QueueFullError, COMPLETED, FAILED
+
+def _wait_for(queue, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in (COMPLETED, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+def test_job_lifecycle():
+    """A job reports progress and exposes its results once completed"""
+    queue = VerificationJobQueue(max_workers=1, max_pending=2)
+    release = threading.Event()
+
+    def task(progress):
+        progress('ocr_extraction', 0, 2)
+        release.wait(5)
+        progress('final_decision', 1, 2)
+        return {'success': True, 'final_decision': {'status': 'ACCEPTED'}}
+
+    job = queue.submit('job-1', task, metadata={'state': 'Tamil Nadu'})
+    assert job['status'] in ('queued', 'running')
+
+    time.sleep(0.05)
+    running = queue.get('job-1')
+    assert running['status'] == 'running'
+    assert running['progress']['current_step'] == 'ocr_extraction'
+
+    release.set()
+    finished = _wait_for(queue, 'job-1')
+    assert finished['status'] == COMPLETED
+    assert finished['progress']['percent'] == 100
+    assert finished['results']['final_decision']['status'] == 'ACCEPTED'
+    queue.shutdown()
+    print("✅ Job lifecycle and progress")
+
+def test_failed_job():
+    """Exceptions raised by a task mark the job as failed"""
+    queue = VerificationJobQueue(max_workers=1, max_pending=2)
+
+    def task(progress):
+        raise RuntimeError('tesseract missing')
+
+    queue.submit('job-err', task)
+    finished = _wait_for(queue, 'job-err')
+    assert finished['status'] == FAILED
+    assert 'tesseract missing' in finished['error']
+    queue.shutdown()
+    print("✅ Failed job reporting")
+
+def test_backpressure():
+    """Submissions beyond max_pending are refused"""
+    queue = VerificationJobQueue(max_workers=1, max_pending=2)
+    release = threading.Event()
+
+    queue.submit('a', lambda progress: release.wait(5))
+    queue.submit('b', lambda progress: release.wait(5))
+    assert not queue.has_capacity()
+    assert queue.get('b')['queue_position'] == 1
+
+    try:
+        queue.submit('c', lambda progress: None)
+        raise AssertionError('Expected QueueFullError')
+    except QueueFullError as e:
+        assert e.pending == 2
+        assert e.retry_after >= 1
+
+    release.set()
+    _wait_for(queue, 'b')
+    assert queue.has_capacity()
+    queue.shutdown()
+    print("✅ Queue backpressure")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Verification Job Queue Tests")
+    test_job_lifecycle()
+    test_failed_job()
+    test_backpressure()
+    print("🎉 All job queue tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,16 @@ Integrates the comprehensive verification system with the existing web applicati
 from flask import Blueprint, request, jsonify, current_app
 import os
 import json
+import uuid
 from datetime import datetime
 import logging
 from werkzeug.utils import secure_filename
-from patta_verifier import PattaVerifier
+from patta_verifier import PattaVerifier, PIPELINE_VERSION
+from result_cache import VerificationResultCache
+from verification_jobs import get_job_queue, QueueFullError, COMPLETED, FAILED
+from history_store import VerificationHistoryStore, HISTORY_DB_NAME
+from instrumentation import metrics_registry
+from digitization.upload_ingest import ingest_upload, hash_upload, check_declared_size, UploadTooLargeError, MAX_FILE_SIZE
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +27,27 @@ verification_bp = Blueprint('verification', __name__, url_prefix='/api/verificat
 # Initialize verifier
 verifier = PattaVerifier()
 
+# Results of previously verified documents, keyed by content hash
+result_cache = VerificationResultCache()
+
+# Background verification jobs for asynchronous uploads
+job_queue = get_job_queue()
+
+# Indexed verification summaries, opened when the blueprint is registered on an app
+history_store = None
+
+@verification_bp.record_once
+def init_history_store(setup_state):
+    """Open the history database next to the app's fra_atlas.db and import older result files"""
+    global history_store
+    app = setup_state.app
+    db_path = os.environ.get('FRA_VERIFICATION_HISTORY_DB', os.path.join(app.root_path, HISTORY_DB_NAME))
+    history_store = VerificationHistoryStore(db_path)
+    try:
+        history_store.import_result_files(os.path.join(app.root_path, 'uploads', 'patta_verification'))
+    except Exception as e:
+        logger.warning(f"Could not import existing verification results: {e}")
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg', 'tiff', 'bmp'}
 
@@ -38,8 +65,13 @@ def upload_and_verify():
     - file: Patta document (PDF/image)
     - state: State for portal verification (optional, defaults to Tamil Nadu)
     - verification_type: Type of verification (full, quick, basic)
+    - async: If true, queue the verification and return a verification_id immediately
+      (poll get_verification_status/<verification_id> for progress and results)
     """
     try:
+        # Refuse oversized bodies before they are parsed
+        check_declared_size(request.content_length, MAX_FILE_SIZE)
+        
         # Check if file is present
         if 'file' not in request.files:
             return jsonify({
@@ -66,55 +98,89 @@ def upload_and_verify():
         # Get additional parameters
         state = request.form.get('state', 'Tamil Nadu')
         verification_type = request.form.get('verification_type', 'full')
+        run_async = str(request.form.get('async', request.args.get('async', 'false'))).lower() in ('1', 'true', 'yes')
         
-        # Secure filename and save
+        # Secure filename
         filename = secure_filename(file.filename)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        unique_filename = f"{timestamp}_{filename}"
+        # The random suffix keeps uploads within the same second from sharing files and history rows
+        verification_id = f"{timestamp}_{uuid.uuid4().hex[:8]}"
+        unique_filename = f"{verification_id}_{filename}"
         
         # Create uploads directory if it doesn't exist
         upload_dir = os.path.join(current_app.root_path, 'uploads', 'patta_verification')
         os.makedirs(upload_dir, exist_ok=True)
+        results_file = os.path.join(upload_dir, f"{verification_id}_results.json")
         
-        file_path = os.path.join(upload_dir, unique_filename)
-        file.save(file_path)
-        
-        logger.info(f"File uploaded: {file_path}")
-        
-        # Perform verification based on type
-        if verification_type == 'quick':
-            results = perform_quick_verification(file_path, state)
-        elif verification_type == 'basic':
-            results = perform_basic_verification(file_path, state)
-        else:  # full verification
-            results = verifier.verify_patta_document(file_path, state)
+        if run_async and not job_queue.has_capacity():
+            # The queue is saturated, so only a cache hit can be served: hash the upload without saving it
+            upload = hash_upload(file, MAX_FILE_SIZE)
+        else:
+            # Stream the upload to disk, hashing and measuring it in the same pass
+            upload = ingest_upload(file, upload_dir, unique_filename, MAX_FILE_SIZE)
+        file_path = upload.path
+        file_hash = upload.sha256
+        
+        # Serve re-uploads of an already verified document from the cache
+        results = result_cache.get(file_hash, state, verification_type, PIPELINE_VERSION)
+        
+        if results is not None:
+            upload.remove()
+            results['file_info'] = build_file_info(upload, saved=False)
+            save_results(results, results_file, verification_id)
+            
+            return jsonify({
+                'success': True,
+                'verification_id': verification_id,
+                'verification_results': results,
+                'message': 'Verification completed successfully'
+            })
         
-        # Add file information to results
-        results['file_info'] = {
-            'original_filename': file.filename,
-            'saved_filename': unique_filename,
-            'file_size': os.path.getsize(file_path),
-            'upload_timestamp': datetime.now().isoformat()
-        }
+        # Refuse before anything was written to disk if the queue was already saturated
+        if file_path is None:
+            return queue_full_response(job_queue.stats()['max_pending'])
         
-        # Save verification results
-        results_file = os.path.join(upload_dir, f"{timestamp}_results.json")
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        file_info = build_file_info(upload)
+        logger.info(f"File uploaded: {file_path}")
         
-        # Clean up file if verification failed
-        if not results.get('success', False):
+        if run_async:
             try:
-                os.remove(file_path)
-            except:
-                pass
+                job = job_queue.submit(
+                    verification_id,
+                    lambda progress: verify_and_store(verification_id, file_path, state, verification_type,
+                                                      file_hash, file_info, results_file, progress),
+                    metadata={'filename': file.filename, 'state': state, 'verification_type': verification_type}
+                )
+            except QueueFullError as e:
+                upload.remove()
+                return queue_full_response(e.pending, e.retry_after)
+            
+            return jsonify({
+                'success': True,
+                'verification_id': verification_id,
+                'status': job['status'],
+                'queue_position': job['queue_position'],
+                'status_url': f"{verification_bp.url_prefix}/get_verification_status/{verification_id}",
+                'message': 'Verification queued'
+            }), 202
+        
+        results = verify_and_store(verification_id, file_path, state, verification_type,
+                                   file_hash, file_info, results_file)
         
         return jsonify({
             'success': True,
+            'verification_id': verification_id,
             'verification_results': results,
             'message': 'Verification completed successfully'
         })
         
+    except UploadTooLargeError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'error_code': 'FILE_TOO_LARGE'
+        }), 413
+        
     except Exception as e:
         logger.error(f"Upload and verification error: {e}")
         return jsonify({
@@ -186,7 +252,26 @@ def get_verification_status(verification_id):
         verification_id: Unique identifier for the verification
     """
     try:
-        # Look for results file
+        # Jobs still tracked by the queue report live status and step progress
+        job = job_queue.get(verification_id)
+        if job is not None:
+            response = {
+                'success': True,
+                'verification_id': verification_id,
+                'status': job['status'],
+                'progress': job['progress'],
+                'queue_position': job['queue_position'],
+                'queued_at': job['queued_at'],
+                'started_at': job['started_at'],
+                'finished_at': job['finished_at']
+            }
+            if job['status'] == COMPLETED:
+                response['verification_results'] = job['results']
+            elif job['status'] == FAILED:
+                response['error'] = job['error']
+            return jsonify(response)
+        
+        # Otherwise look for results file
         upload_dir = os.path.join(current_app.root_path, 'uploads', 'patta_verification')
         results_file = os.path.join(upload_dir, f"{verification_id}_results.json")
         
@@ -202,6 +287,8 @@ def get_verification_status(verification_id):
         
         return jsonify({
             'success': True,
+            'verification_id': verification_id,
+            'status': COMPLETED,
             'verification_results': results
         })
         
@@ -217,45 +304,36 @@ def get_verification_status(verification_id):
 def get_verification_history():
     """
     Get verification history for the current session or user
+    
+    Query parameters (all optional):
+    - state: Only verifications for this state
+    - decision: Only verifications with this final decision (ACCEPTED, REJECTED, FLAGGED_FOR_REVIEW)
+    - limit: Page size (default 50, max 200)
+    - offset: Number of verifications to skip
     """
     try:
-        upload_dir = os.path.join(current_app.root_path, 'uploads', 'patta_verification')
-        
-        if not os.path.exists(upload_dir):
+        if history_store is None:
             return jsonify({
                 'success': True,
-                'verifications': []
+                'verifications': [],
+                'total_count': 0
             })
         
-        # Get all result files
-        result_files = [f for f in os.listdir(upload_dir) if f.endswith('_results.json')]
-        
-        verifications = []
-        for result_file in sorted(result_files, reverse=True)[:50]:  # Last 50 verifications
-            try:
-                with open(os.path.join(upload_dir, result_file), 'r') as f:
-                    result = json.load(f)
-                
-                # Extract summary information
-                summary = {
-                    'verification_id': result_file.replace('_results.json', ''),
-                    'timestamp': result.get('verification_timestamp', ''),
-                    'filename': result.get('file_info', {}).get('original_filename', ''),
-                    'state': result.get('state', ''),
-                    'status': result.get('status', ''),
-                    'final_decision': result.get('final_decision', {}).get('status', ''),
-                    'confidence': result.get('final_decision', {}).get('confidence', 0)
-                }
-                verifications.append(summary)
-                
-            except Exception as e:
-                logger.warning(f"Error reading result file {result_file}: {e}")
-                continue
+        limit = request.args.get('limit', 50, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        verifications, total = history_store.query(
+            state=request.args.get('state'),
+            decision=request.args.get('decision'),
+            limit=limit,
+            offset=offset
+        )
         
         return jsonify({
             'success': True,
             'verifications': verifications,
-            'total_count': len(verifications)
+            'total_count': total,
+            'limit': limit,
+            'offset': offset
         })
         
     except Exception as e:
@@ -288,7 +366,174 @@ def get_supported_states():
             'error_code': 'STATES_ERROR'
         }), 500
 
-def perform_quick_verification(file_path: str, state: str) -> dict:
+@verification_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Get rolling latency percentiles per verification step and sub-check
+    
+    Stage names match the 'timings' block attached to each full verification
+    (e.g. 'authentication.qr_code'); 'total' covers whole verifications.
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'pipeline_version': PIPELINE_VERSION,
+            'metrics': metrics_registry.snapshot(),
+            'queue': job_queue.stats()
+        })
+        
+    except Exception as e:
+        logger.error(f"Metrics error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'error_code': 'METRICS_ERROR'
+        }), 500
+
+@verification_bp.route('/queue/stats', methods=['GET'])
+def get_queue_stats():
+    """
+    Get verification job queue depth and limits
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'queue': job_queue.stats()
+        })
+        
+    except Exception as e:
+        logger.error(f"Queue stats error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'error_code': 'QUEUE_ERROR'
+        }), 500
+
+@verification_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """
+    Get verification result cache statistics
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'cache': result_cache.stats(),
+            'pipeline_version': PIPELINE_VERSION
+        })
+        
+    except Exception as e:
+        logger.error(f"Cache stats error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'error_code': 'CACHE_ERROR'
+        }), 500
+
+@verification_bp.route('/cache/invalidate', methods=['POST'])
+def invalidate_cache():
+    """
+    Invalidate cached verification results
+    
+    Expected JSON data (all optional; an empty body clears the whole cache):
+    - file_hash: SHA-256 of the document
+    - state: State the document was verified for
+    - pipeline_version: Pipeline version the results were produced with
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        removed = result_cache.invalidate(
+            file_hash=data.get('file_hash'),
+            state=data.get('state'),
+            pipeline_version=data.get('pipeline_version')
+        )
+        
+        return jsonify({
+            'success': True,
+            'removed_entries': removed
+        })
+        
+    except Exception as e:
+        logger.error(f"Cache invalidation error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'error_code': 'CACHE_ERROR'
+        }), 500
+
+def build_file_info(upload, saved: bool = True) -> dict:
+    """
+    Describe an ingested upload for the stored results
+    """
+    file_info = upload.to_dict()
+    if not saved:
+        file_info['saved_filename'] = None
+    file_info['upload_timestamp'] = datetime.now().isoformat()
+    return file_info
+
+def save_results(results: dict, results_file: str, verification_id: str) -> None:
+    """
+    Write verification results next to the uploads and record their summary in the history store
+    """
+    with open(results_file, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    
+    if history_store is not None:
+        try:
+            history_store.record(verification_id, results)
+        except Exception as e:
+            logger.warning(f"Could not record verification history for {verification_id}: {e}")
+
+def run_verification(file_path: str, state: str, verification_type: str, progress_callback=None,
+                     file_hash: str = None) -> dict:
+    """
+    Perform verification based on type
+    """
+    if verification_type == 'quick':
+        return perform_quick_verification(file_path, state, progress_callback)
+    elif verification_type == 'basic':
+        return perform_basic_verification(file_path, state, progress_callback)
+    else:  # full verification
+        return verifier.verify_patta_document(file_path, state, progress_callback, file_hash=file_hash)
+
+def verify_and_store(verification_id: str, file_path: str, state: str, verification_type: str,
+                     file_hash: str, file_info: dict, results_file: str, progress_callback=None) -> dict:
+    """
+    Verify an uploaded document, cache and save the results, and drop the upload if verification failed
+    
+    Used both inside the request (synchronous uploads) and on the job queue workers.
+    """
+    results = run_verification(file_path, state, verification_type, progress_callback, file_hash)
+    
+    if results.get('success', False):
+        result_cache.put(file_hash, state, verification_type, PIPELINE_VERSION, results)
+    results['cache'] = {'hit': False, 'file_hash': file_hash}
+    results['file_info'] = file_info
+    
+    save_results(results, results_file, verification_id)
+    
+    # Clean up file if verification failed
+    if not results.get('success', False):
+        try:
+            os.remove(file_path)
+        except:
+            pass
+    
+    return results
+
+def queue_full_response(pending: int, retry_after: int = 30):
+    """
+    Build the 429 response returned when the verification queue is saturated
+    """
+    response = jsonify({
+        'success': False,
+        'error': f'Verification queue is full ({pending} jobs pending). Please retry later.',
+        'error_code': 'QUEUE_FULL',
+        'retry_after': retry_after
+    })
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
+
+def perform_quick_verification(file_path: str, state: str, progress_callback=None) -> dict:
     """
     Perform quick verification (OCR + basic validation only)
     """
@@ -296,9 +541,13 @@ def perform_quick_verification(file_path: str, state: str) -> dict:
     
     try:
         # Step 1: OCR Extraction
+        if progress_callback:
+            progress_callback('ocr_extraction', 0, 2)
         ocr_result = verifier.extract_document_data(file_path)
         
         # Step 2: Basic validation
+        if progress_callback:
+            progress_callback('basic_validation', 1, 2)
         validation_result = {
             'status': 'completed',
             'success': True,
@@ -327,7 +576,7 @@ def perform_quick_verification(file_path: str, state: str) -> dict:
             'verification_type': 'quick'
         }
 
-def perform_basic_verification(file_path: str, state: str) -> dict:
+def perform_basic_verification(file_path: str, state: str, progress_callback=None) -> dict:
     """
     Perform basic verification (OCR + Portal verification)
     """
@@ -335,12 +584,18 @@ def perform_basic_verification(file_path: str, state: str) -> dict:
     
     try:
         # Step 1: OCR Extraction
+        if progress_callback:
+            progress_callback('ocr_extraction', 0, 3)
         ocr_result = verifier.extract_document_data(file_path)
         
         # Step 2: Portal Verification
+        if progress_callback:
+            progress_callback('portal_verification', 1, 3)
         portal_result = verifier.verify_with_portal(ocr_result, state)
         
         # Step 3: Basic decision
+        if progress_callback:
+            progress_callback('basic_decision', 2, 3)
         basic_decision = {
             'status': 'PENDING',
             'confidence': 0,
@@ -390,7 +645,7 @@ def perform_basic_verification(file_path: str, state: str) -> dict:
 def too_large(e):
     return jsonify({
         'success': False,
-        'error': 'File too large. Maximum size is 10MB.',
+        'error': f'File too large. Maximum size is {MAX_FILE_SIZE // (1024 * 1024)}MB.',
         'error_code': 'FILE_TOO_LARGE'
     }), 413
 
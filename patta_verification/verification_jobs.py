@@ -0,0 +1,209 @@
+"""
+Asynchronous Verification Job Queue
+Runs Patta verifications in a bounded local worker pool and tracks per-job status and step progress
+"""
+
+import os
+import time
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional, Any
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Queue configuration (overridable through the environment)
+DEFAULT_WORKERS = int(os.environ.get('FRA_VERIFICATION_WORKERS', 2))
+DEFAULT_MAX_PENDING = int(os.environ.get('FRA_VERIFICATION_MAX_PENDING', 20))
+DEFAULT_JOB_TTL = float(os.environ.get('FRA_VERIFICATION_JOB_TTL', 3600))
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+# Progress callback: (current step, steps completed, total steps)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds its maximum number of pending jobs"""
+
+    def __init__(self, pending: int, retry_after: int):
+        super().__init__(f"Verification queue is full ({pending} jobs pending)")
+        self.pending = pending
+        self.retry_after = retry_after
+
+
+class VerificationJobQueue:
+    """
+    Bounded in-process queue for verification jobs
+
+    Jobs run on a small thread pool (the heavy OCR work is already farmed out to
+    the shared OCR process pool), so the web tier only ever enqueues and polls.
+    Admission is capped at max_pending queued + running jobs; beyond that submit
+    raises QueueFullError instead of letting requests pile up behind OCR.
+    Finished jobs are kept for job_ttl seconds so clients can collect results.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 job_ttl: Optional[float] = None):
+        self.max_workers = max(1, max_workers or DEFAULT_WORKERS)
+        self.max_pending = max(1, max_pending or DEFAULT_MAX_PENDING)
+        self.job_ttl = job_ttl or DEFAULT_JOB_TTL
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='patta-verification')
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._durations = []
+
+    def _pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job['status'] in (QUEUED, RUNNING))
+
+    def _retry_after(self, pending: int) -> int:
+        """Rough seconds until a slot frees up, from recent job durations"""
+        average = sum(self._durations) / len(self._durations) if self._durations else 30.0
+        return max(1, int(average * pending / self.max_workers))
+
+    def has_capacity(self) -> bool:
+        """Return True if a new job would currently be admitted"""
+        with self._lock:
+            return self._pending_count() < self.max_pending
+
+    def submit(self, job_id: str, task: Callable[[ProgressCallback], Dict[str, Any]],
+               metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Enqueue a verification task
+
+        Args:
+            job_id: Unique identifier returned to the client
+            task: Callable receiving a progress callback and returning the verification results
+            metadata: Extra fields reported with the job status (filename, state, ...)
+
+        Returns:
+            Snapshot of the queued job
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running
+        """
+        with self._lock:
+            self._prune()
+            pending = self._pending_count()
+            if pending >= self.max_pending:
+                raise QueueFullError(pending, self._retry_after(pending))
+
+            job = {
+                'job_id': job_id,
+                'status': QUEUED,
+                'metadata': metadata or {},
+                'progress': {'current_step': None, 'steps_completed': 0, 'total_steps': None, 'percent': 0},
+                'queued_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'results': None,
+                'error': None,
+                '_finished': None
+            }
+            self._jobs[job_id] = job
+
+        self._executor.submit(self._run, job_id, task)
+        logger.info(f"Queued verification job {job_id} ({pending + 1} pending)")
+        return self.get(job_id)
+
+    def _run(self, job_id: str, task: Callable[[ProgressCallback], Dict[str, Any]]) -> None:
+        """Worker body: run the task and record its outcome"""
+        with self._lock:
+            job = self._jobs[job_id]
+            job['status'] = RUNNING
+            job['started_at'] = datetime.now().isoformat()
+        start = time.perf_counter()
+
+        def progress(step: str, completed: int, total: int) -> None:
+            with self._lock:
+                job['progress'] = {
+                    'current_step': step,
+                    'steps_completed': completed,
+                    'total_steps': total,
+                    'percent': int(100 * completed / total) if total else 0
+                }
+
+        try:
+            results = task(progress)
+            with self._lock:
+                job['results'] = results
+                job['status'] = COMPLETED
+                job['progress']['current_step'] = None
+                job['progress']['percent'] = 100
+        except Exception as e:
+            logger.error(f"Verification job {job_id} failed: {e}")
+            with self._lock:
+                job['error'] = str(e)
+                job['status'] = FAILED
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                job['finished_at'] = datetime.now().isoformat()
+                job['duration_seconds'] = round(duration, 2)
+                job['_finished'] = time.time()
+                self._durations = (self._durations + [duration])[-20:]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of a job's status, or None if unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {k: v for k, v in job.items() if not k.startswith('_')}
+            snapshot['progress'] = dict(job['progress'])
+            if job['status'] == QUEUED:
+                queued = [j['job_id'] for j in self._jobs.values() if j['status'] == QUEUED]
+                snapshot['queue_position'] = queued.index(job_id) + 1
+            else:
+                snapshot['queue_position'] = None
+            return snapshot
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than job_ttl (caller holds the lock)"""
+        cutoff = time.time() - self.job_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['_finished'] is not None and job['_finished'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and limits"""
+        with self._lock:
+            self._prune()
+            counts = {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+            return {
+                'jobs': counts,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'average_job_seconds': round(sum(self._durations) / len(self._durations), 2)
+                                       if self._durations else None
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting jobs and release the worker threads"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_shared_queue: Optional[VerificationJobQueue] = None
+_shared_lock = threading.Lock()
+
+
+def get_job_queue() -> VerificationJobQueue:
+    """Return the process-wide verification job queue"""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            _shared_queue = VerificationJobQueue()
+            atexit.register(_shared_queue.shutdown)
+        return _shared_queue
@@ -4,13 +4,15 @@ Production Tamil+English Patta Document Extractor
 Integrates expert parsing with OCR processing
 """
 
-import re, os, json
-import pdfplumber
+import re, os, json, time
 from pdf2image import convert_from_path
 import pytesseract
 import logging
+from digitization.ocr_pool import get_ocr_executor
+from digitization.extraction_engine import acquire_text
+from digitization.page_images import render_pages
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 # Configure Tesseract path
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
@@ -22,7 +24,9 @@ logger = logging.getLogger(__name__)
 class ProductionPattaExtractor:
     """Production-ready Tamil+English Patta Document Extractor"""
     
-    def __init__(self):
+    def __init__(self, force_ocr: bool = False):
+        # OCR every page even when the PDF text layer passes the quality check
+        self.force_ocr = force_ocr
         self.field_patterns = {
             'owner_name': [
                 # Direct Tamil Nadu patterns
@@ -138,51 +142,51 @@ class ProductionPattaExtractor:
     
     def ocr_pdf(self, pdf_path: str) -> str:
         """Enhanced OCR with optimized settings for Tamil+English"""
+        return "\n".join(self.ocr_pdf_pages(pdf_path).values())
+    
+    def ocr_pdf_pages(self, pdf_path: str, page_indexes: Optional[List[int]] = None) -> Dict[int, str]:
+        """OCR the given pages (0-based, all pages when None) and return their text by page index"""
         try:
-            # Convert PDF to images with higher DPI for better OCR
-            images = convert_from_path(pdf_path, dpi=300)
-            all_text = []
+            # Convert PDF to images with higher DPI for better OCR, rendering only the pages needed
+            if page_indexes is None:
+                images = convert_from_path(pdf_path, dpi=300)
+                page_indexes = list(range(len(images)))
+            else:
+                images = render_pages(pdf_path, page_indexes, dpi=300)
+            logger.info(f"Processing {len(images)} page(s) with OCR...")
             
-            for i, img in enumerate(images):
-                logger.info(f"Processing page {i+1} with OCR...")
-                # Use Tamil+English with optimized config
-                txt = pytesseract.image_to_string(
-                    img, 
-                    lang="tam+eng",
-                    config='--psm 6'
-                )
-                all_text.append(txt)
+            # Use Tamil+English with optimized config, pages in parallel
+            all_text = get_ocr_executor().ocr_pages(
+                images,
+                lang="tam+eng",
+                config='--psm 6'
+            )
             
-            return "\n".join(all_text)
+            return dict(zip(page_indexes, all_text))
             
         except Exception as e:
             logger.error(f"OCR failed: {e}")
-            return ""
+            return {}
+    
+    def extract_text(self, pdf_path: str) -> Tuple[str, List[Dict]]:
+        """
+        Build the document text page by page, OCRing only pages whose text layer fails the quality check
+        
+        Returns:
+            (text, page_decisions) where each decision records the page's text layer
+            metrics and whether its text came from the text layer or OCR
+        """
+        document = acquire_text(pdf_path, lang="tam+eng", config='--psm 6', force_ocr=self.force_ocr)
+        return document.text, document.page_sources
     
     def extract_patta_document(self, pdf_path: str) -> Dict:
         """Main extraction method with enhanced processing"""
         logger.info(f"Starting production extraction from PDF: {pdf_path}")
         
-        # Step 1: Try direct text extraction
-        text = ""
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for p in pdf.pages:
-                    t = p.extract_text() or ""
-                    text += t + "\n"
-            logger.info("Extracted text from PDF pages")
-        except Exception as e:
-            logger.error(f"PDF text extraction failed: {e}")
-            text = ""
-        
-        # Step 2: Always use OCR for Tamil documents (better accuracy)
-        logger.info("Using OCR for Tamil document processing...")
-        ocr_text = self.ocr_pdf(pdf_path)
-        if ocr_text and len(ocr_text.strip()) > len(text.strip()):
-            text = ocr_text
-            logger.info("OCR text used (better than PDF text)")
-        else:
-            logger.info("PDF text used (OCR not better)")
+        # Steps 1-2: Use the PDF text layer where it is clean, OCR the remaining pages
+        start = time.perf_counter()
+        text, page_sources = self.extract_text(pdf_path)
+        text_seconds = time.perf_counter() - start
         
         # Step 3: Extract fields using expert patterns
         result = {
@@ -213,7 +217,9 @@ class ProductionPattaExtractor:
             "extraction_timestamp": datetime.now().isoformat(),
             "text_length": len(text),
             "success_rate": success_rate,
-            "ocr_used": len(text.strip()) < 100
+            "ocr_used": any(page['source'] == 'ocr' for page in page_sources),
+            "page_sources": page_sources,
+            "text_extraction_seconds": round(text_seconds, 4)
         }
 
 def extract_patta_data(pdf_path: str) -> Dict:
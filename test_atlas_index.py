@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the FRA Atlas rollup index
+Checks that drill-down totals match a full walk and stay current as pattas are added
+"""
+
+from webgis.atlas_index import AtlasRollupIndex
+
+def make_atlas():
+    """Two states, one with two villages in the same block"""
+    def village(*pattas):
+        return {'patta_holders': list(pattas), 'forest_cover': 50.0, 'water_bodies': 1,
+                'agricultural_land': 20.0, 'coordinates': [75.0, 21.0]}
+    return {'states': {
+        'Madhya Pradesh': {'districts': {'Khargone': {'blocks': {'Khargone': {'villages': {
+            'Khargone': village({'id': 'A', 'status': 'Approved', 'area_hectares': 2.5}),
+            'Bhikangaon': village({'id': 'B', 'status': 'Pending', 'area_hectares': 1.0},
+                                  {'id': 'C', 'status': 'Rejected', 'area_hectares': 0.5})
+        }}}}}},
+        'Odisha': {'districts': {'Koraput': {'blocks': {'Koraput': {'villages': {
+            'Koraput': village({'id': 'D', 'status': 'Approved', 'area_hectares': 5.2})
+        }}}}}}
+    }}
+
+def test_rollups():
+    """Every level reports counts, areas and status histograms of the pattas below it"""
+    index = AtlasRollupIndex(make_atlas())
+    assert index.rollup()['total_pattas'] == 4
+    assert index.rollup()['status_counts'] == {'Approved': 2, 'Pending': 1, 'Rejected': 1}
+    state = index.rollup('Madhya Pradesh')
+    assert state['total_pattas'] == 3 and state['total_area_hectares'] == 4.0 and state['children_count'] == 1
+    assert [name for name, _ in index.children('Madhya Pradesh', 'Khargone', 'Khargone')] == ['Khargone', 'Bhikangaon']
+    assert index.rollup('Kerala') is None
+    print("✅ Rollups match the atlas")
+
+def test_add_patta():
+    """Adding a patta updates its village and every ancestor, creating missing levels"""
+    atlas = make_atlas()
+    index = AtlasRollupIndex(atlas)
+    index.add_patta('Odisha', 'Rayagada', 'Gunupur', 'Gunupur', {'id': 'E', 'status': 'Pending', 'area_hectares': 1.5})
+    assert index.rollup()['total_pattas'] == 5
+    assert index.rollup('Odisha') == {'total_pattas': 2, 'total_area_hectares': 6.7,
+                                      'status_counts': {'Approved': 1, 'Pending': 1}, 'children_count': 2}
+    assert atlas['states']['Odisha']['districts']['Rayagada']['blocks']['Gunupur']['villages']['Gunupur']['patta_holders'][0]['id'] == 'E'
+    rebuilt = AtlasRollupIndex(atlas)
+    assert rebuilt.rollup('Odisha') == index.rollup('Odisha')
+    print("✅ Incremental updates match a rebuild")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Atlas Index Tests")
+    test_rollups()
+    test_add_patta()
+    print("🎉 All atlas index tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for the FRA Atlas search index
+Checks tokenized matching, Indic-script normalization, ranking, pagination and incremental updates
+"""
+
+from webgis.atlas_search import AtlasSearchIndex, normalize_text, tokenize
+
+def make_index():
+    """A few patta holders across two villages"""
+    index = AtlasSearchIndex()
+    index.add_patta('Madhya Pradesh', 'Khargone', 'Khargone', 'Khargone',
+                    {'id': 'A', 'name': 'Ram Singh', 'tribal_group': 'Bhil', 'claim_type': 'IFR', 'status': 'Approved'})
+    index.add_patta('Madhya Pradesh', 'Khargone', 'Khargone', 'Bhikangaon',
+                    {'id': 'B', 'name': 'Sriram Bhilala', 'tribal_group': 'Bhilala', 'claim_type': 'CR', 'status': 'Pending'})
+    index.add_patta('Odisha', 'Koraput', 'Koraput', 'Koraput',
+                    {'id': 'C', 'name': 'Sita Munda', 'tribal_group': 'Munda', 'claim_type': 'IFR', 'status': 'Pending'})
+    return index
+
+def test_normalization():
+    """Case, accents, nukta, zero-width joiners and native digits are folded"""
+    assert normalize_text('MUṆḌA') == 'munda'
+    assert normalize_text('ड़') == normalize_text('ड')
+    assert normalize_text('क्‍ष') == normalize_text('क्ष')
+    assert normalize_text('१२३') == '123'
+    assert tokenize('राम सिंह') == ['राम', 'सिंह']
+    print("✅ Text normalization works")
+
+def test_ranking_and_filters():
+    """Exact matches outrank prefix and infix ones; filters narrow results"""
+    index = make_index()
+    ids = [r['patta_id'] for r in index.search('ram')['results']]
+    assert ids == ['A', 'B'], ids
+    # A name prefix (Bhilala) outweighs an exact tribal group (Bhil)
+    assert [r['patta_id'] for r in index.search('bhil')['results']] == ['B', 'A']
+    assert [r['patta_id'] for r in index.search('bhil', fields=['patta_holder'])['results']] == ['B']
+    assert [r['patta_id'] for r in index.search('', status='pending', claim_type='ifr')['results']] == ['C']
+    assert index.search('ram singh')['total'] == 1
+    assert index.search('xyz')['total'] == 0
+    print("✅ Ranking and filters work")
+
+def test_pagination_and_updates():
+    """Pages slice the ranked list; records can be added, replaced and removed"""
+    index = make_index()
+    first = index.search('', per_page=2)
+    second = index.search('', page=2, per_page=2)
+    assert first['total'] == 3 and first['has_more'] and not second['has_more']
+    assert [r['patta_id'] for r in first['results'] + second['results']] == ['A', 'B', 'C']
+    index.add_patta('Odisha', 'Koraput', 'Koraput', 'Koraput',
+                    {'id': 'C', 'name': 'Sita Majhi', 'tribal_group': 'Kondh', 'claim_type': 'IFR', 'status': 'Approved'})
+    assert index.search('munda')['total'] == 0 and index.search('kondh')['total'] == 1
+    assert index.remove('C') and not index.remove('C')
+    assert index.search('sita')['total'] == 0 and len(index) == 2
+    print("✅ Pagination and incremental updates work")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Atlas Search Tests")
+    test_normalization()
+    test_ranking_and_filters()
+    test_pagination_and_updates()
+    print("🎉 All atlas search tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the FRA Atlas SQLite store
+Checks seeding, drill-down reads, bounding-box queries and the change feed that keeps in-process indexes current
+"""
+
+import os
+import tempfile
+
+from webgis.atlas_store import AtlasStore, AtlasChangeFollower
+from webgis.atlas_index import AtlasRollupIndex
+from webgis.atlas_search import AtlasSearchIndex
+
+ATLAS = {'states': {'Odisha': {'districts': {'Koraput': {'blocks': {'Koraput': {'villages': {'Koraput': {
+    'patta_holders': [{'id': 'FRA003', 'name': 'Ganga Ram', 'tribal_group': 'Gond', 'claim_type': 'CFR',
+                       'area_hectares': 5.2, 'status': 'Verified', 'coordinates': [82.72, 18.81],
+                       'socio_economic': {'livelihood': 'Forest produce'}}],
+    'forest_cover': 72.1, 'water_bodies': 2, 'agricultural_land': 15.0, 'coordinates': [82.71, 18.81]
+}}}}}}}}}
+FEATURES = {'features': [{'properties': {'village': 'Mandla', 'patta_holder': 'Sita Devi', 'latitude': 22.6,
+                                         'longitude': 80.37, 'area_hectares': 3.2, 'claim_status': 'Verified',
+                                         'file_id': 'FRA12345678', 'file_name': 'mandla.pdf'}}]}
+BOUNDARIES = {'states': {'features': [{'properties': {'name': 'Odisha'},
+                                       'geometry': {'type': 'Polygon', 'coordinates': [[[81, 17], [87, 17], [87, 22], [81, 17]]]}}]}}
+CLAIMS = [{'id': 'OD005678', 'applicant_name': 'Sita Devi Santhal', 'village': 'Mayurbhanj', 'district': 'Mayurbhanj',
+           'state': 'Odisha', 'claim_type': 'CFR', 'area_hectares': 15.0, 'status': 'Pending',
+           'coordinates': [21.927, 86.747], 'verified_by': None, 'document': None}]
+
+def make_store(directory):
+    store = AtlasStore(os.path.join(directory, 'atlas.db'))
+    assert store.seed(ATLAS, FEATURES, BOUNDARIES, CLAIMS)
+    assert not store.seed(ATLAS, FEATURES, BOUNDARIES, CLAIMS)
+    return store
+
+def test_round_trip():
+    """Seeded data reads back in the shape the app served from its literals"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        village = store.village('Odisha', 'Koraput', 'Koraput', 'Koraput')
+        assert village['patta_holders'] == ATLAS['states']['Odisha']['districts']['Koraput']['blocks']['Koraput']['villages']['Koraput']['patta_holders']
+        assert village['forest_cover'] == 72.1 and store.village('Odisha', 'Koraput', 'Koraput', 'Nope') is None
+        feature = store.features()[0]
+        assert feature['properties'] == FEATURES['features'][0]['properties']
+        assert feature['geometry']['coordinates'] == [80.37, 22.6]
+        assert store.claims() == CLAIMS
+        assert store.boundaries('states')['features'][0]['properties'] == {'name': 'Odisha'}
+        assert store.boundaries('rivers') is None
+        print("✅ Seeded data round-trips")
+
+def test_bbox_queries():
+    """Points and boundaries are filtered by bounding box"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        store.add_feature({'village': 'Far', 'patta_holder': 'X', 'latitude': 10.0, 'longitude': 70.0, 'area_hectares': 1.0})
+        assert [f['properties']['village'] for f in store.features(bbox=(80, 22, 81, 23))] == ['Mandla']
+        assert store.feature_count() == 2
+        assert len(store.boundaries('states', bbox=(86, 20, 88, 21))['features']) == 1
+        assert len(store.boundaries('states', bbox=(70, 10, 71, 11))['features']) == 0
+        print("✅ Bounding-box queries work")
+
+def test_zoom_clusters():
+    """Low zoom returns grid clusters; high zoom returns capped points"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        for i in range(5):
+            store.add_feature({'village': f'V{i}', 'patta_holder': 'X', 'latitude': 22.6 + i * 0.001,
+                               'longitude': 80.37, 'area_hectares': 1.0, 'claim_status': 'Pending'})
+        clusters = store.feature_collection(zoom=5)
+        assert clusters['metadata']['clustered'] and len(clusters['features']) == 1
+        assert clusters['features'][0]['properties']['point_count'] == 6
+        assert clusters['features'][0]['properties']['status_counts'] == {'Pending': 5, 'Verified': 1}
+        points = store.feature_collection(bbox=(80, 22, 81, 23), zoom=14, status='pending', limit=3)
+        assert len(points['features']) == 3 and points['metadata']['truncated']
+        assert points['metadata']['total_records'] == 5
+        print("✅ Zoom-aware clustering works")
+
+def test_change_feed():
+    """Indexes loaded through a follower pick up writes made through another store handle"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory)
+        rollups, search = AtlasRollupIndex(), AtlasSearchIndex()
+        follower = AtlasChangeFollower(store, [rollups, search])
+        assert follower.refresh() == 1 and rollups.rollup()['total_pattas'] == 1
+
+        other = AtlasStore(store.db_path)
+        other.add_patta('Odisha', 'Rayagada', 'Gunupur', 'Gunupur',
+                        {'id': 'N1', 'name': 'Ramu Naik', 'status': 'Pending', 'area_hectares': 1.5})
+        other.remove_patta('FRA003')
+        assert follower.refresh() == 2
+        assert rollups.rollup() == {'total_pattas': 1, 'total_area_hectares': 1.5,
+                                    'status_counts': {'Pending': 1}, 'children_count': 1}
+        assert search.search('ramu')['total'] == 1 and search.search('ganga')['total'] == 0
+        assert follower.refresh() == 0
+        print("✅ Change feed keeps indexes current")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Atlas Store Tests")
+    test_round_trip()
+    test_bbox_queries()
+    test_zoom_clusters()
+    test_change_feed()
+    print("🎉 All atlas store tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch extraction endpoint
+Checks NDJSON streaming, the sorted JSON response, rejected files and batch directory cleanup, using a stub extractor
+"""
+
+import io
+import os
+import json
+import time
+import shutil
+import tempfile
+
+from flask import Flask
+
+from digitization.batch_extract import BatchExtractor
+from webgis.api import patta_api
+
+class StubExtractor:
+    """Slow documents finish last; documents starting with b'%PDF bad' fail"""
+
+    def __call__(self, path):
+        with open(path, 'rb') as f:
+            content = f.read()
+        if content.startswith(b'%PDF slow'):
+            time.sleep(0.2)
+        if content.startswith(b'%PDF bad'):
+            return {'error': 'unreadable scan'}
+        return {'name': os.path.basename(path), 'village': 'Mandla', 'extraction_summary': {'fields_found': 2}}
+
+def make_client():
+    app = Flask(__name__)
+    app.register_blueprint(patta_api.patta_bp)
+    return app.test_client()
+
+def batch(*documents):
+    """Multipart form with one 'files' entry per (filename, content)"""
+    return {'files': [(io.BytesIO(content), filename) for filename, content in documents]}
+
+DOCUMENTS = [('slow.pdf', b'%PDF slow'), ('notes.txt', b'not a pdf'), ('quick.pdf', b'%PDF quick'),
+             ('huge.pdf', b'%PDF ' + b'x' * 64), ('broken.pdf', b'%PDF bad')]
+
+class stubbed_api:
+    """Point the blueprint at a stub extractor on its own 3-worker pool, a scratch upload folder and a small size limit"""
+
+    def __enter__(self):
+        self.directory = tempfile.mkdtemp()
+        self.extractor = BatchExtractor(max_workers=3)
+        self.saved = (patta_api.extract_patta_data, patta_api.PATTA_EXTRACTOR_AVAILABLE, patta_api.get_batch_extractor,
+                      patta_api.UPLOAD_FOLDER, patta_api.MAX_FILE_SIZE)
+        patta_api.extract_patta_data = StubExtractor()
+        patta_api.PATTA_EXTRACTOR_AVAILABLE = True
+        patta_api.get_batch_extractor = lambda: self.extractor
+        patta_api.UPLOAD_FOLDER = os.path.join(self.directory, 'uploads')
+        patta_api.MAX_FILE_SIZE = 32
+        return make_client()
+
+    def __exit__(self, *exc):
+        (patta_api.extract_patta_data, patta_api.PATTA_EXTRACTOR_AVAILABLE, patta_api.get_batch_extractor,
+         patta_api.UPLOAD_FOLDER, patta_api.MAX_FILE_SIZE) = self.saved
+        self.extractor.shutdown()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+def batch_dirs():
+    return [name for name in os.listdir(patta_api.UPLOAD_FOLDER) if name.startswith('batch_')]
+
+def test_sorted_response():
+    """Without streaming, successes and failures come back sorted by upload index"""
+    with stubbed_api() as client:
+        response = client.post('/api/patta/batch-extract', data=batch(*DOCUMENTS), content_type='multipart/form-data')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [r['index'] for r in data['results']] == [0, 2]
+        assert [r['filename'] for r in data['results']] == ['slow.pdf', 'quick.pdf']
+        assert data['results'][0]['extracted_data']['village'] == 'Mandla'
+        assert [(e['index'], e['file']) for e in data['errors']] == [(1, 'notes.txt'), (3, 'huge.pdf'), (4, 'broken.pdf')]
+        assert data['summary'] == {'total_files': 5, 'successful_extractions': 2, 'failed_extractions': 3}
+        assert batch_dirs() == []
+        print("✅ Batch results are sorted by upload index")
+
+def test_rejected_files():
+    """Wrong file types and oversized files are reported with their index and never extracted"""
+    with stubbed_api() as client:
+        response = client.post('/api/patta/batch-extract', data=batch(*DOCUMENTS), content_type='multipart/form-data')
+        errors = {e['index']: e for e in response.get_json()['errors']}
+        assert errors[1]['error'] == 'Invalid file type'
+        assert errors[3]['file'] == 'huge.pdf' and 'seconds' not in errors[3]
+        assert errors[4]['error'] == 'unreadable scan' and 'seconds' in errors[4]
+        print("✅ Rejected files are reported with their index")
+
+def test_ndjson_stream():
+    """Streamed batches send one line per file, in completion order, then a summary line"""
+    for query, headers in (('?stream=true', {}), ('', {'Accept': 'application/x-ndjson'})):
+        with stubbed_api() as client:
+            response = client.post(f'/api/patta/batch-extract{query}', data=batch(*DOCUMENTS),
+                                   content_type='multipart/form-data', headers=headers)
+            assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+            lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+            response.close()
+            records, summary = lines[:-1], lines[-1]
+            # Rejected uploads first, then extractions as they complete (the slow one last)
+            assert [r['index'] for r in records[:2]] == [1, 3]
+            assert sorted(r['index'] for r in records) == [0, 1, 2, 3, 4] and records[-1]['index'] == 0
+            assert [r['success'] for r in records if r['index'] in (0, 2)] == [True, True]
+            assert summary == {'summary': {'total_files': 5, 'successful_extractions': 2, 'failed_extractions': 3}}
+            assert batch_dirs() == []
+    print("✅ NDJSON streams one line per file plus a summary")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Batch Extract Tests")
+    test_sorted_response()
+    test_rejected_files()
+    test_ndjson_stream()
+    print("🎉 All batch extract tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for precomputed boundary payloads
+Checks per-zoom simplification, coordinate quantization, level selection, compression and rebuilds on boundary edits
+"""
+
+import os
+import gzip
+import json
+import math
+import tempfile
+
+from webgis.atlas_store import AtlasStore
+from webgis.boundary_payloads import BoundaryPayloadCache, FULL_LEVEL, simplify_geometry, zoom_tolerance
+
+# A finely sampled circle (~0.5 degree radius) so coarse levels have points to drop
+RING = [[round(82.0 + 0.5 * math.cos(i * math.pi / 500), 6), round(19.0 + 0.5 * math.sin(i * math.pi / 500), 6)]
+        for i in range(1000)]
+RING.append(RING[0])
+BOUNDARIES = {'districts': {'features': [{'properties': {'name': 'Koraput'},
+                                          'geometry': {'type': 'Polygon', 'coordinates': [RING]}}]}}
+
+def make_cache(directory):
+    store = AtlasStore(os.path.join(directory, 'atlas.db'))
+    store.seed({'states': {}}, {'features': []}, BOUNDARIES, [])
+    return store, BoundaryPayloadCache(store)
+
+def ring_of(payload):
+    return json.loads(payload.encodings['identity'])['features'][0]['geometry']['coordinates'][0]
+
+def test_levels():
+    """Coarser zooms carry fewer, shorter coordinates; full resolution keeps every point"""
+    with tempfile.TemporaryDirectory() as directory:
+        _, cache = make_cache(directory)
+        coarse, fine, full = cache.get('districts', zoom=4), cache.get('districts', zoom=12), cache.get('districts')
+        assert full.level == FULL_LEVEL and ring_of(full) == RING
+        assert len(ring_of(coarse)) < len(ring_of(fine)) <= len(RING)
+        assert ring_of(coarse)[0] == ring_of(coarse)[-1] and len(ring_of(coarse)) >= 4
+        assert all(len(repr(value).split('.')[-1]) <= 3 for point in ring_of(coarse) for value in point)
+        assert len(coarse.encodings['identity']) < len(full.encodings['identity'])
+        assert cache.get('rivers') is None
+        print("✅ Per-zoom levels are simplified and quantized")
+
+def test_level_selection():
+    """zoom picks the next level up, tolerance the coarsest level within it"""
+    assert BoundaryPayloadCache.level_for(zoom=5) == '6'
+    assert BoundaryPayloadCache.level_for(zoom=0) == '4'
+    assert BoundaryPayloadCache.level_for(zoom=16) == FULL_LEVEL
+    assert BoundaryPayloadCache.level_for(tolerance=zoom_tolerance(8)) == '8'
+    assert BoundaryPayloadCache.level_for(tolerance=zoom_tolerance(8) * 1.5) == '8'
+    assert BoundaryPayloadCache.level_for(tolerance=0) == FULL_LEVEL
+    assert BoundaryPayloadCache.level_for() == FULL_LEVEL
+    print("✅ Levels are picked from zoom and tolerance")
+
+def test_compression_and_rebuild():
+    """Compressed bodies decode to the JSON body; boundary edits rebuild the payloads"""
+    with tempfile.TemporaryDirectory() as directory:
+        store, cache = make_cache(directory)
+        payload = cache.get('districts', zoom=8)
+        assert gzip.decompress(payload.encodings['gzip']) == payload.encodings['identity']
+        assert payload.pick_encoding(['gzip']) == 'gzip' and payload.pick_encoding([]) == 'identity'
+        assert payload.etag('gzip') != payload.etag()
+        assert cache.get('districts', zoom=8) is payload
+
+        with store._connect() as conn:
+            conn.execute("UPDATE atlas_boundaries SET properties = ? WHERE layer = 'districts'",
+                         (json.dumps({'name': 'Koraput North'}),))
+        rebuilt = cache.get('districts', zoom=8)
+        assert rebuilt.version > payload.version and rebuilt.etag() != payload.etag()
+        assert json.loads(rebuilt.encodings['identity'])['features'][0]['properties'] == {'name': 'Koraput North'}
+        print("✅ Payloads are compressed and rebuilt on change")
+
+def test_rebuild_keeps_serving():
+    """While a rebuild runs, readers past build() still find the previous payloads instead of a partial cache"""
+    with tempfile.TemporaryDirectory() as directory:
+        store, cache = make_cache(directory)
+        old = cache.get('districts', zoom=8)
+        seen = []
+        build_layer = cache._build_layer
+
+        def observing(layer, version, payloads):
+            _, current = cache._cache
+            seen.append(current.get(('districts', '8')))
+            build_layer(layer, version, payloads)
+
+        cache._build_layer = observing
+        with store._connect() as conn:
+            conn.execute("UPDATE atlas_boundaries SET properties = ? WHERE layer = 'districts'",
+                         (json.dumps({'name': 'Koraput South'}),))
+        rebuilt = cache.get('districts', zoom=8)
+        assert seen == [old] and rebuilt is not None and rebuilt.version > old.version
+        print("✅ Rebuilds swap the payloads in at once")
+
+def test_tiny_polygon_survives():
+    """A polygon smaller than the tolerance is kept rather than dropped"""
+    square = {'type': 'Polygon', 'coordinates': [[[0, 0], [0.0001, 0], [0.0001, 0.0001], [0, 0.0001], [0, 0]]]}
+    ring = simplify_geometry(square, zoom_tolerance(2))['coordinates'][0]
+    assert len(ring) >= 4 and ring[0] == ring[-1]
+    print("✅ Tiny polygons survive simplification")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Boundary Payload Tests")
+    test_levels()
+    test_level_selection()
+    test_compression_and_rebuild()
+    test_rebuild_keeps_serving()
+    test_tiny_polygon_survives()
+    print("🎉 All boundary payload tests passed")
+
+if __name__ == "__main__":
+    main()
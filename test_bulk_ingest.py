@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test script for the bulk ingestion CLI
+Checks batch writes with their checkpoint log, skipping processed hashes, resuming and --retry-failed, using a stub extractor
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import threading
+
+from digitization.bulk_ingest import IngestStore, ingest, patta_file_row
+from webgis import atlas_store
+from webgis.atlas_store import AtlasStore
+
+EXTRACTION = {'fields': {'village': 'Mandla', 'owner_name': 'Sita Devi', 'area': '2.5 hectares'},
+              'latitude': 22.6, 'longitude': 80.37, 'decision': None}
+
+class StubExtractor:
+    """Counts calls; documents whose content starts with b'bad' fail"""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, path, state=None, verifier=None, file_hash=None):
+        with self._lock:
+            self.calls.append(os.path.basename(path))
+        with open(path, 'rb') as f:
+            if f.read().startswith(b'bad'):
+                return {'error': 'unreadable scan'}
+        return dict(EXTRACTION)
+
+def make_archive(directory, documents):
+    root = os.path.join(directory, 'archive')
+    os.makedirs(os.path.join(root, 'nested'))
+    for name, content in documents.items():
+        with open(os.path.join(root, name), 'wb') as f:
+            f.write(content)
+    return root
+
+def log_rows(store):
+    with store._connect() as conn:
+        return {row['path'].split(os.sep)[-1]: dict(row) for row in conn.execute('SELECT * FROM patta_ingest_log')}
+
+def test_write_batch():
+    """A batch writes its patta_files rows and log entries together; failures are logged without a row"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = IngestStore(os.path.join(directory, 'atlas.db'))
+        row = patta_file_row('/a/x.pdf', '/a', EXTRACTION, 'h1')
+        store.write_batch([{'file_hash': 'h1', 'path': '/a/x.pdf', 'row': row, 'has_coordinates': True},
+                           {'file_hash': 'h2', 'path': '/a/y.pdf', 'error': 'boom'}])
+        assert store.processed_hashes() == {'h1', 'h2'}
+        assert store.processed_hashes(include_failed=False) == {'h1'}
+        rows = store.ingested_rows()
+        assert len(rows) == 1 and rows[0]['file_hash'] == 'h1' and rows[0]['has_coordinates'] == 1
+        assert rows[0]['patta_holder'] == 'Sita Devi' and rows[0]['area_hectares'] == 2.5
+
+        # Re-ingesting a hash replaces its row instead of adding a second one
+        store.write_batch([{'file_hash': 'h1', 'path': '/a/x.pdf', 'row': row, 'has_coordinates': True}])
+        assert len(store.ingested_rows()) == 1
+        print("✅ Batches write rows and checkpoints together")
+
+def test_resume_and_skip():
+    """A second run skips everything already processed, including duplicate content"""
+    with tempfile.TemporaryDirectory() as directory:
+        root = make_archive(directory, {'a.pdf': b'one', 'b.png': b'two', 'nested/c.pdf': b'one',
+                                        'notes.txt': b'not a document'})
+        db_path = os.path.join(directory, 'atlas.db')
+        extract = StubExtractor()
+        summary = ingest(root, db_path, workers=2, commit_every=1, extract=extract)
+        assert summary['ingested'] == 2 and summary['skipped'] == 1 and summary['failed'] == 0
+        assert sorted(extract.calls) == ['a.pdf', 'b.png']
+
+        extract = StubExtractor()
+        summary = ingest(root, db_path, workers=2, extract=extract)
+        assert extract.calls == [] and summary['skipped'] == 3 and summary['ingested'] == 0
+        assert len(IngestStore(db_path).ingested_rows()) == 2
+        print("✅ Processed hashes are skipped on resume")
+
+def test_retry_failed():
+    """Failures are checkpointed, skipped by default and reprocessed with retry_failed"""
+    with tempfile.TemporaryDirectory() as directory:
+        root = make_archive(directory, {'good.pdf': b'fine', 'broken.pdf': b'bad scan'})
+        db_path = os.path.join(directory, 'atlas.db')
+        summary = ingest(root, db_path, extract=StubExtractor())
+        assert summary['ingested'] == 1 and summary['failed'] == 1
+        assert log_rows(IngestStore(db_path))['broken.pdf']['error'] == 'unreadable scan'
+
+        extract = StubExtractor()
+        assert ingest(root, db_path, extract=extract)['failed'] == 0 and extract.calls == []
+
+        extract = StubExtractor()
+        summary = ingest(root, db_path, retry_failed=True, extract=extract)
+        assert extract.calls == ['broken.pdf'] and summary['failed'] == 1 and summary['skipped'] == 1
+        print("✅ --retry-failed reprocesses only failures")
+
+def test_partial_batches_committed():
+    """Documents finished before an interruption are checkpointed even with a part-filled batch"""
+    with tempfile.TemporaryDirectory() as directory:
+        root = make_archive(directory, {f'{i}.pdf': f'doc {i}'.encode() for i in range(5)})
+        db_path = os.path.join(directory, 'atlas.db')
+
+        def interrupted(path, **kwargs):
+            # KeyboardInterrupt is not turned into an error result, so it stops the run like Ctrl-C
+            if path.endswith('3.pdf'):
+                raise KeyboardInterrupt()
+            return dict(EXTRACTION)
+
+        try:
+            ingest(root, db_path, workers=1, commit_every=10, extract=interrupted)
+            assert False, "the run should have been interrupted"
+        except KeyboardInterrupt:
+            pass
+        logged = log_rows(IngestStore(db_path))
+        assert set(logged) == {'0.pdf', '1.pdf', '2.pdf'}
+        assert len(IngestStore(db_path).ingested_rows()) == 3
+
+        extract = StubExtractor()
+        ingest(root, db_path, workers=1, extract=extract)
+        assert sorted(extract.calls) == ['3.pdf', '4.pdf']
+        print("✅ Interrupted runs keep their finished documents")
+
+def test_unlocated_documents_off_map():
+    """Documents without coordinates are ingested but not served by /api/fra_data"""
+    directory = tempfile.mkdtemp()
+    default_db = atlas_store.DEFAULT_DB
+    # The app opens its store on first import; keep that (and the store it serves) on scratch databases
+    atlas_store.DEFAULT_DB = os.path.join(directory, 'app.db')
+    try:
+        import webgis.app as webgis_app
+        original_store = webgis_app.ATLAS_STORE
+        store = AtlasStore(os.path.join(directory, 'atlas.db'))
+        store.seed(webgis_app.FRA_ATLAS_DATA, webgis_app.TEST_VILLAGES, webgis_app.BOUNDARY_DATA,
+                   webgis_app.PATTA_CLAIMS)
+        webgis_app.ATLAS_STORE = store
+        try:
+            client = webgis_app.app.test_client()
+            before = json.loads(client.get('/api/fra_data').data)['metadata']['total_records']
+            root = make_archive(directory, {'located.pdf': b'located', 'unlocated.pdf': b'unlocated'})
+
+            def extract(path, **kwargs):
+                if path.endswith('unlocated.pdf'):
+                    return dict(EXTRACTION, latitude=None, longitude=None, fields={'owner_name': 'No Coordinates'})
+                return dict(EXTRACTION)
+
+            assert ingest(root, store.db_path, extract=extract)['ingested'] == 2
+            assert len(IngestStore(store.db_path).ingested_rows()) == 2
+            for query in ('', '?zoom=3'):
+                data = json.loads(client.get(f'/api/fra_data{query}').data)
+                assert data['metadata']['total_records'] == before + 1
+                assert all(f['geometry']['coordinates'] != [0.0, 0.0] for f in data['features'])
+            holders = [f['properties'].get('patta_holder')
+                       for f in json.loads(client.get('/api/fra_data').data)['features']]
+            assert 'Sita Devi' in holders and 'No Coordinates' not in holders
+        finally:
+            webgis_app.ATLAS_STORE = original_store
+    finally:
+        atlas_store.DEFAULT_DB = default_db
+        shutil.rmtree(directory, ignore_errors=True)
+    print("✅ Documents without coordinates stay off the map")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Bulk Ingest Tests")
+    test_write_batch()
+    test_resume_and_skip()
+    test_retry_failed()
+    test_partial_batches_committed()
+    test_unlocated_documents_off_map()
+    print("🎉 All bulk ingest tests passed")
+
+if __name__ == "__main__":
+    main()
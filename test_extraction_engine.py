@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for the unified extraction engine
+Checks strategy ordering and state filtering, early stopping, per-field merging and page rendering, without OCR
+"""
+
+from digitization import page_images
+from digitization.extraction_engine import (
+    DocumentText, ExtractionEngine, ExtractionStrategy, ExtractorRegistry, normalize_state
+)
+
+DOCUMENT = DocumentText(['Patta No: 557\nVillage: Kovilpatti'], [{'page': 1, 'source': 'text_layer'}], 'patta.pdf')
+
+class FakeStrategy(ExtractionStrategy):
+    """Returns fixed fields and records each call in a shared list"""
+
+    def __init__(self, name, cost, fields, calls, states=None, error=None):
+        self.name = name
+        self.cost = cost
+        self.states = states
+        self.fields = fields
+        self.calls = calls
+        self.error = error
+
+    def extract_fields(self, document):
+        self.calls.append(self.name)
+        if self.error:
+            raise ValueError(self.error)
+        return dict(self.fields)
+
+def make_registry(calls, *specs):
+    registry = ExtractorRegistry()
+    for spec in specs:
+        registry.register(FakeStrategy(calls=calls, **spec))
+    return registry
+
+def test_normalize_state():
+    """Abbreviations expand and names are lower-cased"""
+    assert normalize_state('TN') == 'tamil nadu'
+    assert normalize_state(' Madhya Pradesh ') == 'madhya pradesh'
+    assert normalize_state('') is None and normalize_state(None) is None
+    print("✅ State names normalized")
+
+def test_ordering_and_filtering():
+    """Cheapest first, registration order on ties, and state/doc type filters applied"""
+    registry = make_registry([], {'name': 'slow', 'cost': 4.0, 'fields': {}},
+                             {'name': 'tamil', 'cost': 1.0, 'fields': {}, 'states': {'tamil nadu'}},
+                             {'name': 'any', 'cost': 1.0, 'fields': {}},
+                             {'name': 'odisha', 'cost': 0.5, 'fields': {}, 'states': {'odisha'}})
+    assert [s.name for s in registry.strategies_for('TN')] == ['tamil', 'any', 'slow']
+    assert [s.name for s in registry.strategies_for('Odisha')] == ['odisha', 'any', 'slow']
+    assert [s.name for s in registry.strategies_for()] == ['odisha', 'tamil', 'any', 'slow']
+    assert registry.strategies_for('TN', doc_type='ror') == []
+    print("✅ Strategies ordered by cost and filtered by state")
+
+def test_early_stop():
+    """Once every core field is confident, costlier strategies are skipped"""
+    calls = []
+    registry = make_registry(calls, {'name': 'cheap', 'cost': 1.0, 'fields': {'patta_no': '557', 'village': 'Kovilpatti'}},
+                             {'name': 'costly', 'cost': 3.0, 'fields': {'patta_no': '999'}})
+    result = ExtractionEngine(registry, core_fields=['patta_no', 'village']).extract_document(DOCUMENT)
+    assert calls == ['cheap'] and result['stopped_early']
+    assert result['fields']['patta_no'] == '557'
+
+    calls.clear()
+    result = ExtractionEngine(registry, core_fields=['patta_no', 'owner_name']).extract_document(DOCUMENT)
+    assert calls == ['cheap', 'costly'] and not result['stopped_early']
+    print("✅ Engine stops at stop_confidence")
+
+def test_best_value_merge():
+    """Each field keeps its most confident value; placeholders and failing strategies are ignored"""
+    calls = []
+    registry = make_registry(calls,
+                             {'name': 'first', 'cost': 1.0, 'fields': {'survey_no': 'survey 12 of block A4 north',
+                                                                      'owner_name': 'Not found', 'unknown': 'x'}},
+                             {'name': 'broken', 'cost': 2.0, 'fields': {}, 'error': 'bad regex'},
+                             {'name': 'second', 'cost': 3.0, 'fields': {'survey_no': '12/4', 'owner_name': 'Murugan'}},
+                             {'name': 'third', 'cost': 4.0, 'fields': {'survey_no': '13', 'owner_name': 'Ravi Kumar 2'}})
+    result = ExtractionEngine(registry).extract_document(DOCUMENT, state='tn')
+    assert calls == ['first', 'broken', 'second', 'third']
+    assert result['fields']['survey_no'] == '12/4' and result['field_sources']['survey_no'] == 'second'
+    assert result['fields']['owner_name'] == 'Murugan' and result['confidence']['owner_name'] == 0.85
+    assert 'unknown' not in result['fields'] and result['state'] == 'tamil nadu'
+    assert [run['error'] for run in result['strategies']] == [None, 'bad regex', None, None]
+    assert 'village' in result['needs_review']
+    print("✅ Best value kept per field")
+
+def test_strategy_must_implement_extract_fields():
+    """A strategy without extract_fields cannot be instantiated, so it never reaches the registry"""
+    class Incomplete(ExtractionStrategy):
+        name = 'incomplete'
+
+    try:
+        Incomplete()
+        assert False, "abstract strategy was instantiated"
+    except TypeError:
+        pass
+    print("✅ Incomplete strategies rejected")
+
+def test_render_runs():
+    """Pages needing OCR are rendered per contiguous run, or in one pass when most of the PDF is wanted"""
+    calls = []
+
+    def fake_convert(path, dpi, first_page, last_page):
+        calls.append((first_page, last_page))
+        return [f'page{i}' for i in range(first_page - 1, last_page)]
+
+    original = page_images.convert_from_path
+    page_images.convert_from_path = fake_convert
+    try:
+        assert page_images.render_pages('scan.pdf', list(range(8)), page_count=8) == [f'page{i}' for i in range(8)]
+        assert calls == [(1, 8)]
+        calls.clear()
+        assert page_images.render_pages('scan.pdf', [0, 2, 4, 6], page_count=8) == ['page0', 'page2', 'page4', 'page6']
+        assert calls == [(1, 8)]
+        calls.clear()
+        assert page_images.render_pages('mixed.pdf', [7, 1, 2], page_count=10) == ['page7', 'page1', 'page2']
+        assert calls == [(2, 3), (8, 8)]
+    finally:
+        page_images.convert_from_path = original
+    print("✅ Pages rendered in contiguous runs")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Extraction Engine Tests")
+    test_normalize_state()
+    test_ordering_and_filtering()
+    test_early_stop()
+    test_best_value_merge()
+    test_strategy_must_implement_extract_fields()
+    test_render_runs()
+    print("🎉 All extraction engine tests passed")
+
+if __name__ == "__main__":
+    main()
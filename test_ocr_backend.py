@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the Tesseract OCR backends
+Checks config parsing, TSV parsing, backend selection and per-page language routing
+"""
+
+from digitization import ocr_backend, script_router
+from digitization.ocr_backend import get_ocr_backend, parse_config, parse_tsv, resolve_backend_name
+
+TSV = (
+    "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+    "1\t1\t0\t0\t0\t0\t0\t0\t1240\t1754\t-1\t\n"
+    "5\t1\t1\t1\t1\t1\t210\t300\t96\t28\t91.5\tPatta\n"
+    "5\t1\t1\t1\t1\t2\t320\t300\t60\t28\t88\t557\n"
+)
+
+def test_parse_config():
+    """pytesseract-style options map to psm, oem and variables"""
+    assert parse_config('--psm 6') == (6, None, {})
+    assert parse_config('--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789/') == (
+        6, 3, {'tessedit_char_whitelist': '0123456789/'})
+    assert parse_config('') == (None, None, {})
+    print("✅ Config strings parsed")
+
+def test_parse_tsv():
+    """TSV output matches pytesseract's image_to_data dictionary"""
+    data = parse_tsv(TSV)
+    assert data['text'] == ['', 'Patta', '557']
+    assert data['conf'] == [-1.0, 91.5, 88.0]
+    assert data['left'] == [0, 210, 320] and data['word_num'] == [0, 1, 2]
+    print("✅ TSV rows parsed")
+
+def test_backend_selection():
+    """Subprocess mode is always available; auto picks tesserocr only when installed"""
+    assert resolve_backend_name('subprocess') == 'subprocess'
+    assert resolve_backend_name('unknown') == 'subprocess'
+    expected = 'tesserocr' if ocr_backend.tesserocr is not None else 'subprocess'
+    assert resolve_backend_name('auto') == expected
+    assert get_ocr_backend('subprocess') is get_ocr_backend('subprocess')
+    print(f"✅ Backend 'auto' resolves to {expected}")
+
+def test_script_routing():
+    """Indic pages get their own pack plus English; Latin-dominant pages keep the fallback's Indic packs"""
+    detect, installed = script_router.detect_page_script, script_router.installed_languages
+    script_router.installed_languages = lambda: {'eng', 'tam', 'hin'}
+    try:
+        for detected, expected in [(('devanagari', 5.0), 'hin+eng'), (('tamil', 5.0), 'tam+eng'),
+                                   (('latin', 9.0), 'tam+eng'), (('tamil', 0.2), 'tam+eng'),
+                                   (('telugu', 5.0), 'tam+eng'), ((None, 0.0), 'tam+eng')]:
+            script_router.detect_page_script = lambda image, backend=None: detected
+            assert script_router.route_page_lang(None, fallback='tam+eng') == (expected, detected[0]), detected
+    finally:
+        script_router.detect_page_script, script_router.installed_languages = detect, installed
+    print("✅ Page languages routed")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting OCR Backend Tests")
+    test_parse_config()
+    test_parse_tsv()
+    test_backend_selection()
+    test_script_routing()
+    print("🎉 All OCR backend tests passed")
+
+if __name__ == "__main__":
+    main()
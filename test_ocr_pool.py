@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the page-level OCR pool
+Checks that a pool which breaks or is shut down while pages are being submitted hands back its in-flight slots
+and falls back to sequential OCR, without starting Tesseract
+"""
+
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from digitization import ocr_pool
+from digitization.ocr_pool import PageOCRExecutor
+
+class FailingPool:
+    """Accepts `accepted` tasks (left pending), then raises `error` from submit"""
+
+    def __init__(self, accepted, error):
+        self.accepted = accepted
+        self.error = error
+        self.futures = []
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        if len(self.futures) >= self.accepted:
+            raise self.error
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+def fake_page_task(image, lang, config, mode, timeout, tesseract_cmd, preprocess=None, backend=None):
+    return f'text of {image}', 0.1, lang, {}
+
+def run_with_failing_pool(error):
+    executor = PageOCRExecutor(max_workers=2, backend='subprocess')
+    pool = FailingPool(accepted=2, error=error)
+    executor._pool = pool
+    results = executor.run_pages(['p1', 'p2', 'p3'], lang='eng')
+    return executor, pool, results
+
+def check_recovery(error, label):
+    original = ocr_pool._ocr_page_task
+    ocr_pool._ocr_page_task = fake_page_task
+    try:
+        executor, pool, results = run_with_failing_pool(error)
+    finally:
+        ocr_pool._ocr_page_task = original
+    assert [r['output'] for r in results] == ['text of p1', 'text of p2', 'text of p3']
+    assert all(r['error'] is None for r in results)
+    assert all(future.cancelled() for future in pool.futures)
+    # Every slot is back: the two cancelled tasks and the one whose submit raised
+    assert executor._in_flight._value == executor.max_workers * 2
+    assert pool.shut_down and executor._pool is None
+    print(f"✅ {label} releases its slots and falls back to sequential OCR")
+
+def test_broken_pool_on_submit():
+    """A pool that breaks mid-submit is dropped and the document is OCR'd in-process"""
+    check_recovery(BrokenProcessPool('worker died'), "Broken pool")
+
+def test_pool_shut_down_on_submit():
+    """A pool shut down concurrently (RuntimeError from submit) is handled like a broken one"""
+    check_recovery(RuntimeError('cannot schedule new futures after shutdown'), "Shut-down pool")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting OCR Pool Tests")
+    test_broken_pool_on_submit()
+    test_pool_shut_down_on_submit()
+    print("🎉 All OCR pool tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test script for PDF text layer quality scoring
+Checks which page texts are trusted and which are sent to OCR
+"""
+
+from digitization.text_layer import assess_text_layer
+
+DIGITAL_PATTA = (
+    "தமிழ்நாடு அரசு வருவாய்த் துறை\n"
+    "பட்டா எண் : 557\n"
+    "மாவட்டம் : மதுரை வட்டம் : மதுரை வடக்கு கிராமம் : கோவில்பட்டி\n"
+    "உரிமையாளர் பெயர் : முருகன்"
+)
+
+def test_clean_text_layer():
+    """Born-digital Tamil and English pages skip OCR"""
+    assert assess_text_layer(DIGITAL_PATTA)['usable']
+    assert assess_text_layer("Patta No: 1234 Survey No: 56/2 Owner Name: Ravi Kumar Village: Kovilpatti")['usable']
+    print("✅ Clean text layers accepted")
+
+def test_broken_text_layers():
+    """Scans, unmapped glyphs and legacy font encodings fall back to OCR"""
+    cases = {
+        '': 'too_little_text',
+        "(cid:12)(cid:44)(cid:55) Patta No 12 village x district y taluk z": 'invalid_unicode',
+        "ெபயர் ேகாவில் ைக பட்டா எண் 557 மாவட்டம் மதுரை கிராமம் ேவ": 'misordered_vowel_signs',
+        "rhiy gl;lh vz; 557 khtl;lk; kJiu Patta survey village district": 'legacy_font_encoding',
+        "Annexure 1: revenue records and boundary notes here": 'no_keywords',
+    }
+    for text, reason in cases.items():
+        assessment = assess_text_layer(text)
+        assert not assessment['usable'], text
+        assert reason in assessment['reasons'], (text, assessment['reasons'])
+    print("✅ Broken text layers rejected")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Text Layer Tests")
+    test_clean_text_layer()
+    test_broken_text_layers()
+    print("🎉 All text layer tests passed")
+
+if __name__ == "__main__":
+    main()
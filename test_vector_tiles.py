@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the FRA Atlas vector tiles
+Checks tile math, clipping and simplification, MVT encoding and the ETag-keyed disk cache
+"""
+
+import os
+import tempfile
+
+from webgis.atlas_store import AtlasStore
+from webgis.vector_tiles import (VectorTileService, tile_bounds, project, clip_ring, simplify,
+                                 encode_layer, EXTENT, BUFFER)
+
+BOUNDARIES = {'states': {'features': [{'properties': {'name': 'Madhya Pradesh'},
+                                       'geometry': {'type': 'Polygon', 'coordinates': [[[74, 21], [82, 21], [82, 26], [74, 26], [74, 21]]]}}]}}
+FEATURES = {'features': [{'properties': {'village': 'Mandla', 'patta_holder': 'Sita Devi', 'latitude': 22.6,
+                                         'longitude': 80.37, 'area_hectares': 3.2}}]}
+
+def test_tile_math():
+    """Tile corners project onto the tile square"""
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(5, 22, 13)
+    x0, y0 = project(min_lon, max_lat, 5, 22, 13)
+    x1, y1 = project(max_lon, min_lat, 5, 22, 13)
+    assert abs(x0) < 1e-6 and abs(y0) < 1e-6 and abs(x1 - EXTENT) < 1e-6 and abs(y1 - EXTENT) < 1e-6
+    print("✅ Tile math works")
+
+def test_clip_and_simplify():
+    """Rings are cut to the buffered tile and straight runs collapse"""
+    ring = clip_ring([(-1000, -1000), (5000, -1000), (5000, 5000), (-1000, 5000), (-1000, -1000)])
+    assert all(-BUFFER <= x <= EXTENT + BUFFER and -BUFFER <= y <= EXTENT + BUFFER for x, y in ring)
+    assert ring[0] == ring[-1] and len(ring) == 5
+    assert simplify([(0, 0), (1, 0.1), (2, 0), (3, 0.1), (4, 0)], 1.0) == [(0, 0), (4, 0)]
+    assert encode_layer('states', [], 0, 0, 0) == b''
+    print("✅ Clipping and simplification work")
+
+def test_tile_cache():
+    """Tiles are cached on disk, their ETag changes when the layer's data does and stale versions are pruned"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = AtlasStore(os.path.join(directory, 'atlas.db'))
+        store.seed({'states': {}}, FEATURES, BOUNDARIES, [])
+        tiles = VectorTileService(store, cache_dir=os.path.join(directory, 'tiles'))
+        assert tiles.layers() == ['pattas', 'states']
+
+        data, etag = tiles.tile('states', 5, 22, 13)
+        assert data.startswith(b'\x1a') and b'Madhya Pradesh' in data
+        assert tiles.tile('states', 5, 22, 13) == (data, etag)
+        assert os.path.exists(os.path.join(directory, 'tiles', 'states', '1', '5', '22', '13.pbf'))
+
+        points, points_etag = tiles.tile('pattas', 12, 2962, 1783)
+        assert b'Mandla' in points
+        store.add_feature({'village': 'Dindori', 'patta_holder': 'X', 'latitude': 22.95, 'longitude': 81.08, 'area_hectares': 1.0})
+        assert tiles.etag('pattas', 12, 2962, 1783) != points_etag
+        assert tiles.etag('states', 5, 22, 13) == etag
+
+        # Serving the new version drops the old one from the cache
+        old_points = os.path.join(directory, 'tiles', 'pattas', str(store.data_version('patta_files') - 1))
+        assert os.path.isdir(old_points)
+        tiles.tile('pattas', 12, 2962, 1783)
+        assert not os.path.exists(old_points)
+        assert os.listdir(os.path.join(directory, 'tiles', 'pattas')) == [str(store.data_version('patta_files'))]
+        assert os.path.isdir(os.path.join(directory, 'tiles', 'states', '1'))
+
+        for bad in (('rivers', 1, 0, 0), ('states', 2, 4, 0)):
+            try:
+                tiles.tile(*bad)
+                raise AssertionError(f"{bad} should be rejected")
+            except ValueError:
+                pass
+        print("✅ Tile cache and ETags work")
+
+def main():
+    """Main test function"""
+
+    print("🚀 Starting Vector Tile Tests")
+    test_tile_math()
+    test_clip_and_simplify()
+    test_tile_cache()
+    print("🎉 All vector tile tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,9 @@ Handles PDF upload and data extraction
 import os
 import sys
 import json
+import shutil
 import tempfile
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from werkzeug.utils import secure_filename
 import logging
 
@@ -16,6 +17,9 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
+from digitization.batch_extract import MAX_BATCH_FILES, get_batch_extractor
+from digitization.upload_ingest import ingest_upload, check_declared_size, UploadTooLargeError
+
 try:
     from digitization.patta_extractor import extract_patta_data
     PATTA_EXTRACTOR_AVAILABLE = True
@@ -35,6 +39,8 @@ patta_bp = Blueprint('patta_api', __name__, url_prefix='/api/patta')
 ALLOWED_EXTENSIONS = {'pdf'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 UPLOAD_FOLDER = 'uploads/patta_documents'
+EXTRACTED_FIELDS = ['name', 'father_or_husband', 'patta_no', 'survey_no', 'dag_no', 'khasra',
+                    'area', 'village', 'taluk', 'district', 'date']
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -52,6 +58,16 @@ def upload_and_extract():
     Upload Patta PDF and extract structured data
     """
     try:
+        # Refuse oversized bodies before they are parsed
+        try:
+            check_declared_size(request.content_length, MAX_FILE_SIZE)
+        except UploadTooLargeError:
+            return jsonify({
+                'success': False,
+                'error': 'File too large',
+                'message': f'File size must be less than {MAX_FILE_SIZE // (1024*1024)}MB'
+            }), 400
+        
         # Check if file is present
         if 'file' not in request.files:
             return jsonify({
@@ -78,31 +94,24 @@ def upload_and_extract():
                 'message': 'Only PDF files are allowed'
             }), 400
         
-        # Check file size
-        file.seek(0, os.SEEK_END)
-        file_size = file.tell()
-        file.seek(0)
-        
-        if file_size > MAX_FILE_SIZE:
-            return jsonify({
-                'success': False,
-                'error': 'File too large',
-                'message': f'File size must be less than {MAX_FILE_SIZE // (1024*1024)}MB'
-            }), 400
-        
-        # Ensure upload folder exists
-        ensure_upload_folder()
-        
         # Secure filename
         filename = secure_filename(file.filename)
         
         # Create unique filename to avoid conflicts
         import uuid
         unique_filename = f"{uuid.uuid4()}_{filename}"
-        file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
         
-        # Save file
-        file.save(file_path)
+        # Stream the file to disk, enforcing the size limit while it is written
+        try:
+            upload = ingest_upload(file, UPLOAD_FOLDER, unique_filename, MAX_FILE_SIZE)
+        except UploadTooLargeError:
+            return jsonify({
+                'success': False,
+                'error': 'File too large',
+                'message': f'File size must be less than {MAX_FILE_SIZE // (1024*1024)}MB'
+            }), 400
+        file_path = upload.path
+        file_size = upload.size
         logger.info(f"File saved: {file_path}")
         
         # Extract data from PDF
@@ -142,6 +151,7 @@ def upload_and_extract():
             'message': 'Data extracted successfully',
             'filename': filename,
             'file_size': file_size,
+            'file_hash': upload.sha256,
             'extracted_data': {
                 'name': extraction_result.get('name', ''),
                 'father_or_husband': extraction_result.get('father_or_husband', ''),
@@ -256,10 +266,26 @@ def validate_extracted_data():
             'message': f'An error occurred during validation: {str(e)}'
         }), 500
 
+def extracted_fields(extraction_result):
+    """Patta fields returned to clients from an extraction result"""
+    return {field: extraction_result.get(field, '') for field in EXTRACTED_FIELDS}
+
+def wants_ndjson():
+    """Whether the client asked for results streamed as NDJSON"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best == 'application/x-ndjson'
+
 @patta_bp.route('/batch-extract', methods=['POST'])
 def batch_extract():
     """
-    Extract data from multiple PDF files
+    Extract data from multiple PDF files in parallel
+    
+    Files are stored in a private temporary directory for this request and
+    extracted on the shared batch worker pool. With ?stream=true (or
+    Accept: application/x-ndjson) one JSON line is sent per file as soon as
+    it finishes, followed by a summary line; otherwise a single JSON response
+    is returned once the whole batch is done.
     """
     try:
         files = request.files.getlist('files')
@@ -271,88 +297,105 @@ def batch_extract():
                 'message': 'Please select PDF files to upload'
             }), 400
         
-        if len(files) > 10:  # Limit batch size
+        if len(files) > MAX_BATCH_FILES:  # Limit batch size
             return jsonify({
                 'success': False,
                 'error': 'Too many files',
-                'message': 'Maximum 10 files allowed per batch'
+                'message': f'Maximum {MAX_BATCH_FILES} files allowed per batch'
             }), 400
         
-        results = []
-        errors = []
+        if not PATTA_EXTRACTOR_AVAILABLE:
+            return jsonify({
+                'success': False,
+                'error': 'Patta extractor not available',
+                'message': 'Required dependencies not installed'
+            }), 500
         
+        # Each request gets its own directory, so concurrent batches never share file names
         ensure_upload_folder()
+        batch_dir = tempfile.mkdtemp(prefix='batch_', dir=UPLOAD_FOLDER)
         
+        items = []
+        rejected = []
         for i, file in enumerate(files):
+            if not allowed_file(file.filename):
+                rejected.append({'index': i, 'file': file.filename, 'error': 'Invalid file type'})
+                continue
+            try:
+                upload = ingest_upload(file, batch_dir, f"{i}.pdf", MAX_FILE_SIZE)
+            except UploadTooLargeError as e:
+                rejected.append({'index': i, 'file': file.filename, 'error': str(e)})
+                continue
+            items.append(((i, file.filename), upload.path))
+        
+        def records():
+            """One record per file: rejected uploads first, then extractions as they complete"""
             try:
-                if not allowed_file(file.filename):
-                    errors.append({
-                        'file': file.filename,
-                        'error': 'Invalid file type'
-                    })
-                    continue
-                
-                # Save file temporarily
-                filename = secure_filename(file.filename)
-                unique_filename = f"batch_{i}_{filename}"
-                file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-                file.save(file_path)
-                
-                # Extract data
-                extraction_result = extract_patta_data(file_path)
-                
-                if 'error' in extraction_result:
-                    errors.append({
-                        'file': file.filename,
-                        'error': extraction_result['error']
-                    })
-                else:
-                    results.append({
-                        'filename': file.filename,
-                        'extracted_data': {
-                            'name': extraction_result.get('name', ''),
-                            'father_or_husband': extraction_result.get('father_or_husband', ''),
-                            'patta_no': extraction_result.get('patta_no', ''),
-                            'survey_no': extraction_result.get('survey_no', ''),
-                            'dag_no': extraction_result.get('dag_no', ''),
-                            'khasra': extraction_result.get('khasra', ''),
-                            'area': extraction_result.get('area', ''),
-                            'village': extraction_result.get('village', ''),
-                            'taluk': extraction_result.get('taluk', ''),
-                            'district': extraction_result.get('district', ''),
-                            'date': extraction_result.get('date', '')
-                        },
-                        'extraction_summary': extraction_result.get('extraction_summary', {})
-                    })
-                
-                # Clean up file
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
-                    
-            except Exception as e:
-                errors.append({
-                    'file': file.filename,
-                    'error': str(e)
-                })
+                for error in rejected:
+                    yield dict(error, success=False)
+                for (i, filename), _, extraction_result, seconds in get_batch_extractor().run(items, extract_patta_data):
+                    if 'error' in extraction_result:
+                        yield {'index': i, 'file': filename, 'success': False, 'error': extraction_result['error'],
+                               'seconds': round(seconds, 3)}
+                    else:
+                        yield {
+                            'index': i,
+                            'filename': filename,
+                            'success': True,
+                            'extracted_data': extracted_fields(extraction_result),
+                            'extraction_summary': extraction_result.get('extraction_summary', {}),
+                            'seconds': round(seconds, 3)
+                        }
+            finally:
+                shutil.rmtree(batch_dir, ignore_errors=True)
+        
+        def summary(successful):
+            return {
+                'total_files': len(files),
+                'successful_extractions': successful,
+                'failed_extractions': len(files) - successful
+            }
+        
+        if wants_ndjson():
+            def stream():
+                successful = 0
+                for record in records():
+                    successful += record['success']
+                    yield json.dumps(record, ensure_ascii=False) + '\n'
+                yield json.dumps({'summary': summary(successful)}) + '\n'
+            
+            response = Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+            # Also covers clients that disconnect before the first line is sent
+            response.call_on_close(lambda: shutil.rmtree(batch_dir, ignore_errors=True))
+            return response, 200
+        
+        results = []
+        errors = []
+        for record in records():
+            if record['success']:
+                results.append(record)
+            else:
+                errors.append(record)
+        results.sort(key=lambda record: record['index'])
+        errors.sort(key=lambda record: record['index'])
         
         response_data = {
             'success': True,
             'message': f'Processed {len(files)} files',
             'results': results,
             'errors': errors,
-            'summary': {
-                'total_files': len(files),
-                'successful_extractions': len(results),
-                'failed_extractions': len(errors)
-            }
+            'summary': summary(len(results))
         }
         
         return jsonify(response_data), 200
         
     except Exception as e:
         logger.error(f"Error during batch extraction: {str(e)}")
+        
+        # Clean up stored files if the batch never started
+        if 'batch_dir' in locals():
+            shutil.rmtree(batch_dir, ignore_errors=True)
+        
         return jsonify({
             'success': False,
             'error': 'Batch extraction failed',
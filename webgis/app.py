@@ -1,6 +1,7 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, Response, render_template, request, redirect, url_for, session, flash, jsonify
 import os
 import sys
+from datetime import datetime
 
 app = Flask(__name__)
 app.secret_key = "supersecretfra2025"
@@ -39,11 +40,17 @@ except ImportError as e:
     DEMO_DATA_AVAILABLE = False
     print(f"⚠️ Demo data not available: {e}")
 
+from webgis.atlas_index import AtlasRollupIndex
+from webgis.atlas_search import AtlasSearchIndex, FIELD_WEIGHTS, SEARCH_PAGE_SIZE
+from webgis.atlas_store import AtlasStore, AtlasChangeFollower
+from webgis.vector_tiles import VectorTileService, MIME_TYPE as MVT_MIME_TYPE, TILE_MAX_AGE
+from webgis.boundary_payloads import BoundaryPayloadCache
+
 # Register Patta API Blueprint
 if PATTA_API_AVAILABLE:
     app.register_blueprint(patta_bp)
 
-# Comprehensive FRA Atlas Data Structure
+# Comprehensive FRA Atlas Data Structure (seed data, loaded into ATLAS_STORE on first run)
 FRA_ATLAS_DATA = {
     "states": {
         "Madhya Pradesh": {
@@ -147,7 +154,7 @@ FRA_ATLAS_DATA = {
     }
 }
 
-# Legacy data for backward compatibility
+# Legacy map features (seed data for the store's patta_files table)
 TEST_VILLAGES = {
     "type": "FeatureCollection",
     "features": [
@@ -476,6 +483,35 @@ PATTA_CLAIMS = [
     }
 ]
 
+# Atlas, map features, boundaries and claims live in SQLite (data/fra_atlas.db, copied from webgis/fra_atlas.db); the literals above only seed it
+ATLAS_STORE = AtlasStore()
+ATLAS_STORE.seed(FRA_ATLAS_DATA, TEST_VILLAGES, BOUNDARY_DATA, PATTA_CLAIMS)
+# Totals per state/district/block/village
+ATLAS_INDEX = AtlasRollupIndex()
+# Full-text search over patta holders, villages, tribal groups, claim types and statuses
+SEARCH_INDEX = AtlasSearchIndex()
+# Both indexes are loaded from the store and replay its change feed, so writes from other processes show up too
+ATLAS_FOLLOWER = AtlasChangeFollower(ATLAS_STORE, [ATLAS_INDEX, SEARCH_INDEX])
+ATLAS_FOLLOWER.refresh()
+# Mapbox Vector Tiles of claim points and boundary layers, cached on disk
+TILE_SERVICE = VectorTileService(ATLAS_STORE)
+# Boundary layers pre-simplified per zoom level, serialized and compressed once
+BOUNDARY_PAYLOADS = BoundaryPayloadCache(ATLAS_STORE)
+BOUNDARY_PAYLOADS.build()
+
+def add_atlas_patta(state, district, block, village, patta, village_stats=None):
+    """Add a patta holder to the atlas store and bring the rollup and search indexes up to date"""
+    ATLAS_STORE.add_patta(state, district, block, village, patta, village_stats)
+    ATLAS_FOLLOWER.refresh()
+
+def _atlas_not_found(*path):
+    """404 response for the first level of a drill-down path that does not exist, or None"""
+    ATLAS_FOLLOWER.refresh()
+    for depth, level in enumerate(["State", "District", "Block", "Village"][:len(path)]):
+        if ATLAS_INDEX.rollup(*path[:depth + 1]) is None:
+            return jsonify({"error": f"{level} not found"}), 404
+    return None
+
 @app.route('/', methods=['GET'])
 def home():
     return redirect(url_for('login'))
@@ -759,34 +795,21 @@ def upload_patta():
         import uuid
         file_id = f"FRA{str(uuid.uuid4())[:8].upper()}"
 
-        # Append to map data so it shows immediately
-        new_feature = {
-            "type": "Feature",
-            "properties": {
-                "village": new_village or "Unknown",
-                "patta_holder": new_holder or "Unknown",
-                "latitude": new_lat,
-                "longitude": new_lon,
-                "area_hectares": new_area,
-                "claim_status": "Verified",
-                "uploaded_by": session.get("user"),
-                "file_id": file_id,
-                "tribal_group": tribal_group or "Unknown",
-                "family_size": new_family_size,
-                "file_name": file.filename,
-                "upload_date": "2025-09-16T10:20:00"
-            },
-            "geometry": {
-                "type": "Point",
-                "coordinates": [new_lon, new_lat]
-            }
-        }
-        
-        TEST_VILLAGES["features"].append(new_feature)
-        
-        # Update metadata
-        TEST_VILLAGES["metadata"]["total_records"] = len(TEST_VILLAGES["features"])
-        TEST_VILLAGES["metadata"]["last_updated"] = "2025-09-16T10:20:00"
+        # Persist the map feature so it shows immediately and survives restarts
+        ATLAS_STORE.add_feature({
+            "village": new_village or "Unknown",
+            "patta_holder": new_holder or "Unknown",
+            "latitude": new_lat,
+            "longitude": new_lon,
+            "area_hectares": new_area,
+            "claim_status": "Verified",
+            "uploaded_by": session.get("user"),
+            "file_id": file_id,
+            "tribal_group": tribal_group or "Unknown",
+            "family_size": new_family_size,
+            "file_name": file.filename,
+            "upload_date": datetime.now().isoformat(timespec='seconds')
+        })
 
         flash(('success', f'✅ File {file.filename} uploaded successfully! Added {new_village} to map with coordinates ({new_lat}, {new_lon}).'))
         return redirect(url_for('admin_panel'))
@@ -799,7 +822,7 @@ def dashboard():
     role = session.get("role")
     if not user:
         return redirect(url_for("login"))
-    return render_template("dashboard.html", user=user, role=role, claims=PATTA_CLAIMS, enumerate=enumerate)
+    return render_template("dashboard.html", user=user, role=role, claims=ATLAS_STORE.claims(), enumerate=enumerate)
 
 @app.route('/admin-dashboard')
 def admin_dashboard():
@@ -833,6 +856,7 @@ def admin_panel():
 @app.route('/api/claims', methods=['GET'])
 def api_claims():
     role = session.get("role")
+    claims = ATLAS_STORE.claims()
     if role == "public":
         # Only minimal view for public
         return jsonify([
@@ -843,16 +867,31 @@ def api_claims():
                 "district": c["district"],
                 "state": c["state"],
                 "coordinates": c["coordinates"]
-            } for c in PATTA_CLAIMS
+            } for c in claims
         ])
     else:
         # Officials get full data
-        return jsonify(PATTA_CLAIMS)
+        return jsonify(claims)
 
 # ====== Dashboard API endpoints (to avoid 404s) ======
 @app.route("/api/fra_data")
 def api_fra_data():
-    return jsonify(TEST_VILLAGES)
+    """Map features, optionally limited to a bbox and claim status; clustered below CLUSTER_MAX_ZOOM"""
+    bbox = request.args.get('bbox')  # min_lon,min_lat,max_lon,max_lat
+    if bbox:
+        try:
+            bbox = tuple(float(value) for value in bbox.split(','))
+        except ValueError:
+            bbox = ()
+        if len(bbox) != 4 or bbox[0] > bbox[2] or bbox[1] > bbox[3]:
+            return jsonify({"error": "bbox must be min_lon,min_lat,max_lon,max_lat"}), 400
+    status = request.args.get('status', 'all')
+    return jsonify(ATLAS_STORE.feature_collection(
+        bbox=bbox or None,
+        zoom=request.args.get('zoom', type=int),
+        status=status if status != 'all' else None,
+        limit=request.args.get('limit', type=int)
+    ))
 
 @app.route("/api/classification_stats")
 def api_classification_stats():
@@ -861,8 +900,9 @@ def api_classification_stats():
 @app.route("/api/dss_recommendation/<village>")
 def api_dss_recommendation(village):
     # Minimal mocked recommendation
+    first_feature = ATLAS_STORE.features(limit=1)
     return jsonify({
-        "village_info": TEST_VILLAGES["features"][0]["properties"],
+        "village_info": first_feature[0]["properties"] if first_feature else {},
         "recommendations": [
             {
                 "scheme": "PM-KISAN",
@@ -879,7 +919,7 @@ def api_dss_recommendation(village):
 def api_system_status():
     return jsonify({
         "status": "online",
-        "villages_loaded": len(TEST_VILLAGES.get("features", [])),
+        "villages_loaded": ATLAS_STORE.feature_count(),
         "stats_loaded": len(TEST_STATS.keys()),
         "timestamp": "2025-09-01T12:31:00"
     })
@@ -887,32 +927,58 @@ def api_system_status():
 # Boundary layer API endpoints
 @app.route("/api/boundaries/<layer_type>")
 def api_boundaries(layer_type):
-    """Get boundary data for states, districts, villages, or tribal areas"""
-    if layer_type in BOUNDARY_DATA:
-        return jsonify(BOUNDARY_DATA[layer_type])
-    return jsonify({"error": "Invalid layer type"}), 404
+    """
+    Get boundary data for states, districts, villages, or tribal areas
+
+    ?zoom=<map zoom> or ?tolerance=<degrees> selects a pre-simplified copy of
+    the layer; without either the full geometry is returned. The response is
+    sent from precomputed bytes, brotli- or gzip-compressed when the client
+    accepts it.
+    """
+    zoom = request.args.get('zoom', type=int)
+    tolerance = request.args.get('tolerance', type=float)
+    payload = BOUNDARY_PAYLOADS.get(layer_type, zoom=zoom, tolerance=tolerance)
+    if payload is None:
+        return jsonify({"error": "Invalid layer type"}), 404
+
+    encoding = payload.pick_encoding([e for e in ('br', 'gzip') if request.accept_encodings[e]])
+    etag = payload.etag(encoding)
+    headers = {"Cache-Control": f"public, max-age={TILE_MAX_AGE}", "Vary": "Accept-Encoding"}
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=dict(headers, ETag=f'"{etag}"'))
+    response = Response(payload.encodings[encoding], mimetype="application/json", headers=headers)
+    if encoding != 'identity':
+        response.headers["Content-Encoding"] = encoding
+    response.set_etag(etag)
+    return response
+
+@app.route("/tiles/<layer>/<int:z>/<int:x>/<int:y>.pbf")
+def vector_tile(layer, z, x, y):
+    """Mapbox Vector Tile of claim points (layer 'pattas') or a boundary layer"""
+    headers = {"Cache-Control": f"public, max-age={TILE_MAX_AGE}"}
+    etag = TILE_SERVICE.etag(layer, z, x, y)
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=dict(headers, ETag=f'"{etag}"'))
+    try:
+        data, etag = TILE_SERVICE.tile(layer, z, x, y)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    response = Response(data, mimetype=MVT_MIME_TYPE, headers=headers)
+    response.set_etag(etag)
+    return response
 
 # FRA Atlas Drill-down API endpoints
 @app.route("/api/fra-atlas/states")
 def api_fra_states():
     """Get all states with summary statistics"""
+    ATLAS_FOLLOWER.refresh()
     states_data = []
-    for state_name, state_data in FRA_ATLAS_DATA["states"].items():
-        total_pattas = 0
-        total_area = 0
-        districts_count = len(state_data["districts"])
-        
-        for district_name, district_data in state_data["districts"].items():
-            for block_name, block_data in district_data["blocks"].items():
-                for village_name, village_data in block_data["villages"].items():
-                    total_pattas += len(village_data["patta_holders"])
-                    total_area += sum(patta["area_hectares"] for patta in village_data["patta_holders"])
-        
+    for state_name, rollup in ATLAS_INDEX.children():
         states_data.append({
             "name": state_name,
-            "districts_count": districts_count,
-            "total_pattas": total_pattas,
-            "total_area_hectares": total_area,
+            "districts_count": rollup["children_count"],
+            "total_pattas": rollup["total_pattas"],
+            "total_area_hectares": rollup["total_area_hectares"],
             "avg_forest_cover": 70.2  # Mock data
         })
     
@@ -921,25 +987,17 @@ def api_fra_states():
 @app.route("/api/fra-atlas/states/<state_name>/districts")
 def api_fra_districts(state_name):
     """Get districts for a specific state"""
-    if state_name not in FRA_ATLAS_DATA["states"]:
-        return jsonify({"error": "State not found"}), 404
+    not_found = _atlas_not_found(state_name)
+    if not_found:
+        return not_found
     
     districts_data = []
-    for district_name, district_data in FRA_ATLAS_DATA["states"][state_name]["districts"].items():
-        total_pattas = 0
-        total_area = 0
-        blocks_count = len(district_data["blocks"])
-        
-        for block_name, block_data in district_data["blocks"].items():
-            for village_name, village_data in block_data["villages"].items():
-                total_pattas += len(village_data["patta_holders"])
-                total_area += sum(patta["area_hectares"] for patta in village_data["patta_holders"])
-        
+    for district_name, rollup in ATLAS_INDEX.children(state_name):
         districts_data.append({
             "name": district_name,
-            "blocks_count": blocks_count,
-            "total_pattas": total_pattas,
-            "total_area_hectares": total_area
+            "blocks_count": rollup["children_count"],
+            "total_pattas": rollup["total_pattas"],
+            "total_area_hectares": rollup["total_area_hectares"]
         })
     
     return jsonify({"districts": districts_data})
@@ -947,26 +1005,17 @@ def api_fra_districts(state_name):
 @app.route("/api/fra-atlas/states/<state_name>/districts/<district_name>/blocks")
 def api_fra_blocks(state_name, district_name):
     """Get blocks for a specific district"""
-    if state_name not in FRA_ATLAS_DATA["states"]:
-        return jsonify({"error": "State not found"}), 404
-    if district_name not in FRA_ATLAS_DATA["states"][state_name]["districts"]:
-        return jsonify({"error": "District not found"}), 404
+    not_found = _atlas_not_found(state_name, district_name)
+    if not_found:
+        return not_found
     
     blocks_data = []
-    for block_name, block_data in FRA_ATLAS_DATA["states"][state_name]["districts"][district_name]["blocks"].items():
-        total_pattas = 0
-        total_area = 0
-        villages_count = len(block_data["villages"])
-        
-        for village_name, village_data in block_data["villages"].items():
-            total_pattas += len(village_data["patta_holders"])
-            total_area += sum(patta["area_hectares"] for patta in village_data["patta_holders"])
-        
+    for block_name, rollup in ATLAS_INDEX.children(state_name, district_name):
         blocks_data.append({
             "name": block_name,
-            "villages_count": villages_count,
-            "total_pattas": total_pattas,
-            "total_area_hectares": total_area
+            "villages_count": rollup["children_count"],
+            "total_pattas": rollup["total_pattas"],
+            "total_area_hectares": rollup["total_area_hectares"]
         })
     
     return jsonify({"blocks": blocks_data})
@@ -974,19 +1023,18 @@ def api_fra_blocks(state_name, district_name):
 @app.route("/api/fra-atlas/states/<state_name>/districts/<district_name>/blocks/<block_name>/villages")
 def api_fra_villages(state_name, district_name, block_name):
     """Get villages for a specific block"""
-    if state_name not in FRA_ATLAS_DATA["states"]:
-        return jsonify({"error": "State not found"}), 404
-    if district_name not in FRA_ATLAS_DATA["states"][state_name]["districts"]:
-        return jsonify({"error": "District not found"}), 404
-    if block_name not in FRA_ATLAS_DATA["states"][state_name]["districts"][district_name]["blocks"]:
-        return jsonify({"error": "Block not found"}), 404
+    not_found = _atlas_not_found(state_name, district_name, block_name)
+    if not_found:
+        return not_found
     
     villages_data = []
-    for village_name, village_data in FRA_ATLAS_DATA["states"][state_name]["districts"][district_name]["blocks"][block_name]["villages"].items():
+    villages = ATLAS_STORE.villages(state_name, district_name, block_name)
+    for village_name, rollup in ATLAS_INDEX.children(state_name, district_name, block_name):
+        village_data = villages[village_name]
         villages_data.append({
             "name": village_name,
-            "patta_holders_count": len(village_data["patta_holders"]),
-            "total_area_hectares": sum(patta["area_hectares"] for patta in village_data["patta_holders"]),
+            "patta_holders_count": rollup["total_pattas"],
+            "total_area_hectares": rollup["total_area_hectares"],
             "forest_cover_percent": village_data["forest_cover"],
             "water_bodies_count": village_data["water_bodies"],
             "agricultural_land_percent": village_data["agricultural_land"],
@@ -998,16 +1046,11 @@ def api_fra_villages(state_name, district_name, block_name):
 @app.route("/api/fra-atlas/states/<state_name>/districts/<district_name>/blocks/<block_name>/villages/<village_name>/patta-holders")
 def api_fra_patta_holders(state_name, district_name, block_name, village_name):
     """Get patta holders for a specific village"""
-    if state_name not in FRA_ATLAS_DATA["states"]:
-        return jsonify({"error": "State not found"}), 404
-    if district_name not in FRA_ATLAS_DATA["states"][state_name]["districts"]:
-        return jsonify({"error": "District not found"}), 404
-    if block_name not in FRA_ATLAS_DATA["states"][state_name]["districts"][district_name]["blocks"]:
-        return jsonify({"error": "Block not found"}), 404
-    if village_name not in FRA_ATLAS_DATA["states"][state_name]["districts"][district_name]["blocks"][block_name]["villages"]:
-        return jsonify({"error": "Village not found"}), 404
+    not_found = _atlas_not_found(state_name, district_name, block_name, village_name)
+    if not_found:
+        return not_found
     
-    village_data = FRA_ATLAS_DATA["states"][state_name]["districts"][district_name]["blocks"][block_name]["villages"][village_name]
+    village_data = ATLAS_STORE.village(state_name, district_name, block_name, village_name)
     
     return jsonify({
         "village": village_name,
@@ -1024,62 +1067,35 @@ def api_fra_patta_holders(state_name, district_name, block_name, village_name):
 def api_fra_search():
     """Search FRA data by various criteria"""
     query = request.args.get('q', '')
-    filter_type = request.args.get('type', 'all')  # all, patta_holder, village, tribal_group
+    filter_type = request.args.get('type', 'all')  # all, patta_holder, village, tribal_group, or a claim type (IFR, CR, CFR)
     status_filter = request.args.get('status', 'all')  # all, pending, verified, approved
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', SEARCH_PAGE_SIZE, type=int)
     
-    results = []
-    
-    for state_name, state_data in FRA_ATLAS_DATA["states"].items():
-        for district_name, district_data in state_data["districts"].items():
-            for block_name, block_data in district_data["blocks"].items():
-                for village_name, village_data in block_data["villages"].items():
-                    for patta in village_data["patta_holders"]:
-                        # Apply filters
-                        if status_filter != 'all' and patta["status"].lower() != status_filter.lower():
-                            continue
-                        
-                        # Apply search query
-                        if query.lower() in patta["name"].lower() or \
-                           query.lower() in village_name.lower() or \
-                           query.lower() in patta["tribal_group"].lower():
-                            
-                            results.append({
-                                "patta_id": patta["id"],
-                                "patta_holder": patta["name"],
-                                "village": village_name,
-                                "block": block_name,
-                                "district": district_name,
-                                "state": state_name,
-                                "tribal_group": patta["tribal_group"],
-                                "claim_type": patta["claim_type"],
-                                "area_hectares": patta["area_hectares"],
-                                "status": patta["status"],
-                                "coordinates": patta["coordinates"]
-                            })
+    # A field name restricts where the query may match; anything else filters by claim type
+    fields = [filter_type] if filter_type in FIELD_WEIGHTS else None
+    claim_type = filter_type if filter_type != 'all' and fields is None else None
     
-    return jsonify({"results": results, "total": len(results)})
+    ATLAS_FOLLOWER.refresh()
+    return jsonify(SEARCH_INDEX.search(
+        query,
+        fields=fields,
+        status=status_filter if status_filter != 'all' else None,
+        claim_type=claim_type,
+        page=page,
+        per_page=per_page
+    ))
 
 @app.route('/api/admin/real_stats')
 def admin_real_stats():
     """Get real admin statistics"""
-    # Count actual data from FRA_ATLAS_DATA
-    total_claims = 0
-    approved_claims = 0
-    pending_claims = 0
-    rejected_claims = 0
-    
-    for state_data in FRA_ATLAS_DATA["states"].values():
-        for district_data in state_data["districts"].values():
-            for block_data in district_data["blocks"].values():
-                for village_data in block_data["villages"].values():
-                    for patta_holder in village_data["patta_holders"]:
-                        total_claims += 1
-                        if patta_holder["status"] == "Approved":
-                            approved_claims += 1
-                        elif patta_holder["status"] == "Pending":
-                            pending_claims += 1
-                        else:
-                            rejected_claims += 1
+    # Status histogram of the whole atlas from the rollup index
+    ATLAS_FOLLOWER.refresh()
+    totals = ATLAS_INDEX.rollup()
+    total_claims = totals["total_pattas"]
+    approved_claims = totals["status_counts"].get("Approved", 0)
+    pending_claims = totals["status_counts"].get("Pending", 0)
+    rejected_claims = total_claims - approved_claims - pending_claims
     
     return jsonify({
         "total_claims": total_claims,
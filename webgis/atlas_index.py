@@ -0,0 +1,162 @@
+"""
+FRA Atlas Rollup Index
+Materialized counts, area sums and status histograms for every state/district/block/village of the atlas
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Nesting of the atlas: each level's dict key holding the next level
+LEVELS = ['states', 'districts', 'blocks', 'villages']
+
+# Village-level statistics copied for newly created villages when none are given
+DEFAULT_VILLAGE_STATS = {'forest_cover': 0.0, 'water_bodies': 0, 'agricultural_land': 0.0, 'coordinates': [0.0, 0.0]}
+
+
+def _empty_rollup() -> Dict[str, Any]:
+    return {'total_pattas': 0, 'total_area_hectares': 0.0, 'status_counts': {}, 'children': []}
+
+
+class AtlasRollupIndex:
+    """
+    Pre-aggregated totals for each node of the nested FRA atlas
+
+    Nodes are keyed by their path, e.g. ('Odisha', 'Koraput') for a district;
+    the empty path is the whole atlas. The index is built once from the atlas
+    and kept current by add_patta(), so each drill-down level reads its totals
+    with a dict lookup instead of walking every village below it.
+
+    Without an atlas the index only tracks totals; nodes and pattas are then
+    fed in by add_node()/add_patta() (e.g. from the atlas store's change feed).
+    """
+
+    def __init__(self, atlas: Optional[Dict[str, Any]] = None):
+        self.atlas = atlas
+        self._nodes: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        # patta id -> (village path, status, area) of what was counted, so it can be taken back out
+        self._counted: Dict[str, Tuple[Tuple[str, ...], str, float]] = {}
+        self._lock = threading.RLock()
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recompute every rollup from the atlas"""
+        nodes = {(): _empty_rollup()}
+        counted: Dict[str, Tuple[Tuple[str, ...], str, float]] = {}
+
+        def walk(container: Dict[str, Any], depth: int, path: Tuple[str, ...]) -> None:
+            for name, child in container[LEVELS[depth]].items():
+                child_path = path + (name,)
+                nodes[path]['children'].append(name)
+                nodes[child_path] = _empty_rollup()
+                if depth + 1 < len(LEVELS):
+                    walk(child, depth + 1, child_path)
+                else:
+                    for patta in child['patta_holders']:
+                        self._count(nodes, counted, child_path, patta)
+
+        if self.atlas is not None:
+            walk(self.atlas, 0, ())
+        with self._lock:
+            self._nodes = nodes
+            self._counted = counted
+        logger.info(f"Built atlas rollup index with {len(nodes)} node(s)")
+
+    @staticmethod
+    def _count(nodes: Dict[Tuple[str, ...], Dict[str, Any]], counted: Dict[str, Tuple[Tuple[str, ...], str, float]],
+               village_path: Tuple[str, ...], patta: Dict[str, Any]) -> None:
+        """Add one patta to its village and every ancestor"""
+        status = patta.get('status', 'Unknown')
+        area = patta.get('area_hectares', 0) or 0
+        if patta.get('id') is not None:
+            counted[str(patta['id'])] = (village_path, status, area)
+        AtlasRollupIndex._apply(nodes, village_path, status, area, 1)
+
+    @staticmethod
+    def _apply(nodes: Dict[Tuple[str, ...], Dict[str, Any]], village_path: Tuple[str, ...],
+               status: str, area: float, sign: int) -> None:
+        for depth in range(len(village_path) + 1):
+            node = nodes[village_path[:depth]]
+            node['total_pattas'] += sign
+            node['total_area_hectares'] += sign * area
+            node['status_counts'][status] = node['status_counts'].get(status, 0) + sign
+            if not node['status_counts'][status]:
+                del node['status_counts'][status]
+
+    def rollup(self, *path: str) -> Optional[Dict[str, Any]]:
+        """Totals for a node: total_pattas, total_area_hectares, status_counts and children_count (None if unknown)"""
+        with self._lock:
+            node = self._nodes.get(tuple(path))
+            if node is None:
+                return None
+            return {
+                'total_pattas': node['total_pattas'],
+                'total_area_hectares': round(node['total_area_hectares'], 4),
+                'status_counts': dict(node['status_counts']),
+                'children_count': len(node['children'])
+            }
+
+    def children(self, *path: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """(name, rollup) for each child of a node, in atlas order"""
+        with self._lock:
+            node = self._nodes.get(tuple(path))
+            if node is None:
+                return []
+            return [(name, self.rollup(*path, name)) for name in node['children']]
+
+    def add_node(self, *path: str) -> None:
+        """Make sure a node and its ancestors exist (e.g. a village with no pattas yet)"""
+        with self._lock:
+            for depth in range(len(path)):
+                if path[:depth + 1] not in self._nodes:
+                    self._nodes[path[:depth]]['children'].append(path[depth])
+                    self._nodes[path[:depth + 1]] = _empty_rollup()
+
+    def add_patta(self, state: str, district: str, block: str, village: str, patta: Dict[str, Any],
+                  village_stats: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Add a patta holder to the atlas and update the rollups along its path
+
+        Missing states, districts, blocks and villages are created; new villages
+        take village_stats (forest cover, water bodies, ...) or zeroed defaults.
+        A patta whose id was already counted replaces the earlier one.
+        """
+        path = (state, district, block, village)
+        with self._lock:
+            if patta.get('id') is not None:
+                self.remove(patta['id'])
+            if self.atlas is not None:
+                container = self.atlas
+                for depth, name in enumerate(path):
+                    level = container[LEVELS[depth]]
+                    if name not in level:
+                        if depth + 1 < len(LEVELS):
+                            level[name] = {LEVELS[depth + 1]: {}}
+                        else:
+                            village_data = dict(DEFAULT_VILLAGE_STATS, coordinates=[0.0, 0.0])
+                            village_data.update(village_stats or {})
+                            village_data['patta_holders'] = []
+                            level[name] = village_data
+                    container = level[name]
+                container['patta_holders'].append(patta)
+            self.add_node(*path)
+            self._count(self._nodes, self._counted, path, patta)
+
+    def remove(self, patta_id: str) -> bool:
+        """Take a counted patta back out of the rollups; returns whether it was counted"""
+        with self._lock:
+            counted = self._counted.pop(str(patta_id), None)
+            if counted is None:
+                return False
+            village_path, status, area = counted
+            self._apply(self._nodes, village_path, status, area, -1)
+            if self.atlas is not None:
+                container = self.atlas
+                for depth, name in enumerate(village_path):
+                    container = container[LEVELS[depth]][name]
+                container['patta_holders'][:] = [p for p in container['patta_holders'] if str(p.get('id')) != str(patta_id)]
+            return True
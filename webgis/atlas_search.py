@@ -0,0 +1,285 @@
+"""
+FRA Atlas Search Index
+Tokenized inverted index over patta holders with prefix/infix matching, Indic-script normalization and ranked pages
+"""
+
+import os
+import re
+import heapq
+import logging
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Search configuration (overridable through the environment)
+SEARCH_PAGE_SIZE = int(os.environ.get('FRA_SEARCH_PAGE_SIZE', 50))
+SEARCH_MAX_PAGE_SIZE = int(os.environ.get('FRA_SEARCH_MAX_PAGE_SIZE', 200))
+# Longest token prefix indexed for typeahead
+MAX_PREFIX_LENGTH = int(os.environ.get('FRA_SEARCH_MAX_PREFIX', 20))
+
+# Searchable fields of a result and their ranking weights
+FIELD_WEIGHTS = {'patta_holder': 3.0, 'village': 2.0, 'tribal_group': 2.0, 'claim_type': 1.0, 'status': 1.0}
+
+# How strongly each kind of token match counts
+MATCH_WEIGHTS = {'exact': 1.0, 'prefix': 0.7, 'infix': 0.4}
+
+# Infix matching uses character trigrams of the vocabulary
+GRAM_SIZE = 3
+
+# Word characters plus the Indic blocks (Devanagari..Sinhala), whose vowel signs are not \w
+TOKEN_PATTERN = re.compile('[\\w\u0900-\u0dff]+')
+
+
+def _indic_fold_table() -> Dict[int, Optional[str]]:
+    """Characters dropped or folded so spelling variants of Indic names match"""
+    table: Dict[int, Optional[str]] = {}
+    # Zero-width (non-)joiners and BOMs change rendering only
+    for ch in '\u200b\u200c\u200d\u2060\ufeff':
+        table[ord(ch)] = None
+    # Nukta is often omitted in typed queries
+    for ch in '\u093c\u09bc\u0a3c\u0abc\u0b3c\u0c3c\u0cbc':
+        table[ord(ch)] = None
+    # Candrabindu is commonly typed as anusvara
+    for candrabindu, anusvara in (('\u0901', '\u0902'), ('\u0981', '\u0982'), ('\u0a81', '\u0a82'),
+                                  ('\u0b01', '\u0b02'), ('\u0c01', '\u0c02')):
+        table[ord(candrabindu)] = anusvara
+    # Latin accents (after NFKD), so transliterations with diacritics match plain ones
+    for code in range(0x0300, 0x0370):
+        table[code] = None
+    # Native digits of each Indic script to ASCII
+    for zero in (0x0966, 0x09e6, 0x0a66, 0x0ae6, 0x0b66, 0x0be6, 0x0c66, 0x0ce6, 0x0d66):
+        for digit in range(10):
+            table[zero + digit] = str(digit)
+    return table
+
+
+_FOLD_TABLE = _indic_fold_table()
+
+
+def normalize_text(text: Any) -> str:
+    """Case-fold and script-normalize text for indexing and querying"""
+    text = unicodedata.normalize('NFKD', str(text or '')).casefold()
+    return unicodedata.normalize('NFC', text.translate(_FOLD_TABLE))
+
+
+def tokenize(text: Any) -> List[str]:
+    """Normalized word tokens of text"""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def _grams(token: str) -> Set[str]:
+    return {token[i:i + GRAM_SIZE] for i in range(len(token) - GRAM_SIZE + 1)}
+
+
+def patta_result(state: str, district: str, block: str, village: str, patta: Dict[str, Any]) -> Dict[str, Any]:
+    """Search result record for a patta holder"""
+    return {
+        "patta_id": patta.get("id"),
+        "patta_holder": patta.get("name", ""),
+        "village": village,
+        "block": block,
+        "district": district,
+        "state": state,
+        "tribal_group": patta.get("tribal_group", ""),
+        "claim_type": patta.get("claim_type", ""),
+        "area_hectares": patta.get("area_hectares", 0),
+        "status": patta.get("status", ""),
+        "coordinates": patta.get("coordinates")
+    }
+
+
+class AtlasSearchIndex:
+    """
+    Inverted index over the patta holders of the FRA atlas
+
+    Every searchable field is tokenized and normalized once at index time.
+    A query token matches a record when it equals one of its tokens, is a
+    prefix of one (typeahead) or occurs inside one (via a trigram index over
+    the vocabulary); all query tokens must match. Records are ranked by field
+    weight times match strength, and only the requested page is materialized.
+    """
+
+    def __init__(self):
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._positions: Dict[str, int] = {}
+        self._next_position = 0
+        self._doc_tokens: Dict[str, List[Tuple[str, str]]] = {}
+        self._postings: Dict[str, Dict[str, Set[str]]] = {field: {} for field in FIELD_WEIGHTS}
+        self._vocab: Dict[str, int] = {}
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._by_claim_type: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_atlas(cls, atlas: Dict[str, Any]) -> 'AtlasSearchIndex':
+        """Index every patta holder of a nested states/districts/blocks/villages atlas"""
+        index = cls()
+        count = 0
+        for state_name, state_data in atlas["states"].items():
+            for district_name, district_data in state_data["districts"].items():
+                for block_name, block_data in district_data["blocks"].items():
+                    for village_name, village_data in block_data["villages"].items():
+                        for patta in village_data["patta_holders"]:
+                            index.add_patta(state_name, district_name, block_name, village_name, patta)
+                            count += 1
+        logger.info(f"Built atlas search index with {count} record(s) and {len(index._vocab)} token(s)")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add_patta(self, state: str, district: str, block: str, village: str, patta: Dict[str, Any]) -> None:
+        """Index (or re-index) one patta holder"""
+        self.add(patta_result(state, district, block, village, patta))
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Index a result record, replacing any record with the same patta_id"""
+        doc_id = str(record["patta_id"])
+        with self._lock:
+            if doc_id in self._docs:
+                self.remove(doc_id)
+            tokens = {(field, token) for field in FIELD_WEIGHTS for token in tokenize(record.get(field))}
+            self._docs[doc_id] = record
+            self._positions[doc_id] = self._next_position
+            self._next_position += 1
+            self._doc_tokens[doc_id] = sorted(tokens)
+            for field, token in tokens:
+                self._postings[field].setdefault(token, set()).add(doc_id)
+                self._add_vocab(token)
+            self._by_status.setdefault(normalize_text(record.get("status")), set()).add(doc_id)
+            self._by_claim_type.setdefault(normalize_text(record.get("claim_type")), set()).add(doc_id)
+
+    def remove(self, patta_id: str) -> bool:
+        """Drop a record from the index; returns whether it was present"""
+        doc_id = str(patta_id)
+        with self._lock:
+            record = self._docs.pop(doc_id, None)
+            if record is None:
+                return False
+            del self._positions[doc_id]
+            for field, token in self._doc_tokens.pop(doc_id):
+                posting = self._postings[field][token]
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[field][token]
+                self._drop_vocab(token)
+            for lookup, key in ((self._by_status, record.get("status")), (self._by_claim_type, record.get("claim_type"))):
+                ids = lookup.get(normalize_text(key))
+                if ids is not None:
+                    ids.discard(doc_id)
+            return True
+
+    def _add_vocab(self, token: str) -> None:
+        self._vocab[token] = self._vocab.get(token, 0) + 1
+        if self._vocab[token] > 1:
+            return
+        for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+            self._prefixes.setdefault(token[:length], set()).add(token)
+        for gram in _grams(token):
+            self._grams.setdefault(gram, set()).add(token)
+
+    def _drop_vocab(self, token: str) -> None:
+        self._vocab[token] -= 1
+        if self._vocab[token] > 0:
+            return
+        del self._vocab[token]
+        for lookup, keys in ((self._prefixes, [token[:n] for n in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1)]),
+                             (self._grams, _grams(token))):
+            for key in keys:
+                tokens = lookup.get(key)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del lookup[key]
+
+    def _expand(self, query_token: str) -> Dict[str, float]:
+        """Vocabulary tokens matching a query token, with their match strength"""
+        matches: Dict[str, float] = {}
+        if len(query_token) >= GRAM_SIZE:
+            candidates: Optional[Set[str]] = None
+            for gram in _grams(query_token):
+                tokens = self._grams.get(gram, set())
+                candidates = set(tokens) if candidates is None else candidates & tokens
+                if not candidates:
+                    break
+            for token in candidates or ():
+                if query_token in token:
+                    matches[token] = MATCH_WEIGHTS['infix']
+        if len(query_token) <= MAX_PREFIX_LENGTH:
+            prefixed: Iterable[str] = self._prefixes.get(query_token, ())
+        else:
+            prefixed = [token for token in self._prefixes.get(query_token[:MAX_PREFIX_LENGTH], ()) if token.startswith(query_token)]
+        for token in prefixed:
+            matches[token] = MATCH_WEIGHTS['prefix']
+        if query_token in self._vocab:
+            matches[query_token] = MATCH_WEIGHTS['exact']
+        return matches
+
+    def search(self, query: str = '', fields: Optional[List[str]] = None, status: Optional[str] = None,
+               claim_type: Optional[str] = None, page: int = 1, per_page: int = SEARCH_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Ranked, paginated search
+
+        Args:
+            query: Free text; every token must match. Empty matches all records
+            fields: Restrict matching to these FIELD_WEIGHTS keys (default: all)
+            status: Keep only records with this status (case-insensitive)
+            claim_type: Keep only records with this claim type (IFR/CR/CFR)
+            page: 1-based page number
+            per_page: Results per page, capped at SEARCH_MAX_PAGE_SIZE
+
+        Returns:
+            Dict with results, total, page, per_page and has_more
+        """
+        page = max(1, page)
+        per_page = max(1, min(per_page, SEARCH_MAX_PAGE_SIZE))
+        fields = [field for field in (fields or FIELD_WEIGHTS) if field in FIELD_WEIGHTS]
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+
+        with self._lock:
+            allowed: Optional[Set[str]] = None
+            for lookup, value in ((self._by_status, status), (self._by_claim_type, claim_type)):
+                if value:
+                    ids = lookup.get(normalize_text(value), set())
+                    allowed = set(ids) if allowed is None else allowed & ids
+
+            if not query_tokens:
+                ids = self._docs.keys() if allowed is None else allowed
+                scores = {doc_id: 0.0 for doc_id in ids}
+            else:
+                scores = None
+                for query_token in query_tokens:
+                    token_scores: Dict[str, float] = {}
+                    for token, strength in self._expand(query_token).items():
+                        for field in fields:
+                            for doc_id in self._postings[field].get(token, ()):
+                                if allowed is not None and doc_id not in allowed:
+                                    continue
+                                score = strength * FIELD_WEIGHTS[field]
+                                if score > token_scores.get(doc_id, 0.0):
+                                    token_scores[doc_id] = score
+                    if scores is None:
+                        scores = token_scores
+                    else:
+                        scores = {doc_id: score + token_scores[doc_id] for doc_id, score in scores.items() if doc_id in token_scores}
+                    if not scores:
+                        break
+
+            # Ties keep atlas order; only the first `page` pages are ever sorted
+            positions = self._positions
+            top = heapq.nsmallest(page * per_page, scores, key=lambda doc_id: (-scores[doc_id], positions[doc_id]))
+            results = [dict(self._docs[doc_id], score=round(scores[doc_id], 3)) for doc_id in top[(page - 1) * per_page:]]
+
+        return {
+            "results": results,
+            "total": len(scores),
+            "page": page,
+            "per_page": per_page,
+            "has_more": page * per_page < len(scores)
+        }
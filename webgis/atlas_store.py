@@ -0,0 +1,735 @@
+"""
+FRA Atlas Store
+SQLite storage for the atlas hierarchy, map features, boundary layers and claims, with R-tree indexes on coordinates
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Committed database the runtime store starts from; it is copied, never written to
+TEMPLATE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fra_atlas.db')
+
+# Store configuration (overridable through the environment)
+# Runtime database, untracked; created from TEMPLATE_DB the first time it is opened
+DEFAULT_DB = os.environ.get('FRA_ATLAS_DB', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                         'data', 'fra_atlas.db'))
+# Rows fetched per round trip when streaming, and ids per IN (...) lookup
+FETCH_SIZE = int(os.environ.get('FRA_ATLAS_FETCH_SIZE', 500))
+
+# Map features: most points per response, zoom below which points are clustered, and cluster cell width
+MAP_MAX_FEATURES = int(os.environ.get('FRA_MAP_MAX_FEATURES', 5000))
+CLUSTER_MAX_ZOOM = int(os.environ.get('FRA_CLUSTER_MAX_ZOOM', 10))
+CLUSTER_RADIUS_PX = int(os.environ.get('FRA_CLUSTER_RADIUS_PX', 60))
+
+# Patta holder keys stored in their own columns; anything else goes to the details JSON
+PATTA_KEYS = ['id', 'name', 'tribal_group', 'claim_type', 'area_hectares', 'status', 'coordinates']
+
+# Village statistics columns of atlas_villages
+VILLAGE_STATS = ['forest_cover', 'water_bodies', 'agricultural_land']
+
+# patta_files columns (the schema shared with digitization/bulk_ingest.py)
+PATTA_FILE_COLUMNS = ['filename', 'original_filename', 'village_name', 'patta_holder', 'latitude', 'longitude',
+                      'area_hectares', 'tribal_group', 'family_size', 'claim_status', 'uploaded_by', 'uploaded_date',
+                      'verified_by', 'verification_date', 'approval_status', 'notes']
+
+# patta_claims columns
+CLAIM_COLUMNS = ['id', 'applicant_name', 'village', 'district', 'state', 'claim_type', 'area_hectares',
+                 'status', 'latitude', 'longitude', 'verified_by', 'document']
+
+# Tables whose changes bump a version counter in atlas_meta
+VERSIONED_TABLES = ['patta_files', 'atlas_boundaries']
+
+BBox = Tuple[float, float, float, float]
+
+
+def feature_row(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a map feature's properties (as uploads create them) onto patta_files columns"""
+    notes = {'file_id': properties['file_id']} if properties.get('file_id') else {}
+    return {
+        'filename': properties.get('file_name', ''),
+        'original_filename': properties.get('file_name', ''),
+        'village_name': properties.get('village', 'Unknown'),
+        'patta_holder': properties.get('patta_holder', 'Unknown'),
+        'latitude': properties.get('latitude', 0.0),
+        'longitude': properties.get('longitude', 0.0),
+        'area_hectares': properties.get('area_hectares', 0.0),
+        'tribal_group': properties.get('tribal_group'),
+        'family_size': properties.get('family_size'),
+        'claim_status': properties.get('claim_status', 'Pending'),
+        'uploaded_by': properties.get('uploaded_by', ''),
+        'uploaded_date': properties.get('upload_date', ''),
+        'notes': json.dumps(notes) if notes else None
+    }
+
+
+def row_feature(row: sqlite3.Row) -> Dict[str, Any]:
+    """GeoJSON point feature for a patta_files row (empty properties are left out)"""
+    try:
+        notes = json.loads(row['notes']) if row['notes'] else {}
+    except (TypeError, ValueError):
+        notes = {}
+    properties = {
+        'village': row['village_name'],
+        'patta_holder': row['patta_holder'],
+        'latitude': row['latitude'],
+        'longitude': row['longitude'],
+        'area_hectares': row['area_hectares'],
+        'claim_status': row['claim_status'],
+        'uploaded_by': row['uploaded_by'],
+        'file_id': notes.get('file_id') if isinstance(notes, dict) else None,
+        'tribal_group': row['tribal_group'],
+        'family_size': row['family_size'],
+        'file_name': row['original_filename'],
+        'upload_date': row['uploaded_date']
+    }
+    return {
+        'type': 'Feature',
+        'properties': {key: value for key, value in properties.items() if value not in (None, '')},
+        'geometry': {'type': 'Point', 'coordinates': [row['longitude'], row['latitude']]}
+    }
+
+
+def cluster_cell_degrees(zoom: int) -> float:
+    """Width in degrees of a CLUSTER_RADIUS_PX-wide cell at a zoom level (256px Web Mercator tiles)"""
+    return 360.0 / (256 * 2 ** max(0, zoom)) * CLUSTER_RADIUS_PX
+
+
+def _geometry_bounds(geometry: Dict[str, Any]) -> Optional[BBox]:
+    """(min_lon, min_lat, max_lon, max_lat) of any GeoJSON geometry"""
+    xs, ys = [], []
+
+    def walk(coords):
+        if coords and isinstance(coords[0], (int, float)):
+            xs.append(coords[0])
+            ys.append(coords[1])
+        else:
+            for part in coords or ():
+                walk(part)
+
+    walk(geometry.get('coordinates'))
+    return (min(xs), min(ys), max(xs), max(ys)) if xs else None
+
+
+def _patta_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    patta = {
+        'id': row['patta_id'],
+        'name': row['name'],
+        'tribal_group': row['tribal_group'],
+        'claim_type': row['claim_type'],
+        'area_hectares': row['area_hectares'],
+        'status': row['status'],
+        'coordinates': [row['longitude'], row['latitude']] if row['longitude'] is not None else None
+    }
+    if row['details']:
+        patta.update(json.loads(row['details']))
+    return patta
+
+
+def _village_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        'forest_cover': row['forest_cover'],
+        'water_bodies': row['water_bodies'],
+        'agricultural_land': row['agricultural_land'],
+        'coordinates': [row['longitude'], row['latitude']]
+    }
+
+
+def default_db_path() -> str:
+    """DEFAULT_DB, first created as a copy of the committed TEMPLATE_DB if it does not exist yet"""
+    db_path = DEFAULT_DB
+    if not os.path.exists(db_path) and os.path.exists(TEMPLATE_DB):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Copy then rename, so a concurrent process never opens a half-written file
+        temp_path = f'{db_path}.{os.getpid()}.tmp'
+        shutil.copyfile(TEMPLATE_DB, temp_path)
+        if os.path.exists(db_path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, db_path)
+            logger.info(f"Created atlas database {db_path} from {TEMPLATE_DB}")
+    return db_path
+
+
+class AtlasStore:
+    """
+    The FRA atlas in SQLite (data/fra_atlas.db unless FRA_ATLAS_DB says otherwise)
+
+    Villages are keyed by their state/district/block/village path and patta
+    holders reference their village, so each drill-down level is an indexed
+    lookup. Point and boundary coordinates are mirrored into R-tree tables by
+    triggers, so bounding-box queries only touch rows in the box, including
+    rows written by other tools such as the bulk ingester.
+
+    Every write takes the database write lock up front (BEGIN IMMEDIATE) on
+    a WAL database, so several app processes can share one file. Changes to
+    patta holders are also appended to atlas_changes, which in-process caches
+    (see AtlasChangeFollower) replay to stay current.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """db_path defaults to the runtime database (see default_db_path)"""
+        self.db_path = db_path or default_db_path()
+        self.has_rtree = False
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation, commit and close it"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Connection holding the database write lock until the block commits"""
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            yield conn
+
+    def _init_db(self) -> None:
+        """Create the atlas tables, indexes, R-trees and their triggers if needed"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+        with self._write() as conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS atlas_villages
+                            (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                             state TEXT NOT NULL,
+                             district TEXT NOT NULL,
+                             block TEXT NOT NULL,
+                             village TEXT NOT NULL,
+                             forest_cover REAL,
+                             water_bodies INTEGER,
+                             agricultural_land REAL,
+                             longitude REAL,
+                             latitude REAL,
+                             UNIQUE (state, district, block, village))''')
+            conn.execute('''CREATE TABLE IF NOT EXISTS atlas_pattas
+                            (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                             patta_id TEXT NOT NULL UNIQUE,
+                             village_id INTEGER NOT NULL REFERENCES atlas_villages (id),
+                             name TEXT,
+                             tribal_group TEXT,
+                             claim_type TEXT,
+                             area_hectares REAL,
+                             status TEXT,
+                             longitude REAL,
+                             latitude REAL,
+                             details TEXT)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_atlas_pattas_village ON atlas_pattas (village_id, id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_atlas_pattas_status ON atlas_pattas (status)')
+            conn.execute('''CREATE TABLE IF NOT EXISTS atlas_changes
+                            (seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                             patta_id TEXT NOT NULL)''')
+            for event, ref in (('INSERT', 'new'), ('UPDATE', 'new'), ('DELETE', 'old')):
+                conn.execute(f'''CREATE TRIGGER IF NOT EXISTS atlas_pattas_change_{event.lower()}
+                                 AFTER {event} ON atlas_pattas BEGIN
+                                 INSERT INTO atlas_changes (patta_id) VALUES ({ref}.patta_id); END''')
+
+            conn.execute('''CREATE TABLE IF NOT EXISTS patta_files
+                            (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                             filename TEXT NOT NULL,
+                             original_filename TEXT NOT NULL,
+                             village_name TEXT NOT NULL,
+                             patta_holder TEXT NOT NULL,
+                             latitude REAL NOT NULL,
+                             longitude REAL NOT NULL,
+                             area_hectares REAL NOT NULL,
+                             tribal_group TEXT,
+                             family_size INTEGER,
+                             claim_status TEXT DEFAULT 'Pending',
+                             uploaded_by TEXT NOT NULL,
+                             uploaded_date TEXT NOT NULL,
+                             verified_by TEXT,
+                             verification_date TEXT,
+                             approval_status TEXT DEFAULT 'Pending',
+                             notes TEXT)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_patta_files_village ON patta_files (village_name)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_patta_files_lonlat ON patta_files (longitude, latitude)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_patta_files_status ON patta_files (claim_status COLLATE NOCASE)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_patta_files_uploaded ON patta_files (uploaded_date)')
+
+            conn.execute('''CREATE TABLE IF NOT EXISTS atlas_boundaries
+                            (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                             layer TEXT NOT NULL,
+                             properties TEXT NOT NULL,
+                             geometry TEXT NOT NULL,
+                             min_lon REAL, min_lat REAL, max_lon REAL, max_lat REAL)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_atlas_boundaries_layer ON atlas_boundaries (layer, id)')
+
+            conn.execute('''CREATE TABLE IF NOT EXISTS patta_claims
+                            (id TEXT PRIMARY KEY,
+                             applicant_name TEXT,
+                             village TEXT,
+                             district TEXT,
+                             state TEXT,
+                             claim_type TEXT,
+                             area_hectares REAL,
+                             status TEXT,
+                             latitude REAL,
+                             longitude REAL,
+                             verified_by TEXT,
+                             document TEXT)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_patta_claims_area ON patta_claims (state, district, village)')
+
+            conn.execute('''CREATE TABLE IF NOT EXISTS atlas_meta
+                            (key TEXT PRIMARY KEY, value TEXT)''')
+            # Change counters for caches derived from whole tables (e.g. vector tiles)
+            for table in VERSIONED_TABLES:
+                conn.execute("INSERT OR IGNORE INTO atlas_meta (key, value) VALUES (?, 0)", (f'version:{table}',))
+                for event in ('INSERT', 'UPDATE', 'DELETE'):
+                    conn.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                                     AFTER {event} ON {table} BEGIN
+                                     UPDATE atlas_meta SET value = value + 1 WHERE key = 'version:{table}'; END''')
+
+            self.has_rtree = self._init_rtrees(conn)
+
+    @staticmethod
+    def _init_rtrees(conn: sqlite3.Connection) -> bool:
+        """R-tree tables mirroring point/boundary coordinates; False if SQLite lacks the R*Tree module"""
+        try:
+            for table in ('atlas_pattas_rtree', 'patta_files_rtree', 'atlas_boundaries_rtree'):
+                conn.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING rtree (id, min_lon, max_lon, min_lat, max_lat)')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite R*Tree module not available, bounding-box queries will use plain indexes: {e}")
+            return False
+
+        boxes = {
+            'atlas_pattas': ('longitude', 'longitude', 'latitude', 'latitude'),
+            'patta_files': ('longitude', 'longitude', 'latitude', 'latitude'),
+            'atlas_boundaries': ('min_lon', 'max_lon', 'min_lat', 'max_lat')
+        }
+        for table, (min_lon, max_lon, min_lat, max_lat) in boxes.items():
+            rtree = f'{table}_rtree'
+            box = lambda ref: (f"SELECT {ref}.id, {ref}.{min_lon}, {ref}.{max_lon}, {ref}.{min_lat}, {ref}.{max_lat} "
+                               f"WHERE {ref}.{min_lon} IS NOT NULL AND {ref}.{min_lat} IS NOT NULL")
+            conn.execute(f'''CREATE TRIGGER IF NOT EXISTS {rtree}_insert AFTER INSERT ON {table} BEGIN
+                             INSERT INTO {rtree} {box('new')}; END''')
+            conn.execute(f'''CREATE TRIGGER IF NOT EXISTS {rtree}_update AFTER UPDATE ON {table} BEGIN
+                             DELETE FROM {rtree} WHERE id = old.id;
+                             INSERT INTO {rtree} {box('new')}; END''')
+            conn.execute(f'''CREATE TRIGGER IF NOT EXISTS {rtree}_delete AFTER DELETE ON {table} BEGIN
+                             DELETE FROM {rtree} WHERE id = old.id; END''')
+            # Rows written before the triggers existed (e.g. by an older bulk ingest)
+            conn.execute(f'''INSERT INTO {rtree}
+                             SELECT t.id, t.{min_lon}, t.{max_lon}, t.{min_lat}, t.{max_lat} FROM {table} t
+                             WHERE t.{min_lon} IS NOT NULL AND t.{min_lat} IS NOT NULL
+                               AND t.id NOT IN (SELECT id FROM {rtree})''')
+        return True
+
+    # ------------------------------------------------------------------
+    # Seeding and writes
+    # ------------------------------------------------------------------
+
+    def seed(self, atlas: Dict[str, Any], features: Dict[str, Any], boundaries: Dict[str, Any],
+             claims: List[Dict[str, Any]]) -> bool:
+        """
+        Load the built-in demo data once per database
+
+        Returns:
+            True if the data was written, False if the database was already seeded
+        """
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM atlas_meta WHERE key = 'seeded'").fetchone():
+                return False
+            for state_name, state_data in atlas['states'].items():
+                for district_name, district_data in state_data['districts'].items():
+                    for block_name, block_data in district_data['blocks'].items():
+                        for village_name, village_data in block_data['villages'].items():
+                            village_id = self._upsert_village(conn, (state_name, district_name, block_name, village_name),
+                                                              village_data)
+                            for patta in village_data['patta_holders']:
+                                self._upsert_patta(conn, village_id, patta)
+            for feature in features.get('features', []):
+                self._insert_patta_file(conn, feature_row(feature['properties']))
+            for layer, collection in boundaries.items():
+                for feature in collection.get('features', []):
+                    self._insert_boundary(conn, layer, feature)
+            for claim in claims:
+                self._upsert_claim(conn, claim)
+            conn.execute("INSERT INTO atlas_meta (key, value) VALUES ('seeded', ?)", (datetime.now().isoformat(),))
+        logger.info(f"Seeded atlas store {self.db_path}")
+        return True
+
+    @staticmethod
+    def _upsert_village(conn: sqlite3.Connection, path: Sequence[str], stats: Optional[Dict[str, Any]]) -> int:
+        """Create a village (or update its statistics when given) and return its id"""
+        if stats:
+            lon, lat = (stats.get('coordinates') or [None, None])[:2]
+            conn.execute('''INSERT INTO atlas_villages
+                            (state, district, block, village, forest_cover, water_bodies, agricultural_land, longitude, latitude)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT (state, district, block, village) DO UPDATE SET
+                            forest_cover = excluded.forest_cover, water_bodies = excluded.water_bodies,
+                            agricultural_land = excluded.agricultural_land,
+                            longitude = excluded.longitude, latitude = excluded.latitude''',
+                         tuple(path) + tuple(stats.get(key, 0) for key in VILLAGE_STATS) + (lon, lat))
+        else:
+            conn.execute('''INSERT INTO atlas_villages
+                            (state, district, block, village, forest_cover, water_bodies, agricultural_land, longitude, latitude)
+                            VALUES (?, ?, ?, ?, 0, 0, 0, 0, 0)
+                            ON CONFLICT (state, district, block, village) DO NOTHING''', tuple(path))
+        return conn.execute('''SELECT id FROM atlas_villages
+                               WHERE state = ? AND district = ? AND block = ? AND village = ?''', tuple(path)).fetchone()[0]
+
+    @staticmethod
+    def _upsert_patta(conn: sqlite3.Connection, village_id: int, patta: Dict[str, Any]) -> None:
+        lon, lat = (patta.get('coordinates') or [None, None])[:2]
+        details = {key: value for key, value in patta.items() if key not in PATTA_KEYS}
+        conn.execute('''INSERT INTO atlas_pattas
+                        (patta_id, village_id, name, tribal_group, claim_type, area_hectares, status, longitude, latitude, details)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (patta_id) DO UPDATE SET
+                        village_id = excluded.village_id, name = excluded.name, tribal_group = excluded.tribal_group,
+                        claim_type = excluded.claim_type, area_hectares = excluded.area_hectares,
+                        status = excluded.status, longitude = excluded.longitude, latitude = excluded.latitude,
+                        details = excluded.details''',
+                     (str(patta['id']), village_id, patta.get('name'), patta.get('tribal_group'), patta.get('claim_type'),
+                      patta.get('area_hectares', 0), patta.get('status'), lon, lat,
+                      json.dumps(details) if details else None))
+
+    @staticmethod
+    def _insert_patta_file(conn: sqlite3.Connection, row: Dict[str, Any]) -> int:
+        row = {key: value for key, value in row.items() if key in PATTA_FILE_COLUMNS}
+        cursor = conn.execute(f'''INSERT INTO patta_files ({', '.join(row)})
+                                  VALUES ({', '.join('?' * len(row))})''', list(row.values()))
+        return cursor.lastrowid
+
+    @staticmethod
+    def _insert_boundary(conn: sqlite3.Connection, layer: str, feature: Dict[str, Any]) -> None:
+        bounds = _geometry_bounds(feature['geometry']) or (None, None, None, None)
+        conn.execute('''INSERT INTO atlas_boundaries (layer, properties, geometry, min_lon, min_lat, max_lon, max_lat)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                     (layer, json.dumps(feature.get('properties', {})), json.dumps(feature['geometry'])) + tuple(bounds))
+
+    @staticmethod
+    def _upsert_claim(conn: sqlite3.Connection, claim: Dict[str, Any]) -> None:
+        # Claims carry [lat, lon] coordinates
+        lat, lon = (claim.get('coordinates') or [None, None])[:2]
+        values = dict(claim, latitude=lat, longitude=lon)
+        conn.execute(f'''INSERT OR REPLACE INTO patta_claims ({', '.join(CLAIM_COLUMNS)})
+                         VALUES ({', '.join('?' * len(CLAIM_COLUMNS))})''',
+                     [values.get(column) for column in CLAIM_COLUMNS])
+
+    def add_patta(self, state: str, district: str, block: str, village: str, patta: Dict[str, Any],
+                  village_stats: Optional[Dict[str, Any]] = None) -> None:
+        """Insert or replace a patta holder, creating its village (with village_stats or zeroed defaults) if needed"""
+        with self._write() as conn:
+            village_id = self._upsert_village(conn, (state, district, block, village), village_stats)
+            self._upsert_patta(conn, village_id, patta)
+
+    def remove_patta(self, patta_id: str) -> bool:
+        """Delete a patta holder; returns whether it existed"""
+        with self._write() as conn:
+            return conn.execute('DELETE FROM atlas_pattas WHERE patta_id = ?', (str(patta_id),)).rowcount > 0
+
+    def add_feature(self, properties: Dict[str, Any]) -> int:
+        """Persist an uploaded map feature as a patta_files row and return its id"""
+        with self._write() as conn:
+            return self._insert_patta_file(conn, feature_row(properties))
+
+    # ------------------------------------------------------------------
+    # Atlas hierarchy
+    # ------------------------------------------------------------------
+
+    def iter_villages(self) -> Iterator[Tuple[Tuple[str, str, str, str], Dict[str, Any]]]:
+        """Stream (path, village stats) for every village"""
+        with self._connect() as conn:
+            cursor = conn.execute('SELECT * FROM atlas_villages ORDER BY id')
+            for rows in iter(lambda: cursor.fetchmany(FETCH_SIZE), []):
+                for row in rows:
+                    yield (row['state'], row['district'], row['block'], row['village']), _village_from_row(row)
+
+    def iter_pattas(self) -> Iterator[Tuple[Tuple[str, str, str, str], Dict[str, Any]]]:
+        """Stream (village path, patta holder) for every patta holder"""
+        with self._connect() as conn:
+            cursor = conn.execute('''SELECT v.state, v.district, v.block, v.village, p.*
+                                     FROM atlas_pattas p JOIN atlas_villages v ON v.id = p.village_id
+                                     ORDER BY p.id''')
+            for rows in iter(lambda: cursor.fetchmany(FETCH_SIZE), []):
+                for row in rows:
+                    yield (row['state'], row['district'], row['block'], row['village']), _patta_from_row(row)
+
+    def pattas_by_ids(self, patta_ids: Sequence[str]) -> Dict[str, Tuple[Tuple[str, str, str, str], Dict[str, Any]]]:
+        """Current (village path, patta holder) for each id that still exists"""
+        found = {}
+        with self._connect() as conn:
+            for start in range(0, len(patta_ids), FETCH_SIZE):
+                chunk = [str(patta_id) for patta_id in patta_ids[start:start + FETCH_SIZE]]
+                rows = conn.execute(f'''SELECT v.state, v.district, v.block, v.village, p.*
+                                        FROM atlas_pattas p JOIN atlas_villages v ON v.id = p.village_id
+                                        WHERE p.patta_id IN ({', '.join('?' * len(chunk))})''', chunk)
+                for row in rows:
+                    found[row['patta_id']] = ((row['state'], row['district'], row['block'], row['village']),
+                                              _patta_from_row(row))
+        return found
+
+    def villages(self, state: str, district: str, block: str) -> Dict[str, Dict[str, Any]]:
+        """Village statistics of a block, by village name"""
+        with self._connect() as conn:
+            rows = conn.execute('''SELECT * FROM atlas_villages WHERE state = ? AND district = ? AND block = ?
+                                   ORDER BY id''', (state, district, block)).fetchall()
+        return {row['village']: _village_from_row(row) for row in rows}
+
+    def village(self, state: str, district: str, block: str, village: str) -> Optional[Dict[str, Any]]:
+        """Statistics and patta holders of one village, or None if it does not exist"""
+        with self._connect() as conn:
+            row = conn.execute('''SELECT * FROM atlas_villages
+                                  WHERE state = ? AND district = ? AND block = ? AND village = ?''',
+                               (state, district, block, village)).fetchone()
+            if row is None:
+                return None
+            pattas = conn.execute('SELECT * FROM atlas_pattas WHERE village_id = ? ORDER BY id', (row['id'],)).fetchall()
+        village_data = _village_from_row(row)
+        village_data['patta_holders'] = [_patta_from_row(patta) for patta in pattas]
+        return village_data
+
+    def changes_since(self, seq: int) -> Tuple[int, List[str]]:
+        """(latest change seq, distinct patta ids changed after seq)"""
+        with self._connect() as conn:
+            rows = conn.execute('SELECT seq, patta_id FROM atlas_changes WHERE seq > ? ORDER BY seq', (seq,)).fetchall()
+            if not rows:
+                return seq, []
+        return rows[-1]['seq'], list(dict.fromkeys(row['patta_id'] for row in rows))
+
+    def latest_change(self) -> int:
+        """Sequence number of the newest patta change (0 if none)"""
+        with self._connect() as conn:
+            return conn.execute('SELECT COALESCE(MAX(seq), 0) FROM atlas_changes').fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Map features, boundaries and claims
+    # ------------------------------------------------------------------
+
+    def _bbox_filter(self, table: str, bbox: Optional[BBox], point: bool) -> Tuple[str, List[str], List[float]]:
+        """(JOIN, WHERE conditions, params) restricting `table` (aliased t) to rows intersecting bbox"""
+        if bbox is None:
+            return '', [], []
+        min_lon, min_lat, max_lon, max_lat = bbox
+        params = [max_lon, min_lon, max_lat, min_lat]
+        if self.has_rtree:
+            return (f' JOIN {table}_rtree r ON r.id = t.id',
+                    ['r.min_lon <= ?', 'r.max_lon >= ?', 'r.min_lat <= ?', 'r.max_lat >= ?'], params)
+        if point:
+            return '', ['t.longitude <= ?', 't.longitude >= ?', 't.latitude <= ?', 't.latitude >= ?'], params
+        return '', ['t.min_lon <= ?', 't.max_lon >= ?', 't.min_lat <= ?', 't.max_lat >= ?'], params
+
+    def _feature_filter(self, bbox: Optional[BBox], status: Optional[str]) -> Tuple[str, List[Any]]:
+        """FROM ... WHERE ... over located patta_files rows (aliased t) for a bbox and claim status"""
+        join, conditions, params = self._bbox_filter('patta_files', bbox, point=True)
+        # The bulk ingester stores documents without coordinates at 0/0; they have no place on the map
+        conditions.append('NOT (t.latitude = 0 AND t.longitude = 0)')
+        if status:
+            # With a bbox the R-tree is the selective index; the unary + keeps SQLite off the status index
+            conditions.append(f"{'+' if join else ''}t.claim_status = ? COLLATE NOCASE")
+            params.append(status)
+        where = f" WHERE {' AND '.join(conditions)}"
+        return f'FROM patta_files t{join}{where}', params
+
+    def features(self, bbox: Optional[BBox] = None, limit: Optional[int] = None,
+                 status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Map features from patta_files, optionally only those inside bbox (min_lon, min_lat, max_lon, max_lat)"""
+        source, params = self._feature_filter(bbox, status)
+        query = f'SELECT t.* {source} ORDER BY t.id'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(int(limit))
+        with self._connect() as conn:
+            cursor = conn.execute(query, params)
+            return [row_feature(row) for rows in iter(lambda: cursor.fetchmany(FETCH_SIZE), []) for row in rows]
+
+    def feature_count(self, bbox: Optional[BBox] = None, status: Optional[str] = None) -> int:
+        """Number of map features (inside bbox / with the given claim status)"""
+        source, params = self._feature_filter(bbox, status)
+        with self._connect() as conn:
+            return conn.execute(f'SELECT COUNT(*) {source}', params).fetchone()[0]
+
+    def feature_clusters(self, zoom: int, bbox: Optional[BBox] = None,
+                         status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Grid clusters of the map features for a zoom level
+
+        Features are bucketed into square cells about CLUSTER_RADIUS_PX screen
+        pixels wide at that zoom and aggregated in SQL, so the response size
+        depends on the viewport rather than on the number of claims. Each
+        cluster is a point at the mean position of its features, with their
+        count, total area and claim status histogram.
+        """
+        cell = cluster_cell_degrees(zoom)
+        source, params = self._feature_filter(bbox, status)
+        with self._connect() as conn:
+            rows = conn.execute(f'''SELECT CAST((t.longitude + 180) / ? AS INTEGER) AS gx,
+                                           CAST((t.latitude + 90) / ? AS INTEGER) AS gy,
+                                           t.claim_status AS status, COUNT(*) AS n,
+                                           SUM(t.longitude) AS sum_lon, SUM(t.latitude) AS sum_lat,
+                                           SUM(t.area_hectares) AS area
+                                    {source}
+                                    GROUP BY gx, gy, t.claim_status''', [cell, cell] + params).fetchall()
+
+        cells: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for row in rows:
+            cluster = cells.setdefault((row['gx'], row['gy']), {'n': 0, 'sum_lon': 0.0, 'sum_lat': 0.0,
+                                                                'area': 0.0, 'status_counts': {}})
+            cluster['n'] += row['n']
+            cluster['sum_lon'] += row['sum_lon']
+            cluster['sum_lat'] += row['sum_lat']
+            cluster['area'] += row['area'] or 0
+            status_name = row['status'] or 'Unknown'
+            cluster['status_counts'][status_name] = cluster['status_counts'].get(status_name, 0) + row['n']
+
+        return [{
+            'type': 'Feature',
+            'properties': {
+                'cluster': True,
+                'cluster_id': f'{zoom}/{gx}/{gy}',
+                'point_count': cluster['n'],
+                'area_hectares': round(cluster['area'], 4),
+                'status_counts': cluster['status_counts']
+            },
+            'geometry': {'type': 'Point', 'coordinates': [round(cluster['sum_lon'] / cluster['n'], 6),
+                                                          round(cluster['sum_lat'] / cluster['n'], 6)]}
+        } for (gx, gy), cluster in sorted(cells.items())]
+
+    def feature_collection(self, bbox: Optional[BBox] = None, zoom: Optional[int] = None,
+                           status: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Map features as a GeoJSON FeatureCollection
+
+        Below CLUSTER_MAX_ZOOM the features are grid clusters (see
+        feature_clusters); otherwise individual points, at most `limit` (capped
+        at MAP_MAX_FEATURES). metadata.total_records counts every matching
+        feature and metadata.truncated tells whether points were left out.
+        """
+        with self._connect() as conn:
+            last_updated = conn.execute('SELECT MAX(uploaded_date) FROM patta_files').fetchone()[0]
+        metadata = {'last_updated': last_updated}
+
+        if zoom is not None and zoom < CLUSTER_MAX_ZOOM:
+            features = self.feature_clusters(zoom, bbox, status)
+            metadata.update(total_records=sum(f['properties']['point_count'] for f in features),
+                            clustered=True, zoom=zoom, cell_degrees=cluster_cell_degrees(zoom))
+        else:
+            limit = MAP_MAX_FEATURES if limit is None else max(0, min(int(limit), MAP_MAX_FEATURES))
+            # One extra row tells whether the limit cut anything off
+            features = self.features(bbox, limit + 1, status)
+            truncated = len(features) > limit
+            features = features[:limit]
+            metadata.update(total_records=self.feature_count(bbox, status) if truncated else len(features),
+                            clustered=False, truncated=truncated)
+            if zoom is not None:
+                metadata['zoom'] = zoom
+
+        return {'type': 'FeatureCollection', 'features': features, 'metadata': metadata}
+
+    def boundaries(self, layer: str, bbox: Optional[BBox] = None) -> Optional[Dict[str, Any]]:
+        """A boundary layer as a FeatureCollection, or None if the layer does not exist"""
+        join, conditions, params = self._bbox_filter('atlas_boundaries', bbox, point=False)
+        conditions.append('t.layer = ?')
+        with self._connect() as conn:
+            if not conn.execute('SELECT 1 FROM atlas_boundaries WHERE layer = ? LIMIT 1', (layer,)).fetchone():
+                return None
+            rows = conn.execute(f'''SELECT t.properties, t.geometry FROM atlas_boundaries t{join}
+                                    WHERE {' AND '.join(conditions)} ORDER BY t.id''',
+                                params + [layer]).fetchall()
+        return {
+            'type': 'FeatureCollection',
+            'features': [{'type': 'Feature', 'properties': json.loads(row['properties']),
+                          'geometry': json.loads(row['geometry'])} for row in rows]
+        }
+
+    def boundary_layers(self) -> List[str]:
+        """Names of the stored boundary layers"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute('SELECT DISTINCT layer FROM atlas_boundaries ORDER BY layer')]
+
+    def data_version(self, table: str) -> int:
+        """Change counter of a VERSIONED_TABLES table (bumped on every insert, update and delete)"""
+        with self._connect() as conn:
+            row = conn.execute('SELECT value FROM atlas_meta WHERE key = ?', (f'version:{table}',)).fetchone()
+        return int(row[0]) if row else 0
+
+    def claims(self) -> List[Dict[str, Any]]:
+        """Patta claims in insertion order, with [lat, lon] coordinates"""
+        with self._connect() as conn:
+            rows = conn.execute(f'SELECT {", ".join(CLAIM_COLUMNS)} FROM patta_claims ORDER BY rowid').fetchall()
+        return [{
+            'id': row['id'],
+            'applicant_name': row['applicant_name'],
+            'village': row['village'],
+            'district': row['district'],
+            'state': row['state'],
+            'claim_type': row['claim_type'],
+            'area_hectares': row['area_hectares'],
+            'status': row['status'],
+            'coordinates': [row['latitude'], row['longitude']],
+            'verified_by': row['verified_by'],
+            'document': row['document']
+        } for row in rows]
+
+
+class AtlasChangeFollower:
+    """
+    Keeps in-process indexes in step with an AtlasStore
+
+    The first refresh() streams every village and patta holder into the
+    indexes; later calls replay only the patta ids in atlas_changes since the
+    last one, so writes from any process show up on the next request at the
+    cost of one indexed query. Indexes need add_patta(state, district, block,
+    village, patta) and remove(patta_id); add_node(*path) is used when present.
+    """
+
+    def __init__(self, store: AtlasStore, indexes: List[Any]):
+        self.store = store
+        self.indexes = indexes
+        self._seq: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        """Apply outstanding changes; returns the number of patta holders (re)indexed or removed"""
+        with self._lock:
+            if self._seq is None:
+                # Changes racing with the initial load are replayed next time (add_patta replaces by id)
+                latest = self.store.latest_change()
+                count = 0
+                for path, _ in self.store.iter_villages():
+                    for index in self.indexes:
+                        if hasattr(index, 'add_node'):
+                            index.add_node(*path)
+                for path, patta in self.store.iter_pattas():
+                    for index in self.indexes:
+                        index.add_patta(*path, patta)
+                    count += 1
+                self._seq = latest
+                logger.info(f"Loaded {count} patta holder(s) from the atlas store")
+                return count
+
+            latest, patta_ids = self.store.changes_since(self._seq)
+            current = self.store.pattas_by_ids(patta_ids) if patta_ids else {}
+            for patta_id in patta_ids:
+                for index in self.indexes:
+                    if patta_id in current:
+                        path, patta = current[patta_id]
+                        index.add_patta(*path, patta)
+                    else:
+                        index.remove(patta_id)
+            self._seq = latest
+            return len(patta_ids)
@@ -0,0 +1,212 @@
+"""
+Boundary Layer Payloads
+Pre-simplified, quantized, pre-serialized and pre-compressed GeoJSON for each boundary layer and zoom level
+"""
+
+import os
+import gzip
+import json
+import math
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from webgis.vector_tiles import simplify as douglas_peucker
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    from shapely.geometry import shape, mapping
+    SHAPELY_AVAILABLE = True
+except ImportError:
+    SHAPELY_AVAILABLE = False
+    logger.info("Shapely not installed, boundaries are simplified with the built-in Douglas-Peucker")
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Payload configuration (overridable through the environment)
+# Zoom levels with their own simplified copy; above the last one the full geometry is served
+BOUNDARY_ZOOMS = [int(z) for z in os.environ.get('FRA_BOUNDARY_ZOOMS', '4,6,8,10,12').split(',') if z]
+# Simplification tolerance as a fraction of a screen pixel at each zoom (256px tiles)
+BOUNDARY_TOLERANCE_PX = float(os.environ.get('FRA_BOUNDARY_TOLERANCE_PX', 1.0))
+# Decimal places kept for full-resolution coordinates (6 is about 0.1 m)
+FULL_PRECISION = int(os.environ.get('FRA_BOUNDARY_PRECISION', 6))
+GZIP_LEVEL = int(os.environ.get('FRA_BOUNDARY_GZIP_LEVEL', 9))
+BROTLI_QUALITY = int(os.environ.get('FRA_BOUNDARY_BROTLI_QUALITY', 11))
+
+# Level name of the unsimplified payload
+FULL_LEVEL = 'full'
+
+
+def zoom_tolerance(zoom: int) -> float:
+    """Simplification tolerance in degrees for a zoom level"""
+    return 360.0 / (256 * 2 ** zoom) * BOUNDARY_TOLERANCE_PX
+
+
+def tolerance_precision(tolerance: float) -> int:
+    """Decimal places needed to keep quantization error below a tenth of the tolerance"""
+    if tolerance <= 0:
+        return FULL_PRECISION
+    return max(0, min(FULL_PRECISION, math.ceil(-math.log10(tolerance)) + 1))
+
+
+def _quantize(coords: Any, digits: int) -> Any:
+    """Round nested coordinate arrays, dropping consecutive duplicate positions"""
+    if coords and isinstance(coords[0], (int, float)):
+        return [round(value, digits) for value in coords]
+    out = [_quantize(part, digits) for part in coords]
+    if out and isinstance(out[0], list) and out[0] and isinstance(out[0][0], (int, float)):
+        deduped = [out[0]]
+        for position in out[1:]:
+            if position != deduped[-1]:
+                deduped.append(position)
+        # Keep rings closed and valid (4 positions) after rounding
+        if len(out) >= 4 and out[0] == out[-1] and len(deduped) < 4:
+            return out
+        return deduped
+    return out
+
+
+def _simplify_rings(rings: List[List[List[float]]], tolerance: float) -> Optional[List[List[List[float]]]]:
+    """Built-in fallback: simplify each ring, dropping holes that collapse (None if the exterior does)"""
+    out = []
+    for index, ring in enumerate(rings):
+        simplified = [list(p) for p in douglas_peucker([tuple(p[:2]) for p in ring], tolerance)]
+        if len(simplified) < 4:
+            if index == 0:
+                return None
+            continue
+        out.append(simplified)
+    return out
+
+
+def simplify_geometry(geometry: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """Topology-preserving simplification; the original geometry is kept if it would vanish"""
+    if tolerance <= 0:
+        return geometry
+    if SHAPELY_AVAILABLE:
+        simplified = shape(geometry).simplify(tolerance, preserve_topology=True)
+        return geometry if simplified.is_empty else json.loads(json.dumps(mapping(simplified)))
+
+    kind, coords = geometry.get('type'), geometry.get('coordinates')
+    if kind == 'Polygon':
+        rings = _simplify_rings(coords, tolerance)
+        return {'type': kind, 'coordinates': rings} if rings else geometry
+    if kind == 'MultiPolygon':
+        polygons = [rings for rings in (_simplify_rings(polygon, tolerance) for polygon in coords) if rings]
+        return {'type': kind, 'coordinates': polygons} if polygons else geometry
+    if kind == 'LineString':
+        return {'type': kind, 'coordinates': [list(p) for p in douglas_peucker([tuple(p[:2]) for p in coords], tolerance)]}
+    if kind == 'MultiLineString':
+        return {'type': kind, 'coordinates': [[list(p) for p in douglas_peucker([tuple(p[:2]) for p in line], tolerance)]
+                                              for line in coords]}
+    return geometry
+
+
+class BoundaryPayload:
+    """One layer at one level: the JSON bytes plus their gzip (and brotli) encodings"""
+
+    def __init__(self, layer: str, level: str, version: int, body: bytes):
+        self.layer = layer
+        self.level = level
+        self.version = version
+        self.encodings = {'identity': body, 'gzip': gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+        if BROTLI_AVAILABLE:
+            self.encodings['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+
+    def etag(self, encoding: str = 'identity') -> str:
+        """Entity tag of one encoding of the payload"""
+        suffix = '' if encoding == 'identity' else f'-{encoding}'
+        return f'{self.layer}-{self.version}-{self.level}{suffix}'
+
+    def pick_encoding(self, accepted: List[str]) -> str:
+        """Best encoding the client accepts (brotli, then gzip, then none)"""
+        for encoding in ('br', 'gzip'):
+            if encoding in self.encodings and encoding in accepted:
+                return encoding
+        return 'identity'
+
+    def sizes(self) -> Dict[str, int]:
+        return {encoding: len(body) for encoding, body in self.encodings.items()}
+
+
+class BoundaryPayloadCache:
+    """
+    Precomputed boundary responses, rebuilt only when the boundary data changes
+
+    Every layer is simplified once per level in BOUNDARY_ZOOMS (tolerance of
+    about one screen pixel at that zoom), its coordinates rounded to the
+    precision that tolerance needs, serialized to compact JSON and compressed.
+    Requests then pick a level and are answered with the stored bytes. The
+    whole cache is keyed by the store's atlas_boundaries change counter, so
+    edits to the boundary table trigger a rebuild on the next request.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        # (data version, payloads), replaced as a whole so readers never see a half-built cache
+        self._cache: Tuple[Optional[int], Dict[Tuple[str, str], BoundaryPayload]] = (None, {})
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def levels() -> List[Tuple[str, float]]:
+        """(level name, tolerance in degrees), coarsest first, ending with the full geometry"""
+        return [(str(zoom), zoom_tolerance(zoom)) for zoom in sorted(BOUNDARY_ZOOMS)] + [(FULL_LEVEL, 0.0)]
+
+    @classmethod
+    def level_for(cls, zoom: Optional[int] = None, tolerance: Optional[float] = None) -> str:
+        """
+        Level to serve for a map zoom or a maximum tolerance (degrees)
+
+        A zoom gets the first level at least as detailed as that zoom; a
+        tolerance gets the coarsest level whose tolerance does not exceed it.
+        With neither, the full geometry is served.
+        """
+        if zoom is not None:
+            for name, _ in cls.levels()[:-1]:
+                if int(name) >= zoom:
+                    return name
+        elif tolerance is not None:
+            for name, level_tolerance in cls.levels():
+                if level_tolerance <= tolerance:
+                    return name
+        return FULL_LEVEL
+
+    def _build_layer(self, layer: str, version: int, payloads: Dict[Tuple[str, str], BoundaryPayload]) -> None:
+        collection = self.store.boundaries(layer)
+        if collection is None:
+            return
+        for level, tolerance in self.levels():
+            digits = tolerance_precision(tolerance)
+            features = [{
+                'type': 'Feature',
+                'properties': feature['properties'],
+                'geometry': dict(simplified, coordinates=_quantize(simplified['coordinates'], digits))
+            } for feature in collection['features'] for simplified in [simplify_geometry(feature['geometry'], tolerance)]]
+            body = json.dumps({'type': 'FeatureCollection', 'features': features},
+                              separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            payloads[(layer, level)] = BoundaryPayload(layer, level, version, body)
+
+    def build(self) -> None:
+        """(Re)build every layer at every level if the boundary data changed"""
+        version = self.store.data_version('atlas_boundaries')
+        with self._lock:
+            if version == self._cache[0]:
+                return
+            payloads: Dict[Tuple[str, str], BoundaryPayload] = {}
+            for layer in self.store.boundary_layers():
+                self._build_layer(layer, version, payloads)
+            self._cache = (version, payloads)
+        logger.info(f"Built boundary payloads for {len(payloads)} layer/level pair(s) at version {version}")
+
+    def get(self, layer: str, zoom: Optional[int] = None, tolerance: Optional[float] = None) -> Optional[BoundaryPayload]:
+        """Payload for a layer at the level matching zoom/tolerance, or None if the layer does not exist"""
+        self.build()
+        _, payloads = self._cache
+        return payloads.get((layer, self.level_for(zoom, tolerance)))
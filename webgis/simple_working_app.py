@@ -2,14 +2,23 @@ from flask import Flask, render_template, request, jsonify, session
 import json
 import os
 from datetime import datetime
-import hashlib
 import sys
+from werkzeug.utils import secure_filename
 
 # Add patta_verification to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'patta_verification'))
 
+# Add project root to path for shared digitization modules
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from digitization.model_registry import prewarm_models
+from digitization.upload_ingest import ingest_upload, check_declared_size, UploadTooLargeError, MAX_FILE_SIZE
+
 try:
-    from verification_api import verification_bp
+    from verification_api import verification_bp, result_cache, verifier
+    from patta_verifier import PIPELINE_VERSION
     VERIFICATION_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Patta verification system not available: {e}")
@@ -436,6 +445,11 @@ def dashboard():
 
 @app.route('/api/upload_document', methods=['POST'])
 def upload_document():
+    try:
+        check_declared_size(request.content_length, MAX_FILE_SIZE)
+    except UploadTooLargeError as e:
+        return jsonify({'error': str(e)}), 413
+    
     if 'file' not in request.files:
         return jsonify({'error': 'No file provided'}), 400
     
@@ -447,9 +461,12 @@ def upload_document():
     verification_type = request.form.get('verification_type', 'full')
     state = request.form.get('state', 'Tamil Nadu')
     
-    # Process the file
-    file_content = file.read()
-    doc_hash = hashlib.sha256(file_content).hexdigest()
+    # Stream the file to disk, hashing and measuring it in the same pass
+    try:
+        upload = ingest_upload(file, 'data/processed', '{sha256}_' + secure_filename(file.filename), MAX_FILE_SIZE)
+    except UploadTooLargeError as e:
+        return jsonify({'error': str(e)}), 413
+    doc_hash = upload.sha256
     
     # Save file info
     doc_info = {
@@ -457,7 +474,7 @@ def upload_document():
         'filename': file.filename,
         'upload_time': datetime.now().isoformat(),
         'status': 'Processed',
-        'file_size': len(file_content),
+        'file_size': upload.size,
         'verification_type': verification_type,
         'state': state
     }
@@ -469,16 +486,22 @@ def upload_document():
     # If verification system is available, perform verification
     verification_results = None
     if VERIFICATION_AVAILABLE:
+        # Re-uploads of an already verified document are served from the cache
+        verification_results = result_cache.get(doc_hash, state, 'full', PIPELINE_VERSION)
+    
+    if verification_results:
+        doc_info['verification_results'] = verification_results
+        doc_info['verification_status'] = verification_results.get('final_decision', {}).get('status', 'PENDING')
+        doc_info['verification_confidence'] = verification_results.get('final_decision', {}).get('confidence', 0)
+        
+        with open(f'data/processed/{doc_hash}.json', 'w') as f:
+            json.dump(doc_info, f, indent=2)
+    elif VERIFICATION_AVAILABLE:
         try:
-            # Save file temporarily for verification
-            temp_path = f'data/processed/{doc_hash}_{file.filename}'
-            with open(temp_path, 'wb') as f:
-                f.write(file_content)
-            
-            # Perform verification
-            from patta_verifier import PattaVerifier
-            verifier = PattaVerifier()
-            verification_results = verifier.verify_patta_document(temp_path, state)
+            # Perform verification on the stored upload with the shared verifier
+            verification_results = verifier.verify_patta_document(upload.path, state, file_hash=doc_hash)
+            if verification_results.get('success', False):
+                result_cache.put(doc_hash, state, 'full', PIPELINE_VERSION, verification_results)
             
             # Update document info with verification results
             doc_info['verification_results'] = verification_results
@@ -489,16 +512,13 @@ def upload_document():
             with open(f'data/processed/{doc_hash}.json', 'w') as f:
                 json.dump(doc_info, f, indent=2)
             
-            # Clean up temp file
-            try:
-                os.remove(temp_path)
-            except:
-                pass
-                
         except Exception as e:
             print(f"Verification error: {e}")
             doc_info['verification_error'] = str(e)
     
+    # Only the JSON summary is kept
+    upload.remove()
+    
     response_data = {
         'success': True,
         'document_hash': doc_hash,
@@ -574,4 +594,8 @@ if __name__ == '__main__':
     print("🚀 Starting Enhanced FRA-SENTINEL")
     print("📁 Using your existing project structure")
     print("✅ Access at: http://localhost:5000")
+    # Load spaCy and start the OCR workers in the background; only in the serving
+    # process, not the debug reloader's watcher
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        prewarm_models()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -1,16 +1,20 @@
 import pytesseract
-import spacy
 import re
 from pdf2image import convert_from_path
 from PIL import Image
 import os
+import sys
+
+# Add project root to path for the shared model registry
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from digitization.model_registry import NER_BATCH_SIZE, NER_PROCESSES, get_spacy_model, pipe_docs
 
 # Configure Tesseract path
 pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
-# Load NLP model
-nlp = spacy.load("en_core_web_sm")
-
 # Regex for Indian phone numbers and emails
 phone_pattern = re.compile(r'\b(?:\+91[-\s]?|0)?[6-9]\d{9}\b')
 email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
@@ -23,7 +27,8 @@ def extract_address(text):
     address_lines = [line for line in lines if any(kw.lower() in line.lower() for kw in address_keywords)]
     return ', '.join(address_lines) if address_lines else 'Unknown'
 
-def process_patta_document(filepath):
+def document_text(filepath):
+    """OCR text of a PDF or image"""
     text = ""
 
     # PDF to images
@@ -34,9 +39,27 @@ def process_patta_document(filepath):
     else:
         img = Image.open(filepath)
         text = pytesseract.image_to_string(img)
+    return text
+
+def process_patta_document(filepath):
+    text = document_text(filepath)
 
     # NLP entity detection
-    doc = nlp(text)
+    return fields_from_doc(text, get_spacy_model()(text))
+
+def process_patta_documents(filepaths, batch_size=NER_BATCH_SIZE, n_process=NER_PROCESSES):
+    """
+    Batched process_patta_document for bulk backfills
+
+    Documents are OCR'd lazily as nlp.pipe asks for the next batch, and one
+    (filepath, extracted fields) pair is yielded per document in input order.
+    """
+    texts = ((document_text(filepath), filepath) for filepath in filepaths)
+    for doc, filepath in pipe_docs(texts, batch_size=batch_size, n_process=n_process, as_tuples=True):
+        yield filepath, fields_from_doc(doc.text, doc)
+
+def fields_from_doc(text, doc):
+    """Patta holder and village from NER entities, contact details and address from regex"""
     extracted = {
         "patta_holder": "Unknown",
         "village": "Unknown",
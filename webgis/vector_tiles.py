@@ -0,0 +1,431 @@
+"""
+FRA Atlas Vector Tiles
+Mapbox Vector Tiles (MVT) for claim points and boundary layers, clipped and simplified per zoom and cached on disk
+"""
+
+import os
+import json
+import math
+import shutil
+import struct
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from webgis.atlas_store import CLUSTER_MAX_ZOOM, MAP_MAX_FEATURES
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tile configuration (overridable through the environment)
+TILE_CACHE_DIR = os.environ.get('FRA_TILE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tile_cache'))
+TILE_MAX_ZOOM = int(os.environ.get('FRA_TILE_MAX_ZOOM', 18))
+# Douglas-Peucker tolerance for boundaries, in tile units (4096 per tile, so 16 units = 1px on a 256px tile)
+TILE_SIMPLIFY_TOLERANCE = float(os.environ.get('FRA_TILE_SIMPLIFY_TOLERANCE', 8.0))
+TILE_MAX_AGE = int(os.environ.get('FRA_TILE_MAX_AGE', 300))
+
+# Tile coordinate space, and the margin kept around it so clipped edges do not show at tile seams
+EXTENT = 4096
+BUFFER = 64
+
+# Layer served from patta_files points; every other layer is a boundary layer of the atlas store
+POINT_LAYER = 'pattas'
+
+MIME_TYPE = 'application/vnd.mapbox-vector-tile'
+
+# MVT geometry types and commands
+GEOM_POINT, GEOM_LINESTRING, GEOM_POLYGON = 1, 2, 3
+CMD_MOVE_TO, CMD_LINE_TO, CMD_CLOSE_PATH = 1, 2, 7
+
+# Web Mercator latitude limit
+MAX_LATITUDE = 85.0511287798
+
+Point = Tuple[float, float]
+
+
+# ----------------------------------------------------------------------
+# Tile math
+# ----------------------------------------------------------------------
+
+def _lonlat(z: int, tile_x: float, tile_y: float) -> Point:
+    """Longitude/latitude of a (fractional) tile corner position"""
+    n = 2 ** z
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+    return tile_x / n * 360.0 - 180.0, lat
+
+
+def tile_bounds(z: int, x: int, y: int, buffer: float = 0) -> Tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of an XYZ tile, optionally widened by `buffer` tile units"""
+    margin = buffer / EXTENT
+    min_lon, min_lat = _lonlat(z, x - margin, y + 1 + margin)
+    max_lon, max_lat = _lonlat(z, x + 1 + margin, y - margin)
+    return min_lon, max(min_lat, -MAX_LATITUDE), max_lon, min(max_lat, MAX_LATITUDE)
+
+
+def project(lon: float, lat: float, z: int, x: int, y: int) -> Point:
+    """Longitude/latitude to tile units of tile z/x/y (y pointing down)"""
+    n = 2 ** z
+    lat = math.radians(max(min(lat, MAX_LATITUDE), -MAX_LATITUDE))
+    world_x = (lon + 180.0) / 360.0 * n
+    world_y = (1 - math.log(math.tan(lat) + 1 / math.cos(lat)) / math.pi) / 2 * n
+    return (world_x - x) * EXTENT, (world_y - y) * EXTENT
+
+
+# ----------------------------------------------------------------------
+# Clipping and simplification (in tile units)
+# ----------------------------------------------------------------------
+
+def clip_ring(ring: List[Point], low: float = -BUFFER, high: float = EXTENT + BUFFER) -> List[Point]:
+    """Sutherland-Hodgman clip of a closed ring against the buffered tile square"""
+    edges = [
+        (lambda p: p[0] >= low, lambda a, b: (low, a[1] + (b[1] - a[1]) * (low - a[0]) / (b[0] - a[0]))),
+        (lambda p: p[0] <= high, lambda a, b: (high, a[1] + (b[1] - a[1]) * (high - a[0]) / (b[0] - a[0]))),
+        (lambda p: p[1] >= low, lambda a, b: (a[0] + (b[0] - a[0]) * (low - a[1]) / (b[1] - a[1]), low)),
+        (lambda p: p[1] <= high, lambda a, b: (a[0] + (b[0] - a[0]) * (high - a[1]) / (b[1] - a[1]), high))
+    ]
+    points = ring[:-1] if len(ring) > 1 and ring[0] == ring[-1] else ring
+    for inside, intersect in edges:
+        if not points:
+            break
+        clipped = []
+        previous = points[-1]
+        for current in points:
+            if inside(current):
+                if not inside(previous):
+                    clipped.append(intersect(previous, current))
+                clipped.append(current)
+            elif inside(previous):
+                clipped.append(intersect(previous, current))
+            previous = current
+        points = clipped
+    return points + points[:1] if points else []
+
+
+def clip_line(line: List[Point], low: float = -BUFFER, high: float = EXTENT + BUFFER) -> List[List[Point]]:
+    """Pieces of a line inside the buffered tile square (Liang-Barsky per segment)"""
+    pieces: List[List[Point]] = []
+    current: List[Point] = []
+    for a, b in zip(line, line[1:]):
+        t0, t1 = 0.0, 1.0
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        visible = True
+        for p, q in ((-dx, a[0] - low), (dx, high - a[0]), (-dy, a[1] - low), (dy, high - a[1])):
+            if p == 0:
+                if q < 0:
+                    visible = False
+                    break
+            else:
+                t = q / p
+                if p < 0:
+                    t0 = max(t0, t)
+                else:
+                    t1 = min(t1, t)
+        if not visible or t0 > t1:
+            if current:
+                pieces.append(current)
+                current = []
+            continue
+        start = (a[0] + t0 * dx, a[1] + t0 * dy)
+        end = (a[0] + t1 * dx, a[1] + t1 * dy)
+        if not current:
+            current = [start]
+        current.append(end)
+        if t1 < 1.0:
+            pieces.append(current)
+            current = []
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def simplify(points: List[Point], tolerance: float) -> List[Point]:
+    """Douglas-Peucker simplification (keeps both end points)"""
+    if len(points) < 3 or tolerance <= 0:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        (x1, y1), (x2, y2) = points[first], points[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = math.hypot(dx, dy)
+        farthest, distance = None, tolerance
+        for i in range(first + 1, last):
+            px, py = points[i]
+            d = (abs(dy * px - dx * py + x2 * y1 - y2 * x1) / length) if length else math.hypot(px - x1, py - y1)
+            if d > distance:
+                farthest, distance = i, d
+        if farthest is not None:
+            keep[farthest] = True
+            stack.extend([(first, farthest), (farthest, last)])
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def _quantize(points: List[Point]) -> List[Tuple[int, int]]:
+    """Round to integer tile units, dropping consecutive duplicates"""
+    out: List[Tuple[int, int]] = []
+    for px, py in points:
+        point = (int(round(px)), int(round(py)))
+        if not out or out[-1] != point:
+            out.append(point)
+    return out
+
+
+def _signed_area(ring: List[Tuple[int, int]]) -> float:
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1])) / 2
+
+
+# ----------------------------------------------------------------------
+# MVT (protobuf) encoding
+# ----------------------------------------------------------------------
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _field(number: int, wire_type: int, payload: bytes) -> bytes:
+    key = _varint((number << 3) | wire_type)
+    if wire_type == 2:
+        return key + _varint(len(payload)) + payload
+    return key + payload
+
+
+def _packed(number: int, values: List[int]) -> bytes:
+    return _field(number, 2, b''.join(_varint(v) for v in values))
+
+
+def _encode_value(value: Any) -> bytes:
+    """MVT Value message"""
+    if isinstance(value, bool):
+        return _field(7, 0, _varint(int(value)))
+    if isinstance(value, int):
+        return _field(6, 0, _varint(_zigzag(value)))
+    if isinstance(value, float):
+        return _field(3, 1, struct.pack('<d', value))
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True)
+    return _field(1, 2, value.encode('utf-8'))
+
+
+class _Cursor:
+    """Command encoder for one feature's geometry (the pen position carries across parts)"""
+
+    def __init__(self):
+        self.x = self.y = 0
+        self.commands: List[int] = []
+
+    def command(self, command: int, count: int) -> None:
+        self.commands.append((command & 0x7) | (count << 3))
+
+    def points(self, points: List[Tuple[int, int]]) -> None:
+        for px, py in points:
+            self.commands.extend([_zigzag(px - self.x), _zigzag(py - self.y)])
+            self.x, self.y = px, py
+
+
+def _encode_geometry(geometry: Dict[str, Any], z: int, x: int, y: int,
+                     tolerance: float) -> Optional[Tuple[int, List[int]]]:
+    """(MVT geometry type, command integers) of a GeoJSON geometry within tile z/x/y, or None if nothing is left"""
+    kind = geometry.get('type')
+    coords = geometry.get('coordinates') or []
+
+    def to_tile(positions):
+        return [project(p[0], p[1], z, x, y) for p in positions]
+
+    cursor = _Cursor()
+    if kind in ('Point', 'MultiPoint'):
+        points = [coords] if kind == 'Point' else coords
+        inside = [p for p in _quantize(to_tile(points))
+                  if -BUFFER <= p[0] <= EXTENT + BUFFER and -BUFFER <= p[1] <= EXTENT + BUFFER]
+        if not inside:
+            return None
+        cursor.command(CMD_MOVE_TO, len(inside))
+        cursor.points(inside)
+        return GEOM_POINT, cursor.commands
+
+    if kind in ('LineString', 'MultiLineString'):
+        lines = [coords] if kind == 'LineString' else coords
+        for line in lines:
+            for piece in clip_line(to_tile(line)):
+                piece = _quantize(simplify(piece, tolerance))
+                if len(piece) < 2:
+                    continue
+                cursor.command(CMD_MOVE_TO, 1)
+                cursor.points(piece[:1])
+                cursor.command(CMD_LINE_TO, len(piece) - 1)
+                cursor.points(piece[1:])
+        return (GEOM_LINESTRING, cursor.commands) if cursor.commands else None
+
+    if kind in ('Polygon', 'MultiPolygon'):
+        polygons = [coords] if kind == 'Polygon' else coords
+        for polygon in polygons:
+            for index, ring in enumerate(polygon):
+                ring = _quantize(simplify(clip_ring(to_tile(ring)), tolerance))
+                if len(ring) > 1 and ring[0] == ring[-1]:
+                    ring = ring[:-1]
+                area = _signed_area(ring) if len(ring) >= 3 else 0
+                if not area:
+                    if index == 0:
+                        break  # Exterior ring vanished: drop the polygon with its holes
+                    continue
+                # Exterior rings have positive area in tile space (clockwise on screen), holes negative
+                if (area > 0) != (index == 0):
+                    ring.reverse()
+                cursor.command(CMD_MOVE_TO, 1)
+                cursor.points(ring[:1])
+                cursor.command(CMD_LINE_TO, len(ring) - 1)
+                cursor.points(ring[1:])
+                cursor.command(CMD_CLOSE_PATH, 1)
+        return (GEOM_POLYGON, cursor.commands) if cursor.commands else None
+
+    return None
+
+
+def encode_layer(name: str, features: List[Dict[str, Any]], z: int, x: int, y: int,
+                 tolerance: float = TILE_SIMPLIFY_TOLERANCE) -> bytes:
+    """One MVT Layer message from GeoJSON features (empty bytes if no feature reaches the tile)"""
+    keys: Dict[str, int] = {}
+    values: Dict[bytes, int] = {}
+    encoded_features = []
+    for feature_id, feature in enumerate(features, start=1):
+        encoded = _encode_geometry(feature.get('geometry') or {}, z, x, y, tolerance)
+        if encoded is None:
+            continue
+        geom_type, commands = encoded
+        tags = []
+        for key, value in (feature.get('properties') or {}).items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault(_encode_value(value), len(values)))
+        encoded_features.append(_field(1, 0, _varint(feature_id)) + _packed(2, tags)
+                                + _field(3, 0, _varint(geom_type)) + _packed(4, commands))
+    if not encoded_features:
+        return b''
+    layer = (_field(15, 0, _varint(2)) + _field(1, 2, name.encode('utf-8'))
+             + b''.join(_field(2, 2, feature) for feature in encoded_features)
+             + b''.join(_field(3, 2, key.encode('utf-8')) for key in keys)
+             + b''.join(_field(4, 2, value) for value in values)
+             + _field(5, 0, _varint(EXTENT)))
+    return _field(3, 2, layer)
+
+
+# ----------------------------------------------------------------------
+# Tile service
+# ----------------------------------------------------------------------
+
+class VectorTileService:
+    """
+    Builds MVT tiles from the atlas store and caches them on disk
+
+    Tiles are cached under TILE_CACHE_DIR/<layer>/<data version>/<z>/<x>/<y>.pbf.
+    The data version is a counter the store bumps (via triggers) whenever
+    patta_files or atlas_boundaries change, so edits move new requests to a
+    fresh directory instead of requiring cache invalidation, and the ETag
+    can be computed without touching the tile at all. The first time a
+    layer is served at a new version, the directories of its older versions
+    are deleted, so the cache holds one generation of tiles per layer.
+
+    The points layer follows /api/fra_data: below CLUSTER_MAX_ZOOM it holds
+    grid clusters (with point_count) rather than individual claims.
+    """
+
+    def __init__(self, store, cache_dir: str = TILE_CACHE_DIR):
+        self.store = store
+        self.cache_dir = cache_dir
+        # Newest version each layer's cache has been pruned down to
+        self._pruned: Dict[str, int] = {}
+        self._prune_lock = threading.Lock()
+
+    def layers(self) -> List[str]:
+        """Names of the layers that can be tiled"""
+        return [POINT_LAYER] + self.store.boundary_layers()
+
+    def _version(self, layer: str) -> int:
+        return self.store.data_version('patta_files' if layer == POINT_LAYER else 'atlas_boundaries')
+
+    def etag(self, layer: str, z: int, x: int, y: int) -> str:
+        """Entity tag of a tile (changes whenever the layer's data changes)"""
+        return f'{layer}-{self._version(layer)}-{z}-{x}-{y}'
+
+    def _cache_path(self, layer: str, version: int, z: int, x: int, y: int) -> str:
+        return os.path.join(self.cache_dir, layer, str(version), str(z), str(x), f'{y}.pbf')
+
+    def prune(self, layer: str, version: int) -> int:
+        """Delete a layer's cached tiles from versions older than `version`; returns directories removed"""
+        with self._prune_lock:
+            if self._pruned.get(layer, -1) >= version:
+                return 0
+            self._pruned[layer] = version
+        layer_dir = os.path.join(self.cache_dir, layer)
+        try:
+            stale = [name for name in os.listdir(layer_dir) if name.isdigit() and int(name) < version]
+        except FileNotFoundError:
+            return 0
+        for name in stale:
+            shutil.rmtree(os.path.join(layer_dir, name), ignore_errors=True)
+        if stale:
+            logger.info(f"Pruned {len(stale)} stale tile version(s) of layer '{layer}'")
+        return len(stale)
+
+    def tile(self, layer: str, z: int, x: int, y: int) -> Tuple[bytes, str]:
+        """
+        Encoded tile and its ETag, from the disk cache when possible
+
+        Raises:
+            ValueError: Unknown layer or tile address outside the grid
+        """
+        if layer not in self.layers():
+            raise ValueError(f"Unknown layer '{layer}'")
+        if not (0 <= z <= TILE_MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            raise ValueError(f"Tile {z}/{x}/{y} is outside the grid")
+
+        version = self._version(layer)
+        self.prune(layer, version)
+        etag = f'{layer}-{version}-{z}-{x}-{y}'
+        path = self._cache_path(layer, version, z, x, y)
+        try:
+            with open(path, 'rb') as f:
+                return f.read(), etag
+        except FileNotFoundError:
+            pass
+
+        data = self.render(layer, z, x, y)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file and rename, so concurrent readers never see a partial tile
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache tile {layer}/{z}/{x}/{y}: {e}")
+        return data, etag
+
+    def render(self, layer: str, z: int, x: int, y: int) -> bytes:
+        """Encode a tile from the store (no caching)"""
+        bbox = tile_bounds(z, x, y, buffer=BUFFER)
+        if layer == POINT_LAYER:
+            if z < CLUSTER_MAX_ZOOM:
+                # Only points inside the tile proper, so a cluster is never counted by two tiles
+                features = self.store.feature_clusters(z, tile_bounds(z, x, y))
+            else:
+                features = self.store.features(bbox, limit=MAP_MAX_FEATURES)
+        else:
+            features = self.store.boundaries(layer, bbox)['features']
+        return encode_layer(layer, features, z, x, y)